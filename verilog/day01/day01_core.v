@@ -3,14 +3,16 @@
 module day01_core #(
     parameter N_ADDR_BITS = 16, // number of bits required to fully address the ROM module
     parameter INPUT_DATA_WIDTH = 16,
-    parameter OUTPUT_DATA_WIDTH = 16
+    parameter OUTPUT_DATA_WIDTH = 16,
+    parameter ROM_WORD_BYTES = 1 // characters read from the ROM per cycle (> 1 uses decoder_wide)
 ) (
     // Synchronous inputs:
     input wire clk,
+    input wire ce, // clock enable: all state holds while low (e.g. waiting for streamed input)
     input wire rst,
 
     // IO to interface with ROM:
-    input wire [7:0] rom_data,
+    input wire [8*ROM_WORD_BYTES-1:0] rom_data, // rom_data[7:0] is the character at rom_addr
     input wire rom_valid,
     output reg [N_ADDR_BITS:0] rom_addr,
 
@@ -32,26 +34,57 @@ module day01_core #(
     wire decoder_valid;
 
     wire decoder_en;
+    wire [$clog2(ROM_WORD_BYTES+1)-1:0] decoder_consumed; // characters decoded this cycle
 
     // enable the decoder to run only when in running state AND input data from ROM is valid
     assign decoder_en = (state == S_RUNNING) && rom_valid;
 
     // instantiate decoder:
-    decoder_fsm u_decoder_0 (
-        .clk(clk),
-        .rst(rst),
-
-        .char_in(rom_data),
-        .char_valid(decoder_en),
-
-        .dir(direction_decoded),
-        .number(number_decoded),
-        .valid_pulse(decoder_valid)
-    );
+    generate
+        if (ROM_WORD_BYTES > 1) begin : g_decoder_wide
+            decoder_wide #(
+                .DATA_WIDTH(INPUT_DATA_WIDTH),
+                .WORD_BYTES(ROM_WORD_BYTES)
+            ) u_decoder_0 (
+                .clk(clk),
+                .ce(ce),
+                .rst(rst),
+
+                .word_in(rom_data),
+                .word_valid(decoder_en),
+
+                .consumed(decoder_consumed),
+                .dir(direction_decoded),
+                .number(number_decoded),
+                .valid_pulse(decoder_valid)
+            );
+
+        end else begin : g_decoder
+            decoder_fsm #(
+                .DATA_WIDTH(INPUT_DATA_WIDTH)
+            ) u_decoder_0 (
+                .clk(clk),
+                .ce(ce),
+                .rst(rst),
+
+                .char_in(rom_data),
+                .char_valid(decoder_en),
+
+                .dir(direction_decoded),
+                .number(number_decoded),
+                .valid_pulse(decoder_valid)
+            );
+            assign decoder_consumed = 1;
+        end
+    endgenerate
 
     // instantiate solver:
-    solver u_solver_0 (
+    solver #(
+        .INPUT_DATA_WIDTH(INPUT_DATA_WIDTH),
+        .OUTPUT_DATA_WIDTH(OUTPUT_DATA_WIDTH)
+    ) u_solver_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
 
         .input_valid(decoder_valid),
@@ -63,7 +96,7 @@ module day01_core #(
     );
 
     // Overall module controller fsm:
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             // synchronous reset:
             rom_addr <= 0;
@@ -86,7 +119,7 @@ module day01_core #(
                         // i.e., hit the null terminator of the input file
                         state <= S_DONE;
                     end else begin
-                        rom_addr <= rom_addr + 1;
+                        rom_addr <= rom_addr + decoder_consumed;
                     end
                 end
 
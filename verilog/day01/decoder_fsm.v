@@ -5,6 +5,7 @@ module decoder_fsm # (
 ) (
     // Synchronous inputs:
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
 
     // ASCII input data:
@@ -26,7 +27,7 @@ module decoder_fsm # (
     reg dir_internal;
 
     // next state decoding logic
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             // synchronous reset:
             state <= S_IDLE;
@@ -0,0 +1,111 @@
+// multi-character version of decoder_fsm: decodes a WORD_BYTES-character word read from a wide ROM port
+// (first character in the low byte) each clock cycle, instead of a single character
+// is a synthesisable module
+module decoder_wide # (
+    parameter DATA_WIDTH = 16, // width of data that will be passed to the solver module (this must match solver#INPUT_DATA_WIDTH)
+    parameter WORD_BYTES = 4, // number of characters decoded per clock cycle
+    parameter COUNT_BITS = $clog2(WORD_BYTES+1) // bits needed to store 0..WORD_BYTES
+) (
+    // Synchronous inputs:
+    input wire clk,
+    input wire ce, // clock enable
+    input wire rst,
+
+    // ASCII input data:
+    input wire [8*WORD_BYTES-1:0] word_in, // the characters currently read from ROM (word_in[7:0] first)
+    input wire word_valid,
+
+    // outputs:
+    output reg [COUNT_BITS-1:0] consumed, // number of characters of word_in used this cycle (how far to move the ROM address)
+    output reg dir, // L -> dir=0, R -> dir=1
+    output reg [DATA_WIDTH-1:0] number, // about to rotate dial by
+    output reg valid_pulse // will be pulsed high for 1 clk cycle once the full line has been read in
+);
+    // states of decoder FSM (same as decoder_fsm):
+    localparam S_IDLE = 1'b0;
+    localparam S_READING = 1'b1;
+
+    // internal signals and state:
+    reg state;
+    reg [DATA_WIDTH-1:0] number_acc;
+    reg dir_internal;
+
+    // result of decoding the current word:
+    reg next_state;
+    reg [DATA_WIDTH-1:0] next_number_acc;
+    reg next_dir;
+    reg line_done; // a newline was reached
+    reg scan_done;
+    reg [7:0] char_in;
+    integer i;
+
+    // characters are decoded in order up to (and including) the first newline, so at most one line is
+    // finished per cycle (the rate the solver accepts them). the rest of the word is read again next cycle
+    always @(*) begin
+        next_state = state;
+        next_number_acc = number_acc;
+        next_dir = dir_internal;
+        line_done = 1'b0;
+        scan_done = 1'b0;
+        consumed = WORD_BYTES;
+
+        for (i = 0; i < WORD_BYTES; i = i+1) begin
+            char_in = word_in[8*i +: 8];
+            if (!scan_done) begin
+                if (char_in == 8'd0) begin
+                    // null terminator: end of input, stop before it
+                    consumed = i;
+                    scan_done = 1'b1;
+
+                end else if (next_state == S_IDLE) begin
+                    next_number_acc = 0; // starting to decode a new line, so reset acc
+                    if (char_in == "L") begin
+                        next_dir = 1'b0;
+                        next_state = S_READING;
+                    end else if (char_in == "R") begin
+                        next_dir = 1'b1;
+                        next_state = S_READING;
+                    end // otherwise simply consume character and ignore
+
+                end else if (char_in >= "0" && char_in <= "9") begin
+                    next_number_acc = (next_number_acc << 3) + (next_number_acc << 1) + (char_in - "0");
+
+                end else if (char_in == 8'h0A) begin
+                    line_done = 1'b1;
+                    next_state = S_IDLE;
+                    consumed = i + 1;
+                    scan_done = 1'b1;
+
+                end else begin
+                    // error occurred: malformed input file
+                    next_state = S_IDLE;
+                end
+            end
+        end
+    end
+
+    always @(posedge clk) if (ce) begin
+        if (rst) begin
+            // synchronous reset:
+            state <= S_IDLE;
+            number_acc <= 0;
+            dir_internal <= 1'b0;
+            dir <= 1'b0;
+            number <= 0;
+            valid_pulse <= 1'b0;
+
+        end else begin
+            valid_pulse <= 1'b0;
+            if (word_valid) begin
+                state <= next_state;
+                number_acc <= next_number_acc;
+                dir_internal <= next_dir;
+                if (line_done) begin
+                    dir <= next_dir;
+                    number <= next_number_acc;
+                    valid_pulse <= 1'b1;
+                end
+            end
+        end
+    end
+endmodule
@@ -7,6 +7,7 @@ module solver #(
 ) (
     // Synchronous inputs:
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
 
     // Solver input signals:
@@ -70,7 +71,7 @@ module solver #(
 
 
     // state update:
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             // synchronous reset:
             dial_pos <= 7'd50;
@@ -1,9 +1,11 @@
 
 module day02_core # (
-    parameter N_ADDR_BITS = 16
+    parameter N_ADDR_BITS = 16,
+    parameter NUM_LANES = 1 // range_summer instances, each sub-range is sent to the first idle one
 ) (
     // Synchronous inputs:
     input wire clk,
+    input wire ce, // clock enable: all state holds while low (e.g. waiting for streamed input)
     input wire rst,
 
     // IO to interface with ROM:
@@ -24,7 +26,7 @@ module day02_core # (
     localparam S_PARSE_UPPER = 2;
     localparam S_SETUP_CALC = 3;
     localparam S_CALC_LOOP = 4;
-    localparam S_WAIT_SUMMERS = 5;
+    localparam S_WAIT_SUMMERS = 5; // wait for every lane to finish, then add up their sums
     localparam S_DONE = 6;
 
     // helper signals for parser:
@@ -43,30 +45,72 @@ module day02_core # (
     // range iteration state:
     reg [63:0] current_range_start, current_range_end;
     reg [5:0] current_D;
-    reg calc_start; // signal to summer
-    wire done_summer;
-    wire [63:0] chunk_sum_part1, chunk_sum_part2;
+
+    // summer lanes. each lane has its own copy of the inputs, so the parser can move on to the next
+    // sub-range (or range) while it works, and its own running sums, which are added up at the end:
+    reg [NUM_LANES-1:0] calc_start; // signal to summer
+    reg [NUM_LANES-1:0] lane_busy;
+    wire [NUM_LANES-1:0] done_summer;
+    wire [NUM_LANES*64-1:0] chunk_sum_part1, chunk_sum_part2;
+    reg [NUM_LANES*64-1:0] lane_part1, lane_part2;
 
     // controls/inputs for summer:
-    reg [4:0] calc_D;
-    reg [63:0] calc_range_start, calc_range_end;
-    reg [79:0] calc_lower_bcd, calc_upper_bcd;
-    
-    range_summer u_range_summer_0 (
-        .clk(clk),
-        .rst(rst),
-        .start(calc_start),
-
-        .D(calc_D),
-        .range_start(calc_range_start),
-        .range_end(calc_range_end),
-        .parsed_lower_bcd(calc_lower_bcd),
-        .parsed_upper_bcd(calc_upper_bcd),
-
-        .done(done_summer),
-        .part1_sum_out(chunk_sum_part1),
-        .sum_out(chunk_sum_part2)
-    );
+    reg [4:0] calc_D [0:NUM_LANES-1];
+    reg [63:0] calc_range_start [0:NUM_LANES-1];
+    reg [63:0] calc_range_end [0:NUM_LANES-1];
+    reg [79:0] calc_lower_bcd [0:NUM_LANES-1];
+    reg [79:0] calc_upper_bcd [0:NUM_LANES-1];
+
+    genvar g;
+    generate
+        for (g=0; g<NUM_LANES; g=g+1) begin : g_lanes
+            range_summer u_range_summer_0 (
+                .clk(clk),
+                .ce(ce),
+                .rst(rst),
+                .start(calc_start[g]),
+
+                .D(calc_D[g]),
+                .range_start(calc_range_start[g]),
+                .range_end(calc_range_end[g]),
+                .parsed_lower_bcd(calc_lower_bcd[g]),
+                .parsed_upper_bcd(calc_upper_bcd[g]),
+
+                .done(done_summer[g]),
+                .part1_sum_out(chunk_sum_part1[g*64 +: 64]),
+                .sum_out(chunk_sum_part2[g*64 +: 64])
+            );
+        end
+    endgenerate
+
+    // dispatcher, the lowest numbered idle lane:
+    reg lane_free;
+    integer free_lane;
+    integer f;
+    always @(*) begin
+        lane_free = 0;
+        free_lane = 0;
+        for (f=NUM_LANES-1; f>=0; f=f-1) begin
+            if (!lane_busy[f]) begin
+                lane_free = 1;
+                free_lane = f;
+            end
+        end
+    end
+
+    // final reduction of the lanes' sums:
+    reg [63:0] total_part1, total_part2;
+    integer r;
+    always @(*) begin
+        total_part1 = 0;
+        total_part2 = 0;
+        for (r=0; r<NUM_LANES; r=r+1) begin
+            total_part1 = total_part1 + lane_part1[r*64 +: 64];
+            total_part2 = total_part2 + lane_part2[r*64 +: 64];
+        end
+    end
+
+    integer l;
 
     function [63:0] pow10; /// look up for powers of 10
         input [5:0] p;
@@ -98,7 +142,7 @@ module day02_core # (
 
     reg done_r;
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_WAIT_ROM;
             next_state_after_wait <= S_PARSE_LOWER;
@@ -113,8 +157,23 @@ module day02_core # (
             upper_digits <= 0;
             done <= 0;
             calc_start <= 0;
+            lane_busy <= 0;
+            lane_part1 <= 0;
+            lane_part2 <= 0;
             done_r <= 0;
         end else begin
+            calc_start <= 0;
+
+            // collect the sums of lanes that have finished (a lane is busy from when it is sent a sub-range
+            // until its done pulse):
+            for (l=0; l<NUM_LANES; l=l+1) begin
+                if (done_summer[l]) begin
+                    lane_busy[l] <= 0;
+                    lane_part1[l*64 +: 64] <= lane_part1[l*64 +: 64] + chunk_sum_part1[l*64 +: 64];
+                    lane_part2[l*64 +: 64] <= lane_part2[l*64 +: 64] + chunk_sum_part2[l*64 +: 64];
+                end
+            end
+
             case (state)
                 S_WAIT_ROM: begin
                     state <= next_state_after_wait;
@@ -176,30 +235,32 @@ module day02_core # (
                         upper_digits <= 0;
 
                         if (next_state_after_wait == S_DONE) begin
-                            state <= S_DONE;
+                            state <= S_WAIT_SUMMERS;
                         end else begin
                             state <= S_WAIT_ROM;
                         end
-                    end else begin
-                        calc_D <= current_D;
-                        calc_range_start <= current_range_start;
+                    end else if (lane_free) begin
+                        // (otherwise wait here for a lane to finish)
+                        calc_D[free_lane] <= current_D;
+                        calc_range_start[free_lane] <= current_range_start;
 
                         if (upper_digits > current_D) begin
-                            calc_range_end <= 64'hFFFFFFFFFFFFFFFF;
+                            calc_range_end[free_lane] <= 64'hFFFFFFFFFFFFFFFF;
                         end else begin
-                            calc_range_end <= current_range_end;
+                            calc_range_end[free_lane] <= current_range_end;
                         end
 
                         if (current_D > lower_digits) begin
-                            calc_lower_bcd <= 0;
+                            calc_lower_bcd[free_lane] <= 0;
                         end else begin
-                            calc_lower_bcd <= parsed_lower_bcd;
+                            calc_lower_bcd[free_lane] <= parsed_lower_bcd;
                         end
 
-                        calc_upper_bcd <= parsed_upper_bcd;
-                        calc_start <= 1;
+                        calc_upper_bcd[free_lane] <= parsed_upper_bcd;
+                        calc_start[free_lane] <= 1;
+                        lane_busy[free_lane] <= 1;
                         done_r <= 0;
-                        state <= S_WAIT_SUMMERS;
+                        state <= S_CALC_LOOP;
                     end
                 end
 
@@ -215,12 +276,10 @@ module day02_core # (
                 end
 
                 S_WAIT_SUMMERS: begin
-                    calc_start <= 0;
-
-                    if (done_summer) begin
-                        part1_result <= part1_result + chunk_sum_part1;
-                        part2_result <= part2_result + chunk_sum_part2;
-                        state <= S_CALC_LOOP;
+                    if (lane_busy == 0) begin
+                        part1_result <= total_part1;
+                        part2_result <= total_part2;
+                        state <= S_DONE;
                     end
                 end
 
@@ -17,6 +17,7 @@
  */
 module period_summer (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
     input wire start,
 
@@ -90,7 +91,7 @@ module period_summer (
         end
     endfunction
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             done <= 0;
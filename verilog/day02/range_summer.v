@@ -6,6 +6,7 @@
 module range_summer (
     // sequential module inputs
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
     input wire start,
 
@@ -47,6 +48,7 @@ module range_summer (
 
     period_summer u_summer_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .start(period_go),
 
@@ -62,7 +64,7 @@ module range_summer (
         .sum(period_result)
     );
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             done <= 0;
@@ -1,12 +1,15 @@
 module day03_core #(
-    parameter N_ADDR_BITS = 16
+    parameter N_ADDR_BITS = 16,
+    parameter MAX_LINE_LEN = 128, // Max characters per line supported by solver (real problem input was 100 chars)
+    parameter ROM_WORD_BYTES = 1 // characters read from the ROM per cycle (wide ROM word)
 ) (
     // Synchronous inputs:
     input wire clk,
+    input wire ce, // clock enable: all state holds while low (e.g. waiting for streamed input)
     input wire rst,
 
     // IO to interface with ROM:
-    input wire [7:0] rom_data,
+    input wire [8*ROM_WORD_BYTES-1:0] rom_data, // rom_data[7:0] is the character at rom_addr
     input wire rom_valid,
     output reg [N_ADDR_BITS:0] rom_addr,
 
@@ -17,8 +20,8 @@ module day03_core #(
 );
 
     // constants/localparams:
-    localparam MAX_LINE_LEN = 128; // Max characters per line supported by solver (real problem input was 100 chars)
-    localparam LOG_MAX_LINE_LEN = 7; // Bits needed to address MAX_LINE_LEN = ceil(log2(MAX_LINE_LEN))
+    localparam LOG_MAX_LINE_LEN = $clog2(MAX_LINE_LEN); // Bits needed to address MAX_LINE_LEN = ceil(log2(MAX_LINE_LEN))
+    localparam WORD_COUNT_BITS = $clog2(ROM_WORD_BYTES+1); // Bits needed to count 0..ROM_WORD_BYTES characters
 
 
     // FSM / state:
@@ -30,7 +33,7 @@ module day03_core #(
      * (will stall until both contexts are finished current task)
      * So idea is that while line[i] is being read in, line[i-1] will be being processed
     */
-    reg [MAX_LINE_LEN-1:0] digits_valid_bitmap [0:1][0:9]; // two 10x x128-bit buffers
+    reg [MAX_LINE_LEN-1:0] digits_valid_bitmap [0:1][0:9]; // two 10x x MAX_LINE_LEN-bit buffers
     reg [LOG_MAX_LINE_LEN:0] line_length [0:1];
     reg [LOG_MAX_LINE_LEN:0] load_idx;
     reg load_buf_idx;
@@ -53,16 +56,55 @@ module day03_core #(
 
 
     // ! Decoding / loading FSM:
-    wire [7:0] char_in = rom_data;
-    wire digit_valid = (char_in >= "0" && char_in <= "9");
-    wire [3:0] digit_val = digit_valid ? (char_in - "0") : 4'd0; // default value of 0
-    wire char_is_newline = (char_in == "\n" || char_in == 0); // file might accidentally not have trailing newline
+    // ROM_WORD_BYTES characters are decoded per cycle, up to (and including) the first newline, so at most
+    // one line is finished per cycle. the rest of the word is read again next cycle
+    reg [7:0] char_in;
+    reg [4*ROM_WORD_BYTES-1:0] word_digits; // values of the digits decoded this cycle, in order
+    reg [WORD_COUNT_BITS-1:0] num_digits; // number of them
+    reg [WORD_COUNT_BITS-1:0] consumed; // characters decoded this cycle (how far to move rom_addr)
+    reg char_is_newline; // the line ends this cycle
+    reg scan_done;
+    reg [LOG_MAX_LINE_LEN+1:0] load_end; // load_idx after this cycle's digits (saturates at MAX_LINE_LEN)
+    integer c;
+    integer k;
     integer j;
+
+    always @(*) begin
+        word_digits = 0;
+        num_digits = 0;
+        consumed = ROM_WORD_BYTES;
+        char_is_newline = 1'b0;
+        scan_done = 1'b0;
+        for (c = 0; c < ROM_WORD_BYTES; c = c+1) begin
+            char_in = rom_data[8*c +: 8];
+            if (!scan_done) begin
+                if (char_in == "\n" || (char_in == 0 && c == 0)) begin // file might accidentally not have trailing newline
+                    char_is_newline = 1'b1;
+                    consumed = c + 1;
+                    scan_done = 1'b1;
+                end else if (char_in == 0) begin
+                    // null terminator later in the word: stop before it
+                    consumed = c;
+                    scan_done = 1'b1;
+                end else if (char_in >= "0" && char_in <= "9") begin
+                    word_digits[4*num_digits +: 4] = char_in - "0";
+                    num_digits = num_digits + 1;
+                end
+            end
+        end
+        load_end = load_idx + num_digits;
+        if (load_end > MAX_LINE_LEN) begin
+            load_end = MAX_LINE_LEN;
+        end
+    end
     wire next_buf_idx = ~load_buf_idx;
-    wire proc_busy_on_next = (state != S_IDLE && proc_buf_idx == next_buf_idx); // need to check if proc busy working on buffer that we want to switch to
+    reg prev_load_buf_idx;
+    // need to check if proc busy working on buffer that we want to switch to, or hasn't yet picked it up
+    // (a whole line can be read in the cycle after a swap with a wide rom word, or if it's empty)
+    wire proc_busy_on_next = (state != S_IDLE && proc_buf_idx == next_buf_idx) || (state == S_IDLE && load_buf_idx != prev_load_buf_idx);
     wire stall = char_is_newline && proc_busy_on_next;
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             rom_addr <= 0;
             load_idx <= 0;
@@ -75,18 +117,24 @@ module day03_core #(
             proc_active <= 0;
         end else if (!done) begin
             // read addr logic:
-            if ((rom_valid || rom_addr == 0) && !stall) begin
+            if (rom_valid && !stall) begin
+                rom_addr <= rom_addr + consumed;
+            end else if (rom_addr == 0 && !stall) begin
                 rom_addr <= rom_addr + 1;
             end
 
             // write to buffer:
             if (rom_valid && !stall) begin
-                if (digit_valid && load_idx < MAX_LINE_LEN) begin
-                    // set bit in relevant bitmap:
-                    digits_valid_bitmap[load_buf_idx][digit_val][load_idx] <= 1'b1;
-                    load_idx <= load_idx + 1;
-                end else if (char_is_newline) begin
-                    line_length[load_buf_idx] <= load_idx;
+                // set bits in relevant bitmap:
+                for (k=0; k<ROM_WORD_BYTES; k=k+1) begin
+                    if (k < num_digits && load_idx + k < MAX_LINE_LEN) begin
+                        digits_valid_bitmap[load_buf_idx][word_digits[4*k +: 4]][load_idx + k] <= 1'b1;
+                    end
+                end
+                load_idx <= load_end;
+
+                if (char_is_newline) begin
+                    line_length[load_buf_idx] <= load_end;
                     // swap buffers:
                     load_buf_idx <= ~load_buf_idx;
                     // clear the next buffer:
@@ -103,7 +151,6 @@ module day03_core #(
 
 
     //! Processing / compute logic:
-    reg prev_load_buf_idx;
 
     // helper to find first set bit in a range of a bitmap:
     function [LOG_MAX_LINE_LEN:0] find_first_set;
@@ -157,7 +204,7 @@ module day03_core #(
     end
 
     // proc fsm logic:
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             prev_load_buf_idx <= 0;
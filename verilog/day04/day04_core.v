@@ -3,10 +3,12 @@ module day04_core #(
     parameter MAX_ROWS = 250, // my puzzle input was 137x137
     parameter MAX_COLS = 250,
     parameter LOG2_MAX_COLS = 8,
-    parameter LOG2_MAX_ROWS = 8
+    parameter LOG2_MAX_ROWS = 8,
+    parameter TRACK_DIRTY_ROWS = 1 // 1: removal rounds after the first only scan the rows next to the last round's removals
 ) (
     // Synchronous inputs:
     input wire clk,
+    input wire ce, // clock enable: all state holds while low (e.g. waiting for streamed input)
     input wire rst,
 
     // IO to interface with ROM:
@@ -26,39 +28,73 @@ module day04_core #(
 
     // scan pipeline:
     localparam S_SCAN_INIT = 2;
-    localparam S_SCAN_REQ1 = 3;
-    localparam S_SCAN_GET0 = 4;
-    localparam S_SCAN_GET1 = 5;
-    localparam S_SCAN_PROCESS = 6;
-    localparam S_SCAN_WAIT = 7;
-    localparam S_SCAN_FLUSH = 8;
+    localparam S_SCAN = 3; // one row per cycle
+    localparam S_SCAN_END = 4;
 
-    localparam S_DONE = 9;
-    reg [3:0] state;
+    localparam S_DONE = 5;
+    reg [2:0] state;
+
+    // memory for scanning state: (declared here as the grid read addresses are driven from scan_row)
+    reg [LOG2_MAX_ROWS-1:0] scan_row; // row whose window is being read from the grid
+    reg [LOG2_MAX_ROWS-1:0] data_row; // row whose window was read last cycle (is being processed)
+    reg data_valid;
+    reg [63:0] scan_count;
+    reg [63:0] total_removed;
+    reg first_scan_flag; // use to stop part 1 computation early
 
     // grid storage:
+    // the rows are interleaved across 4 banks so that rows scan_row-1, scan_row and scan_row+1 (always
+    // in different banks) are all read in the same cycle
     reg grid_we;
     reg [LOG2_MAX_ROWS-1:0] grid_w_addr;
-    reg [LOG2_MAX_ROWS-1:0] grid_r_addr;
     reg [MAX_COLS-1:0] grid_w_data;
-    wire [MAX_COLS-1:0] grid_r_data;
+    wire [3*MAX_COLS-1:0] grid_r_data; // {row_next, row_curr, row_prev} of data_row
+    reg [LOG2_MAX_ROWS-1:0] n_rows;
 
-    reg [MAX_COLS-1:0] mask_prev; // the mask / update to apply to the previous row 
+    wire scan_reading = (state == S_SCAN) && (scan_row < n_rows);
+    wire [2:0] grid_r_en = {scan_reading && (scan_row + 1 < n_rows), scan_reading, scan_reading && (scan_row > 0)};
+    wire [LOG2_MAX_ROWS-1:0] scan_row_prev = scan_row - 1;
+    wire [LOG2_MAX_ROWS-1:0] scan_row_next = scan_row + 1;
+
+    // rows to scan this round, and rows with removals this round (dirty). a row can only have accessible
+    // rolls if a roll was removed from it or a neighbouring row in the last round (if it had any accessible
+    // rolls then, they were removed), so with TRACK_DIRTY_ROWS only the dirty rows and their neighbours are
+    // scanned in the next round, rather than the whole grid:
+    reg [MAX_ROWS-1:0] scan_rows;
+    reg [MAX_ROWS-1:0] dirty_rows;
+
+    // next row to scan, the first in scan_rows from search_row on (n_rows if there are none left):
+    wire [LOG2_MAX_ROWS:0] search_row = (state == S_SCAN) ? scan_row + 1 : 0;
+    reg [LOG2_MAX_ROWS-1:0] next_scan_row;
+    integer r;
+    always @(*) begin
+        next_scan_row = n_rows;
+        for (r = MAX_ROWS - 1; r >= 0; r = r - 1) begin
+            if (scan_rows[r] && r >= search_row && r < n_rows) begin
+                next_scan_row = r;
+            end
+        end
+    end
 
-    ram #(
+    ram_banked #(
         .WIDTH(MAX_COLS),
         .DEPTH(MAX_ROWS),
-        .ADDR_BITS(LOG2_MAX_ROWS)
+        .ADDR_BITS(LOG2_MAX_ROWS),
+        .NUM_BANKS(4),
+        .NUM_PORTS(3)
     ) u_grid_ram_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .we(grid_we),
         .w_addr(grid_w_addr),
         .w_data(grid_w_data),
-        .r_addr(grid_r_addr),
-        .r_data(grid_r_data)
+        .r_en(grid_r_en),
+        .r_addr({scan_row_next, scan_row, scan_row_prev}),
+        .r_data(grid_r_data),
+        .r_conflict(),
+        .conflict_count()
     );
-    reg [LOG2_MAX_ROWS-1:0] n_rows;
     reg [LOG2_MAX_ROWS:0] n_cols;
 
     // memory for loading state:
@@ -66,16 +102,10 @@ module day04_core #(
     reg [LOG2_MAX_ROWS:0] load_col;
     reg [MAX_COLS-1:0] load_buffer;
 
-    // memory for scanning state:
-    reg [LOG2_MAX_ROWS-1:0] scan_row;
-    reg [63:0] scan_count;
-    reg [63:0] total_removed;
-    reg first_scan_flag; // use to stop part 1 computation early
-
-    // 3-row window wires:
-    reg [MAX_COLS-1:0] row_prev;
-    reg [MAX_COLS-1:0] row_curr;
-    reg [MAX_COLS-1:0] row_next;
+    // 3-row window wires: (rows outside the grid are empty)
+    wire [MAX_COLS-1:0] row_prev = (data_row > 0) ? grid_r_data[0 +: MAX_COLS] : {MAX_COLS{1'b0}};
+    wire [MAX_COLS-1:0] row_curr = grid_r_data[MAX_COLS +: MAX_COLS];
+    wire [MAX_COLS-1:0] row_next = (data_row + 1 < n_rows) ? grid_r_data[2*MAX_COLS +: MAX_COLS] : {MAX_COLS{1'b0}};
 
     wire [MAX_COLS-1:0] accessible;
     // instantiate row logic:
@@ -107,7 +137,7 @@ module day04_core #(
 
     reg [15:0] ones_count_val;
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         // defaults:
         grid_we <= 0;
 
@@ -123,18 +153,15 @@ module day04_core #(
             load_col <= 0;
             load_buffer <= 0;
             scan_row <= 0;
+            data_row <= 0;
+            data_valid <= 0;
             scan_count <= 0;
             total_removed <= 0;
             first_scan_flag <= 1;
+            scan_rows <= {MAX_ROWS{1'b1}}; // the first round scans every row
+            dirty_rows <= 0;
             grid_w_addr <= 0;
             grid_w_data <= 0;
-            grid_r_addr <= 0;
-            
-            mask_prev <= 0;
-
-            row_prev <= 0;
-            row_curr <= 0;
-            row_next <= 0;
         end else begin
             case (state)
                 S_IDLE: begin
@@ -192,98 +219,45 @@ module day04_core #(
                 end
 
                 S_SCAN_INIT: begin
-                    grid_r_addr <= 0;
-                    state <= S_SCAN_REQ1;
-                end
-
-
-                S_SCAN_REQ1: begin
-                    // row 0 requested in S_SCAN_INIT, will be ready next state
-                    // request row 1
-                    if (n_rows > 1) begin
-                        grid_r_addr <= 1;
-                    end else begin
-                        grid_r_addr <= 0;
-                    end
-                    state <= S_SCAN_GET0;
-                end
-
-
-                S_SCAN_GET0: begin
-                    // store row 0:
-                    row_curr <= grid_r_data;
-                    row_prev <= 0;
-
-                    // request row 2:
-                    if (n_rows > 2) begin
-                        grid_r_addr <= 2;
-                    end else begin
-                        grid_r_addr <= 0;
-                    end
-                    state <= S_SCAN_GET1;
+                    scan_row <= next_scan_row;
+                    data_valid <= 0;
+                    state <= S_SCAN;
                 end
 
-                S_SCAN_GET1: begin
-                    // store row 1
-                    if (n_rows > 1) begin
-                        row_next <= grid_r_data;
-                    end else begin
-                        row_next <= 0;
-                    end
-
-                    scan_row <= 0;
-                    state <= S_SCAN_PROCESS;
-                end
-
-                S_SCAN_PROCESS: begin
-                    if (scan_row >= n_rows) begin
-                        if (first_scan_flag) begin
-                            part1_result <= scan_count;
-                            first_scan_flag <= 0;
-                        end
-                        state <= S_SCAN_FLUSH;
-                    end else begin
-                        // compute the mask:
+                S_SCAN: begin
+                    // the window of rows scan_row-1..scan_row+1 is read this cycle (see grid_r_en), and
+                    // the window of data_row (read last cycle) is processed:
+                    if (data_valid) begin
                         ones_count_val = ones_count(accessible, n_cols);
                         scan_count <= scan_count + ones_count_val;
 
-                        // buffer the mask:
-                        mask_prev <= accessible;
-
-                        // apply update to prev row (if exists);
-                        if (scan_row > 0) begin
-                            grid_we <= 1;
-                            grid_w_addr <= scan_row - 1;
-                            grid_w_data <= row_prev & ~mask_prev;
+                        // apply the update to data_row. it is written next cycle, after the window of
+                        // data_row+1 has read the old row (read-before-write), so every row of this scan
+                        // sees the grid as it was at the start of the scan:
+                        grid_we <= 1;
+                        grid_w_addr <= data_row;
+                        grid_w_data <= row_curr & ~accessible;
+                        if (accessible != 0) begin
+                            dirty_rows[data_row] <= 1;
                         end
-
-                        row_prev <= row_curr;
-                        row_curr <= row_next;
-
-                        // update next row from pipeline (was already requested in GET0 or prev PROCESS)
-                        if (scan_row + 2 < n_rows) begin
-                            row_next <= grid_r_data;
-                        end else begin
-                            row_next <= 0;
-                        end 
-
-                        // request next row_next so it is ready when it needs to be used:
-                        grid_r_addr <= scan_row + 3;
-                        scan_row <= scan_row + 1;
-                        state <= S_SCAN_WAIT;
                     end
-                end
 
-                S_SCAN_WAIT: begin
-                    // wait for ram read:
-                    state <= S_SCAN_PROCESS;
+                    if (scan_row < n_rows) begin
+                        data_row <= scan_row;
+                        data_valid <= 1;
+                        scan_row <= next_scan_row;
+                    end else begin
+                        data_valid <= 0;
+                        state <= S_SCAN_END;
+                    end
                 end
 
-                S_SCAN_FLUSH: begin
-                    // write the final row update:
-                    grid_we <= 1;
-                    grid_w_addr <= n_rows - 1;
-                    grid_w_data <= row_prev & ~mask_prev;
+                S_SCAN_END: begin
+                    // (the final row update is written this cycle)
+                    if (first_scan_flag) begin
+                        part1_result <= scan_count;
+                        first_scan_flag <= 0;
+                    end
 
                     if (scan_count == 0) begin
                         // no updates -> end
@@ -292,7 +266,10 @@ module day04_core #(
                     end else begin
                         total_removed <= total_removed + scan_count;
                         scan_count <= 0;
-                        scan_row <= 0;
+                        if (TRACK_DIRTY_ROWS) begin
+                            scan_rows <= dirty_rows | (dirty_rows << 1) | (dirty_rows >> 1);
+                        end
+                        dirty_rows <= 0;
                         state <= S_SCAN_INIT;
                     end
                 end
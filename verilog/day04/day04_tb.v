@@ -8,6 +8,17 @@ module day04_tb;
     parameter OUTPUT_DATA_WIDTH = 64;
     parameter INPUT_DATA_FILENAME = "input.txt"; // the filename of the text file that contains puzzle input
                                                  // relative to the directory that the iverilog output is RUN from
+    parameter BATCH_MODE = 0; // if 1, solve every input file listed in MANIFEST_FILENAME (one path per line) in one simulation
+    parameter MANIFEST_FILENAME = "manifest.txt";
+    parameter STREAM = 0; // if 1, stream the input to the core over valid/ready (utils/stream_window.v) instead of the rom
+    parameter STREAM_WINDOW_BITS = 8; // stream buffer size (2^STREAM_WINDOW_BITS bytes)
+    parameter STREAM_GAP_PERCENT = 0; // percentage of cycles the stream source has no byte ready
+    parameter MAX_CYCLES = 0; // watchdog: give up on an input after this many clock cycles (0 = no limit)
+    parameter MAX_ROWS = 250; // largest grid supported by the core (rows / columns)
+    parameter MAX_COLS = 250;
+    parameter LOG2_MAX_ROWS = 8;
+    parameter LOG2_MAX_COLS = 8;
+    parameter TRACK_DIRTY_ROWS = 1; // 0 to rescan the whole grid in every removal round
     //control signals:
     reg clk;
     reg rst;
@@ -16,6 +27,7 @@ module day04_tb;
     wire [N_ADDR_BITS:0] rom_addr;
     wire [7:0] rom_data;
     wire rom_valid;
+    wire rom_stall; // STREAM = 1: the core's input has not arrived yet, drives the core's clock enable
 
     // results:
     wire [OUTPUT_DATA_WIDTH-1:0] part1_result;
@@ -36,27 +48,71 @@ module day04_tb;
     always @(clk) begin
         if (rst) begin
             clock_cycle_count = 0;
-        end else if (clk && !done) begin
+        end else if (clk && !done && !rom_stall) begin
             clock_cycle_count = clock_cycle_count + 1;
         end
     end
 
+    // cycles the core was held (clock enable low) waiting for streamed input (always 0 with the rom), counted in the total:
+    integer stall_cycle_count;
+    initial begin
+        stall_cycle_count = 0;
+    end
+    always @(posedge clk) begin
+        if (rst) begin
+            stall_cycle_count = 0;
+        end else if (rom_stall && !done) begin
+            stall_cycle_count = stall_cycle_count + 1;
+        end
+    end
+
+    // status on the RESULT line, from what the simulation can see. this does not mean the answers are right
+    // (scripts/benchmark.py checks those against the generator's):
+    //   ok: the core finished and reported no problems
+    //   overflow: the input did not fit in the rom (or a streamed byte was overwritten before the core read it)
+    //   timeout: the core was not done after MAX_CYCLES clock cycles
+    wire timed_out = (MAX_CYCLES > 0) && (clock_cycle_count + stall_cycle_count >= MAX_CYCLES);
+    reg [8*10-1:0] status;
+    task set_status;
+        begin
+            if (u_rom_0.truncated || u_rom_0.stream_error) begin
+                status = "overflow";
+            end else if (done !== 1) begin
+                status = "timeout";
+            end else begin
+                status = "ok";
+            end
+        end
+    endtask
+
     // instantiate rom with input file:
     rom #(
-        .N_ADDR_BITS(16),
-        .FILENAME(INPUT_DATA_FILENAME)
+        .N_ADDR_BITS(N_ADDR_BITS),
+        .FILENAME(INPUT_DATA_FILENAME),
+        .LOAD_ON_INIT(!BATCH_MODE),
+        .STREAM(STREAM),
+        .WINDOW_BITS(STREAM_WINDOW_BITS),
+        .GAP_PERCENT(STREAM_GAP_PERCENT)
     ) u_rom_0 (
         .clk(clk),
+        .rst(rst),
         .addr(rom_addr),
         .data_out(rom_data),
-        .valid(rom_valid)
+        .valid(rom_valid),
+        .stall(rom_stall)
     );
 
     // instantiate synthesisable 'day04_core' module:
     day04_core #(
-        .N_ADDR_BITS(N_ADDR_BITS)
+        .N_ADDR_BITS(N_ADDR_BITS),
+        .MAX_ROWS(MAX_ROWS),
+        .MAX_COLS(MAX_COLS),
+        .LOG2_MAX_ROWS(LOG2_MAX_ROWS),
+        .LOG2_MAX_COLS(LOG2_MAX_COLS),
+        .TRACK_DIRTY_ROWS(TRACK_DIRTY_ROWS)
     ) u_core_0 (
         .clk(clk),
+        .ce(!rom_stall),
         .rst(rst),
 
         .rom_addr(rom_addr),
@@ -70,24 +126,70 @@ module day04_tb;
 
     // run day04_core module until done:
     initial begin
-        // reset all modules:
-        rst = 1;
-        repeat (5) @(posedge clk); // be really sure everything is reset
-        rst = 0;
-        $display("INFO: Day04 solver started.");
-
-        // wait until done = 1:
-        wait (done === 1);
-
-        // wait a couple of clock cycles to ensure final calculations are complete:
-        repeat (5) @(posedge clk);
-
-        // display results:
-        $display("Day 4 Complete");
-        $display("Part 1 Result: %0d", part1_result);
-        $display("Part 2 Result: %0d", part2_result);
-        $display("Took %0d clock cycles", clock_cycle_count);
-        $finish;
+        if (!BATCH_MODE) begin
+            // reset all modules:
+            rst = 1;
+            repeat (5) @(posedge clk); // be really sure everything is reset
+            rst = 0;
+            $display("INFO: Day04 solver started.");
+
+            // wait until done = 1 (or the watchdog runs out):
+            wait (done === 1 || timed_out);
+
+            // wait a couple of clock cycles to ensure final calculations are complete:
+            repeat (5) @(posedge clk);
+
+            // display results:
+            set_status;
+            $display("Day 4 Complete");
+            $display("Part 1 Result: %0d", part1_result);
+            $display("Part 2 Result: %0d", part2_result);
+            $display("Took %0d clock cycles", clock_cycle_count + stall_cycle_count);
+            // machine-readable summary line, parsed by scripts/benchmark.py
+            $display("RESULT day=4 status=%0s part1=%0d part2=%0d cycles=%0d", status, part1_result, part2_result, clock_cycle_count + stall_cycle_count);
+            $finish;
+        end
+    end
+
+    // batch mode: solve each input file listed in the manifest, resetting the core in between
+    // (amortises simulator startup over many small inputs). prints one result block per input
+    integer manifest_fd;
+    integer batch_idx;
+    reg [8*256-1:0] batch_filename;
+    initial begin
+        if (BATCH_MODE) begin
+            manifest_fd = $fopen(MANIFEST_FILENAME, "r");
+            if (manifest_fd === 0) begin
+                $display("ERROR: Could not open manifest file '%0s' for reading.", MANIFEST_FILENAME);
+                $finish;
+            end
+
+            batch_idx = 0;
+            rst = 1;
+            while ($fscanf(manifest_fd, "%s\n", batch_filename) == 1) begin
+                // hold the core in reset while the next input is loaded into the rom:
+                rst = 1;
+                u_rom_0.load_file(batch_filename);
+                repeat (5) @(posedge clk);
+                rst = 0;
+                $display("INFO: Batch input %0d: %0s", batch_idx, batch_filename);
+
+                wait (done === 1 || timed_out);
+                repeat (5) @(posedge clk);
+
+                set_status;
+                $display("Day 4 Complete");
+                $display("Part 1 Result: %0d", part1_result);
+                $display("Part 2 Result: %0d", part2_result);
+                $display("Took %0d clock cycles", clock_cycle_count + stall_cycle_count);
+                $display("RESULT day=4 input=%0d status=%0s part1=%0d part2=%0d cycles=%0d", batch_idx, status, part1_result, part2_result, clock_cycle_count + stall_cycle_count);
+                batch_idx = batch_idx + 1;
+            end
+
+            $fclose(manifest_fd);
+            $display("INFO: Batch complete, solved %0d inputs", batch_idx);
+            $finish;
+        end
     end
 
 endmodule
@@ -5,6 +5,7 @@ module day05_core #(
 ) (
     // Synchronous inputs:
     input wire clk,
+    input wire ce, // clock enable: all state holds while low (e.g. waiting for streamed input)
     input wire rst,
 
     // IO to interface with ROM:
@@ -35,17 +36,11 @@ module day05_core #(
     localparam S_MERGE_CHECK = 9;
     localparam S_MERGE_SAVE = 10;
 
-    // parse values:
+    // parse values (each one is issued into the search pipeline as soon as it is parsed):
     localparam S_PARSE_VALUE = 11;
+    localparam S_SEARCH_DRAIN = 12; // wait for the last values to leave the search pipeline
 
-    // searching for values:
-    localparam S_SEARCH_INIT = 12;
-    localparam S_SEARCH_LOOP = 13;
-    localparam S_SEARCH_WAIT = 14;
-    localparam S_SEARCH_EVAL = 15;
-    localparam S_SEARCH_NEXT = 16; // return to parse value state after this
-
-    localparam S_DONE = 17;
+    localparam S_DONE = 13;
     reg [4:0] state;
 
     // !!! RAM:
@@ -60,6 +55,7 @@ module day05_core #(
         .ADDR_BITS(LOG2_MAX_RANGES)
     ) u_range_ram_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .we(r_ram_we),
         .w_addr(r_ram_addr),
@@ -72,20 +68,64 @@ module day05_core #(
     reg [LOG2_MAX_RANGES-1:0] m_ram_addr;
     reg [127:0] m_ram_w_data;
     wire [127:0] m_ram_r_data;
+    wire [LOG2_MAX_RANGES-1:0] m_ram_r_addr;
     ram #(
         .WIDTH(128),
         .DEPTH(MAX_RANGES),
         .ADDR_BITS(LOG2_MAX_RANGES)
     ) u_merged_ram_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .we(m_ram_we),
         .w_addr(m_ram_addr),
         .w_data(m_ram_w_data),
-        .r_addr(m_ram_addr),
+        .r_addr(m_ram_r_addr), // only read by the last stage of the search pipeline
         .r_data(m_ram_r_data)
     );
 
+    // search tree: the starts of the merged ranges are also written to one small ram per level of a
+    // binary search tree over the merged ram, so that every stage of the search pipeline has its own
+    // ram to read from and a new value can enter the pipeline every clock cycle.
+    // level k holds the merged ranges whose index is an odd multiple of 2^(LOG2_MAX_RANGES-1-k) (2^k of
+    // them), which are the only ranges the k-th step of the binary search can compare against
+    // (index 0 isn't in any level, it's where the search starts)
+    function integer tree_level;
+        input [LOG2_MAX_RANGES-1:0] idx;
+        integer b;
+        begin
+            tree_level = LOG2_MAX_RANGES;
+            for (b = LOG2_MAX_RANGES-1; b >= 0; b = b - 1) begin
+                if (idx[b]) tree_level = LOG2_MAX_RANGES-1-b; // the lowest set bit decides the level
+            end
+        end
+    endfunction
+
+    wire [LOG2_MAX_RANGES*64-1:0] level_r_data; // the start each stage read, one per level
+    reg [LOG2_MAX_RANGES*LOG2_MAX_RANGES-1:0] level_r_addr;
+    reg [LOG2_MAX_RANGES*LOG2_MAX_RANGES-1:0] level_w_addr; // where each level would hold the range being merged
+
+    genvar g;
+    generate
+        for (g = 0; g < LOG2_MAX_RANGES; g = g + 1) begin : g_level
+            localparam LEVEL_ADDR_BITS = (g > 0) ? g : 1;
+            ram #(
+                .WIDTH(64),
+                .DEPTH(1 << g),
+                .ADDR_BITS(LEVEL_ADDR_BITS)
+            ) u_level_ram (
+                .clk(clk),
+                .ce(ce),
+                .rst(rst),
+                .we(m_ram_we && tree_level(m_ram_addr) == g),
+                .w_addr(level_w_addr[g*LOG2_MAX_RANGES +: LEVEL_ADDR_BITS]),
+                .w_data(m_ram_w_data[127:64]),
+                .r_addr(level_r_addr[g*LOG2_MAX_RANGES +: LEVEL_ADDR_BITS]),
+                .r_data(level_r_data[g*64 +: 64])
+            );
+        end
+    endgenerate
+
 
     // variables/intermediate registers
     reg [63:0] current_num;
@@ -94,7 +134,6 @@ module day05_core #(
 
     // parsing variables:
     reg is_parsing_ranges; // 1 = parsing ranges, 0 = values (for part1 lookup)
-    reg is_eof;
     reg has_parsed_digit;
 
     reg [LOG2_MAX_RANGES:0] num_ranges;
@@ -108,13 +147,41 @@ module day05_core #(
     reg [63:0] curr_start;
     reg [63:0] curr_end;
 
-    // search/lookup variables:
-    reg [63:0] search_val;
-    reg [LOG2_MAX_RANGES:0] low;
-    reg [LOG2_MAX_RANGES:0] high; // uses binary search to optimise lookups
+    // search pipeline: finds the last merged range that starts at or before each value (a branchless
+    // binary search), one step per stage, then checks the value is inside it.
+    // stage k (0 to LOG2_MAX_RANGES-1) reads the start of the range at pos + 2^(LOG2_MAX_RANGES-1-k) from level k
+    // of the search tree, and the next stage moves pos there if that range exists and starts at or before the
+    // value. the last stage reads the whole range at pos from the merged ram.
+    // pipe_*[k] is the value entering stage k (pipe_*[LOG2_MAX_RANGES+1] is the value with its range read)
+    reg [LOG2_MAX_RANGES+1:0] pipe_valid;
+    reg [63:0] pipe_val [0:LOG2_MAX_RANGES+1];
+    reg [LOG2_MAX_RANGES-1:0] pipe_pos [0:LOG2_MAX_RANGES];
+    reg [(LOG2_MAX_RANGES+1)*LOG2_MAX_RANGES-1:0] search_pos; // each stage's pos, after the step of the read it holds
+
+    integer k;
+    reg [LOG2_MAX_RANGES-1:0] step_pos;
+    always @(*) begin
+        search_pos[0 +: LOG2_MAX_RANGES] = 0;
+        for (k = 1; k <= LOG2_MAX_RANGES; k = k + 1) begin
+            step_pos = pipe_pos[k] | (1 << (LOG2_MAX_RANGES-k));
+            if ({1'b0, step_pos} < num_merged && level_r_data[(k-1)*64 +: 64] <= pipe_val[k]) begin
+                search_pos[k*LOG2_MAX_RANGES +: LOG2_MAX_RANGES] = step_pos;
+            end else begin
+                search_pos[k*LOG2_MAX_RANGES +: LOG2_MAX_RANGES] = pipe_pos[k];
+            end
+        end
+
+        for (k = 0; k < LOG2_MAX_RANGES; k = k + 1) begin
+            level_r_addr[k*LOG2_MAX_RANGES +: LOG2_MAX_RANGES] = search_pos[k*LOG2_MAX_RANGES +: LOG2_MAX_RANGES] >> (LOG2_MAX_RANGES-k);
+            level_w_addr[k*LOG2_MAX_RANGES +: LOG2_MAX_RANGES] = m_ram_addr >> (LOG2_MAX_RANGES-k);
+        end
+    end
+    assign m_ram_r_addr = search_pos[LOG2_MAX_RANGES*LOG2_MAX_RANGES +: LOG2_MAX_RANGES];
+
+    integer s; // (pipeline stage loop index in the clocked block)
 
     // logic implementation:
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             rom_addr <= 0;
@@ -124,7 +191,7 @@ module day05_core #(
             num_ranges <= 0;
             num_merged <= 0;
             is_parsing_ranges <= 1;
-            is_eof <= 0;
+            pipe_valid <= 0;
             current_num <= 0;
             has_parsed_digit <= 0;
             r_ram_we <= 0;
@@ -136,6 +203,19 @@ module day05_core #(
             r_ram_we <= 0;
             m_ram_we <= 0;
 
+            // advance the search pipeline (a new value is issued into it by S_PARSE_VALUE):
+            pipe_valid <= pipe_valid << 1;
+            for (s = 0; s <= LOG2_MAX_RANGES; s = s + 1) begin
+                pipe_val[s+1] <= pipe_val[s];
+            end
+            for (s = 0; s < LOG2_MAX_RANGES; s = s + 1) begin
+                pipe_pos[s+1] <= search_pos[s*LOG2_MAX_RANGES +: LOG2_MAX_RANGES];
+            end
+            if (pipe_valid[LOG2_MAX_RANGES+1] && num_merged != 0 &&
+                pipe_val[LOG2_MAX_RANGES+1] >= m_ram_r_data[127:64] && pipe_val[LOG2_MAX_RANGES+1] <= m_ram_r_data[63:0]) begin
+                part1_result <= part1_result + 1;
+            end
+
             case (state)
                 S_IDLE: begin
                     state <= S_PARSE_RANGE;
@@ -187,6 +267,7 @@ module day05_core #(
                         r_ram_w_data <= {range_L, range_R};
                         r_ram_we <= 1;
                         num_ranges <= 1;
+                        scan_idx <= 0; // (not -1, so S_INSERT_WRITE_DONE doesn't insert it again)
                         state <= S_INSERT_WRITE_DONE;
                     end else begin
                         scan_idx <= num_ranges-1;
@@ -297,9 +378,9 @@ module day05_core #(
                     num_merged <= num_merged + 1;
                     part2_result <= part2_result + (curr_end - curr_start + 1);
 
+                    // (rom_addr is already past the blank line, at the first value)
                     current_num <= 0;
                     has_parsed_digit <= 0;
-                    rom_addr <= rom_addr + 1;
                     state <= S_PARSE_VALUE;
                 end
 
@@ -314,73 +395,28 @@ module day05_core #(
                             has_parsed_digit <= 1;
                         end else if (rom_data == "\n") begin
                             if (has_parsed_digit) begin
-                                search_val <= current_num;
-                                state <= S_SEARCH_INIT;
+                                // issue the value into the search pipeline and carry on parsing:
+                                pipe_valid[0] <= 1;
+                                pipe_val[0] <= current_num;
+                                current_num <= 0;
+                                has_parsed_digit <= 0;
                             end
                             // ignore empty lines / training newlines
                         end
-                        // advance rom address
-                        if (!(rom_data == 10 && has_parsed_digit)) begin
-                            rom_addr <= rom_addr + 1;
-                        end
+                        rom_addr <= rom_addr + 1;
                     end else begin
                         // reached EOF, check final ID:
                         if (has_parsed_digit) begin
-                            search_val <= current_num;
-                            state <= S_SEARCH_INIT;
-                            is_eof <= 1;
-                        end else begin
-                            state <= S_DONE;
+                            pipe_valid[0] <= 1;
+                            pipe_val[0] <= current_num;
                         end
+                        state <= S_SEARCH_DRAIN;
                     end
                 end
 
-                S_SEARCH_INIT: begin
-                    // $display("Searching for %d", search_val);
-                    low <= 0;
-                    high <= num_merged - 1;
-                    state <= S_SEARCH_LOOP;
-                end
-
-                S_SEARCH_LOOP: begin
-                    if (low > high) begin
-                        state <= S_SEARCH_NEXT;
-                    end else begin
-                        m_ram_addr <= low + ((high-low) >> 1);
-                        state <= S_SEARCH_WAIT;
-                    end
-                end
-
-                S_SEARCH_WAIT: begin
-                    state <= S_SEARCH_EVAL;
-                end
-
-                S_SEARCH_EVAL: begin
-                    if (search_val >= m_ram_r_data[127:64] && search_val <= m_ram_r_data[63:0]) begin
-                        part1_result <= part1_result + 1;
-                        state <= S_SEARCH_NEXT;
-                    end else if (search_val < m_ram_r_data[127:64]) begin
-                        if (m_ram_addr == 0) begin
-                            state <= S_SEARCH_NEXT;
-                        end else begin
-                            high <= m_ram_addr - 1;
-                            state <= S_SEARCH_LOOP;
-                        end
-                    end else begin
-                            low <= m_ram_addr + 1;
-                            state <= S_SEARCH_LOOP;
-                    end
-                end
-
-                S_SEARCH_NEXT: begin
-                    current_num <= 0;
-                    has_parsed_digit <= 0;
-
-                    if (is_eof) begin
+                S_SEARCH_DRAIN: begin
+                    if (pipe_valid == 0) begin
                         state <= S_DONE;
-                    end else begin
-                        state <= S_PARSE_VALUE;
-                        rom_addr <= rom_addr + 1;
                     end
                 end
 
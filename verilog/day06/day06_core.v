@@ -6,6 +6,7 @@ module day06_core #(
 ) (
     // Synchronous inputs:
     input wire clk,
+    input wire ce, // clock enable: all state holds while low (e.g. waiting for streamed input)
     input wire rst,
 
     // IO to interface with ROM:
@@ -76,6 +77,7 @@ module day06_core #(
                 .ADDR_BITS(WIDTH_BITS)
             ) u_ram_i (
                 .clk(clk),
+                .ce(ce),
                 .rst(rst),
                 .we(ram_we[gi]),
                 .w_addr(curr_x),
@@ -98,7 +100,7 @@ module day06_core #(
 
 
     integer i;
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_LOAD_INPUT;
             rom_addr <= 0;
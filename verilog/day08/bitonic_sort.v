@@ -10,6 +10,7 @@ module bitonic_sorter #(
     parameter PAD_VALUE = {32'hFFFFFFFF, 32'd0}
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
     input wire start,
     input wire [DATA_ADDR_BITS:0] num_values,
@@ -67,7 +68,7 @@ module bitonic_sorter #(
         end
     endfunction
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             done <= 0;
@@ -46,6 +46,7 @@ module tb_bitonic_sorter;
         .DATA_WIDTH(DATA_WIDTH)
     ) u_sorter_0 (
         .clk(clk),
+        .ce(1'b1),
         .rst(rst),
         .start(start),
         .num_values(num_data_values),
@@ -70,6 +71,7 @@ module tb_bitonic_sorter;
         .ADDR_BITS(DATA_ADDR_BITS)
     ) ram_dp_u0(
         .clk(clk),
+        .ce(1'b1),
         .rst(rst),
         .we_a(mux_we_a),
         .addr_a(mux_addr_a),
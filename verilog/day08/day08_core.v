@@ -6,10 +6,14 @@ module day08_core #(
     parameter MAX_EDGES = 16384,
     parameter EDGE_ADDR_BITS = 14,
     parameter EDGE_WIDTH = 64,
-    parameter PART1_EDGES = 1000
+    parameter PART1_EDGES = 1000,
+    parameter USE_BITONIC_SORT = 0, // 1 = sort the edges with the older bitonic sorter instead of heap sort (see README)
+    parameter KNN_EDGES = 0, // 1 = keep the KNN_K closest nodes to each node (knn_edge_generator.v) instead of the sparsity heuristic
+    parameter KNN_K = 12
 ) (
     // Synchronous inputs:
     input wire clk,
+    input wire ce, // clock enable: all state holds while low (e.g. waiting for streamed input)
     input wire rst,
 
     // IO to interface with ROM:
@@ -20,6 +24,8 @@ module day08_core #(
     // results:
     output wire [63:0] part1_result,
     output wire [63:0] part2_result,
+    output wire edges_dropped, // edge ram filled up, so edges that should have been kept were not
+    output wire part2_found, // every node ended up in one circuit (part2_result is only valid if so)
     output reg done
 );
     // fsm states:
@@ -114,6 +120,7 @@ module day08_core #(
         .COORD_WIDTH(COORD_WIDTH)
     ) u_parser_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .start(parser_start),
         .rom_data(rom_data),
@@ -149,6 +156,7 @@ module day08_core #(
         .ADDR_BITS(NODE_ADDR_BITS)
     ) u_node_ram_dp_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         
         // port a written to by parser, and read by edge generator and DSU
@@ -165,29 +173,61 @@ module day08_core #(
     );
 
     // instantiate edge generator:
-    edge_generator #(
-        .MAX_NODES(MAX_NODES),
-        .NODE_ADDR_BITS(NODE_ADDR_BITS),
-        .COORD_WIDTH(COORD_WIDTH),
-        .MAX_EDGES(MAX_EDGES),
-        .EDGE_ADDR_BITS(EDGE_ADDR_BITS),
-        .EDGE_WIDTH(EDGE_WIDTH)
-        // left num buckets as 16
-    ) u_edge_generator_0 (
-        .clk(clk),
-        .rst(rst),
-        .start(edge_generation_start),
-        .num_nodes(num_nodes),
-        .node_r_data_a(node_r_data_a),
-        .node_r_data_b(node_r_data_b),
-        .node_r_addr_a(node_r_addr_a),
-        .node_r_addr_b(node_r_addr_b),
-        .edge_we(edge_gen_we),
-        .edge_w_addr(edge_gen_w_addr),
-        .edge_w_data(edge_gen_w_data),
-        .num_edges(num_edges),
-        .done(edge_gen_done)
-    );
+    generate
+        if (KNN_EDGES) begin : g_knn_edges
+            knn_edge_generator #(
+                .MAX_NODES(MAX_NODES),
+                .NODE_ADDR_BITS(NODE_ADDR_BITS),
+                .COORD_WIDTH(COORD_WIDTH),
+                .MAX_EDGES(MAX_EDGES),
+                .EDGE_ADDR_BITS(EDGE_ADDR_BITS),
+                .EDGE_WIDTH(EDGE_WIDTH),
+                .K(KNN_K)
+            ) u_knn_edge_generator_0 (
+                .clk(clk),
+                .ce(ce),
+                .rst(rst),
+                .start(edge_generation_start),
+                .num_nodes(num_nodes),
+                .node_r_data_a(node_r_data_a),
+                .node_r_data_b(node_r_data_b),
+                .node_r_addr_a(node_r_addr_a),
+                .node_r_addr_b(node_r_addr_b),
+                .edge_we(edge_gen_we),
+                .edge_w_addr(edge_gen_w_addr),
+                .edge_w_data(edge_gen_w_data),
+                .num_edges(num_edges),
+                .edges_dropped(edges_dropped),
+                .done(edge_gen_done)
+            );
+        end else begin : g_sparsity_heuristic
+            edge_generator #(
+                .MAX_NODES(MAX_NODES),
+                .NODE_ADDR_BITS(NODE_ADDR_BITS),
+                .COORD_WIDTH(COORD_WIDTH),
+                .MAX_EDGES(MAX_EDGES),
+                .EDGE_ADDR_BITS(EDGE_ADDR_BITS),
+                .EDGE_WIDTH(EDGE_WIDTH)
+                // left num buckets as 16
+            ) u_edge_generator_0 (
+                .clk(clk),
+                .ce(ce),
+                .rst(rst),
+                .start(edge_generation_start),
+                .num_nodes(num_nodes),
+                .node_r_data_a(node_r_data_a),
+                .node_r_data_b(node_r_data_b),
+                .node_r_addr_a(node_r_addr_a),
+                .node_r_addr_b(node_r_addr_b),
+                .edge_we(edge_gen_we),
+                .edge_w_addr(edge_gen_w_addr),
+                .edge_w_data(edge_gen_w_data),
+                .num_edges(num_edges),
+                .edges_dropped(edges_dropped),
+                .done(edge_gen_done)
+            );
+        end
+    endgenerate
 
 
     // edge ram multiplexing logic:
@@ -252,6 +292,7 @@ module day08_core #(
         .INIT_VALUE({32'hFFFFFFFF, 32'd0})  // Max weight, indices not strictly relevant
     ) u_edge_ram_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         // port b:
         .we_a(edge_we_a),
@@ -270,31 +311,63 @@ module day08_core #(
     // instantiate sorter:
     wire [EDGE_ADDR_BITS-1:0] sort_progress;
 
-    heap_sorter #(
-        .MAX_NUM_VALUES(MAX_EDGES),
-        .DATA_ADDR_BITS(EDGE_ADDR_BITS),
-        .DATA_WIDTH(EDGE_WIDTH)
-    ) u_bitonic_sorter_0 (
-        .clk(clk),
-        .rst(rst),
-        .start(sorter_start),
-        .num_values(num_edges),
-
-        .data_we_a(sorter_we_a),
-        .data_w_addr_a(sorter_w_addr_a),
-        .data_w_data_a(sorter_w_data_a),
-        .data_r_addr_a(sorter_r_addr_a),
-        .data_r_data_a(edge_r_data_a),
-
-        .data_we_b(sorter_we_b),
-        .data_w_addr_b(sorter_w_addr_b),
-        .data_w_data_b(sorter_w_data_b),
-        .data_r_addr_b(sorter_r_addr_b),
-        .data_r_data_b(edge_r_data_b),
-
-        .done(sorter_done),
-        .sort_progress(sort_progress)
-    );
+    generate
+        if (USE_BITONIC_SORT) begin : g_bitonic_sort
+            bitonic_sorter #(
+                .MAX_NUM_VALUES(MAX_EDGES),
+                .DATA_ADDR_BITS(EDGE_ADDR_BITS),
+                .DATA_WIDTH(EDGE_WIDTH)
+            ) u_bitonic_sorter_0 (
+                .clk(clk),
+                .ce(ce),
+                .rst(rst),
+                .start(sorter_start),
+                .num_values(num_edges),
+
+                .data_we_a(sorter_we_a),
+                .data_w_addr_a(sorter_w_addr_a),
+                .data_w_data_a(sorter_w_data_a),
+                .data_r_addr_a(sorter_r_addr_a),
+                .data_r_data_a(edge_r_data_a),
+
+                .data_we_b(sorter_we_b),
+                .data_w_addr_b(sorter_w_addr_b),
+                .data_w_data_b(sorter_w_data_b),
+                .data_r_addr_b(sorter_r_addr_b),
+                .data_r_data_b(edge_r_data_b),
+
+                .done(sorter_done),
+                .sort_progress(sort_progress)
+            );
+        end else begin : g_heap_sort
+            heap_sorter #(
+                .MAX_NUM_VALUES(MAX_EDGES),
+                .DATA_ADDR_BITS(EDGE_ADDR_BITS),
+                .DATA_WIDTH(EDGE_WIDTH)
+            ) u_heap_sorter_0 (
+                .clk(clk),
+                .ce(ce),
+                .rst(rst),
+                .start(sorter_start),
+                .num_values(num_edges),
+
+                .data_we_a(sorter_we_a),
+                .data_w_addr_a(sorter_w_addr_a),
+                .data_w_data_a(sorter_w_data_a),
+                .data_r_addr_a(sorter_r_addr_a),
+                .data_r_data_a(edge_r_data_a),
+
+                .data_we_b(sorter_we_b),
+                .data_w_addr_b(sorter_w_addr_b),
+                .data_w_data_b(sorter_w_data_b),
+                .data_r_addr_b(sorter_r_addr_b),
+                .data_r_data_b(edge_r_data_b),
+
+                .done(sorter_done),
+                .sort_progress(sort_progress)
+            );
+        end
+    endgenerate
 
 
     // instantiate parent ram:
@@ -304,6 +377,7 @@ module day08_core #(
         .ADDR_BITS(NODE_ADDR_BITS)
     ) u_parent_ram_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .we(dsu_parent_we),
         .w_addr(dsu_parent_w_addr),
@@ -320,6 +394,7 @@ module day08_core #(
         .ADDR_BITS(NODE_ADDR_BITS)
     ) u_size_ram_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .we(dsu_size_we),
         .w_addr(dsu_size_w_addr),
@@ -340,6 +415,7 @@ module day08_core #(
         .PART1_EDGES(PART1_EDGES)
     ) u_dsu_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .start(dsu_start),
         .num_nodes(num_nodes),
@@ -360,10 +436,11 @@ module day08_core #(
         .size_w_data(dsu_size_w_data),
         .part1_result(part1_result),
         .part2_result(part2_result),
+        .part2_found(part2_found),
         .done(dsu_done)
     );
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             parser_start <= 0;
@@ -398,7 +475,7 @@ module day08_core #(
 
                 S_EDGE_GENERATION: begin
                     if (edge_gen_done) begin
-                        $display("\tEdge generation done, beginning sorting");
+                        $display("\tEdge generation done (%0d edges), beginning sorting", num_edges);
                         sorter_start <= 1;
                         state <= S_SORT_EDGES;
                     end
@@ -438,6 +515,7 @@ module parser #(
     parameter COORD_WIDTH = 32
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
     input wire start,
 
@@ -483,7 +561,7 @@ module parser #(
     wire [COORD_WIDTH-1:0] acc_x_10 = (acc << 3) + (acc << 1);
     wire [COORD_WIDTH-1:0] acc_next = acc_x_10 + {28'd0, digit_value};
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             rom_addr <= 0;
@@ -616,6 +694,7 @@ module edge_generator #(
     parameter NUM_BUCKETS = 16
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
     input wire start,
     input wire [NODE_ADDR_BITS-1:0] num_nodes,
@@ -633,6 +712,7 @@ module edge_generator #(
 
     // output signals:
     output reg [EDGE_ADDR_BITS:0] num_edges,
+    output reg edges_dropped, // an edge below the threshold did not fit in edge ram
     output reg done
 );
     // FSM states:
@@ -685,12 +765,13 @@ module edge_generator #(
 
     integer k;
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             idx_i <= 0;
             idx_j <= 0;
             num_edges <= 0;
+            edges_dropped <= 0;
             edge_we <= 0;
             done <= 0;
             threshold <= {(COORD_WIDTH*2+2){1'b1}};
@@ -710,6 +791,7 @@ module edge_generator #(
                         idx_i <= 0;
                         idx_j <= 1;
                         num_edges <= 0;
+                        edges_dropped <= 0;
                         done <= 0;
                         for (k=0; k<NUM_BUCKETS; k=k+1) begin
                             bucket_counts[k] <= 0;
@@ -846,6 +928,7 @@ module edge_generator #(
                             num_edges <= num_edges + 1;
                         end else if (num_edges >= MAX_EDGES) begin
                             $display("WARNING: Not all edges below threshold were selected!");
+                            edges_dropped <= 1;
                         end
                     end
 
@@ -885,6 +968,7 @@ module dsu #(
     parameter PART1_EDGES = 1000 // number of edges to process for part 1
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
     input wire start,
 
@@ -917,6 +1001,7 @@ module dsu #(
     // output values and signals
     output reg [63:0] part1_result,
     output reg [63:0] part2_result,
+    output reg part2_found, // the edges joined every node into one circuit
     output reg done
 );
     // define states:
@@ -960,6 +1045,8 @@ module dsu #(
 
     // variables for edge processing:
     reg [EDGE_ADDR_BITS:0] edge_idx;
+    reg [EDGE_ADDR_BITS:0] edges_used; // edges processed, not counting repeats (for part 1)
+    reg [EDGE_WIDTH-1:0] prev_edge; // the last edge processed (knn_edge_generator can write an edge twice)
     reg [NODE_ADDR_BITS-1:0] edge_u;
     reg [NODE_ADDR_BITS-1:0] edge_v;
 
@@ -998,7 +1085,7 @@ module dsu #(
     wire [COORD_WIDTH-1:0] node_x = node_r_data[COORD_WIDTH*3-1:COORD_WIDTH*2];
 
     // pray for me:
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             parent_we <= 0;
@@ -1007,7 +1094,9 @@ module dsu #(
             part1_done <= 0;
             part1_result <= 0;
             part2_result <= 0;
+            part2_found <= 0;
             edge_idx <= 0;
+            edges_used <= 0;
             init_idx <= 0;
             num_components <= 0;
         end else begin
@@ -1023,7 +1112,9 @@ module dsu #(
                         part1_done <= 0;
                         part1_result <= 0;
                         part2_result <= 0;
+                        part2_found <= 0;
                         edge_idx <= 0;
+                        edges_used <= 0;
                         top1 <= 0;
                         top2 <= 0;
                         top3 <= 0;
@@ -1074,11 +1165,18 @@ module dsu #(
 
 
                 S_FIND_U_ISSUE: begin
-                    edge_u <= edge_r_data[31:16];
-                    edge_v <= edge_r_data[15:0];
-                    find_node <= edge_r_data[31:16];
-                    parent_r_addr <= edge_r_data[31:16];
-                    state <= S_FIND_U_WAIT;
+                    if (edge_idx != 0 && edge_r_data == prev_edge) begin
+                        // the same edge again (sorted next to the first), skip it:
+                        edge_idx <= edge_idx + 1;
+                        state <= S_READ_EDGE;
+                    end else begin
+                        prev_edge <= edge_r_data;
+                        edge_u <= edge_r_data[31:16];
+                        edge_v <= edge_r_data[15:0];
+                        find_node <= edge_r_data[31:16];
+                        parent_r_addr <= edge_r_data[31:16];
+                        state <= S_FIND_U_WAIT;
+                    end
                 end
 
 
@@ -1179,9 +1277,10 @@ module dsu #(
 
                     // move to next edge:
                     edge_idx <= edge_idx + 1;
+                    edges_used <= edges_used + 1;
 
                     // check part 1 threshold or part 2 completion
-                    if (edge_idx + 1 >= PART1_EDGES && !part1_done) begin
+                    if (edges_used + 1 >= PART1_EDGES && !part1_done) begin
                         state <= S_SCAN_ISSUE;
                         scan_idx <= 0;
                     end else if (part1_done && (root_u != root_v) && (num_components <= 2)) begin
@@ -1274,6 +1373,7 @@ module dsu #(
 
                 S_COMPUTE_P2: begin
                     part2_result <= x_u * x_v;
+                    part2_found <= 1;
                     state <= S_DONE;
                 end
 
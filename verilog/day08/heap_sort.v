@@ -4,6 +4,7 @@ module heap_sorter #(
     parameter DATA_WIDTH = 64
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
     input wire start,
     input wire [DATA_ADDR_BITS:0] num_values,
@@ -60,7 +61,7 @@ module heap_sorter #(
     reg needs_swap;
     reg swap_with_left;
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             done <= 0;
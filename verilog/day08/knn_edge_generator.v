@@ -0,0 +1,255 @@
+/*
+Alternative to `edge_generator` (day08_core.v, selected with KNN_EDGES = 1):
+    instead of the histogram / threshold heuristic, keeps the K closest nodes to each
+    node, and puts those edges into edge RAM (at most num_nodes * K of them).
+
+    Each node i is compared with every other node j (in increasing j), through the same
+    distance pipeline as `edge_generator`, and each distance is inserted into a sorted list
+    of the K closest nodes seen so far (a register per entry, so an insert takes a single
+    clock cycle). Once every j has left the pipeline, the list is written to edge RAM.
+
+    An edge is written as {distance, min(i, j), max(i, j)}, so an edge in both of its nodes'
+    lists is written twice, as two identical words. These end up next to each other after
+    sorting, and the dsu skips the second one.
+*/
+module knn_edge_generator #(
+    parameter MAX_NODES = 1024,
+    parameter NODE_ADDR_BITS = 10,
+    parameter COORD_WIDTH = 32,
+    parameter MAX_EDGES = 16384, // must be at least MAX_NODES * K, or edges are dropped
+    parameter EDGE_ADDR_BITS = 14,
+    parameter EDGE_WIDTH = 64,
+    parameter K = 12 // closest nodes kept per node (12 is the kissing number in 3D)
+) (
+    input wire clk,
+    input wire ce, // clock enable
+    input wire rst,
+    input wire start,
+    input wire [NODE_ADDR_BITS-1:0] num_nodes,
+
+    // node RAM read interface (2 port):
+    input wire [COORD_WIDTH*3-1:0] node_r_data_a, // packed coordinate tuples (x,y,z), read from ram
+    input wire [COORD_WIDTH*3-1:0] node_r_data_b,
+    output reg [NODE_ADDR_BITS-1:0] node_r_addr_a, // indices to req data from ram
+    output reg [NODE_ADDR_BITS-1:0] node_r_addr_b,
+
+    // edge ram write interface:
+    output reg edge_we,
+    output reg [EDGE_ADDR_BITS-1:0] edge_w_addr,
+    output reg [EDGE_WIDTH-1:0] edge_w_data,
+
+    // output signals:
+    output reg [EDGE_ADDR_BITS:0] num_edges,
+    output reg edges_dropped, // a closest node did not fit in edge ram (MAX_EDGES is less than num_nodes * K)
+    output reg done
+);
+    // FSM states:
+    localparam S_IDLE = 0;
+    localparam S_SCAN = 1; // compare node idx_i with every node
+    localparam S_EMIT = 2; // write node idx_i's list to edge ram
+    localparam S_DONE = 3;
+    reg [1:0] state;
+
+    // pairwise iter indices:
+    reg [NODE_ADDR_BITS-1:0] idx_i;
+    reg [NODE_ADDR_BITS-1:0] idx_j;
+    reg issuing; // idx_j has not passed the last node yet
+    wire last_j = (idx_j >= num_nodes - 1);
+
+    // pipeline registers: the same 5 stages as edge_generator
+    reg [NODE_ADDR_BITS-1:0] pipe_j [0:4];
+    reg pipe_valid [0:4];
+
+    // extract coordinates from node data (stage 1)
+    wire [COORD_WIDTH-1:0] x_a = node_r_data_a[COORD_WIDTH*3-1:COORD_WIDTH*2];
+    wire [COORD_WIDTH-1:0] y_a = node_r_data_a[COORD_WIDTH*2-1:COORD_WIDTH];
+    wire [COORD_WIDTH-1:0] z_a = node_r_data_a[COORD_WIDTH-1:0];
+    wire [COORD_WIDTH-1:0] x_b = node_r_data_b[COORD_WIDTH*3-1:COORD_WIDTH*2];
+    wire [COORD_WIDTH-1:0] y_b = node_r_data_b[COORD_WIDTH*2-1:COORD_WIDTH];
+    wire [COORD_WIDTH-1:0] z_b = node_r_data_b[COORD_WIDTH-1:0];
+
+    // compute deltas per coordinate dimension (stage 2)
+    reg signed [COORD_WIDTH:0] dx;
+    reg signed [COORD_WIDTH:0] dy;
+    reg signed [COORD_WIDTH:0] dz;
+
+    // squares delta values (stage 3)
+    reg [COORD_WIDTH*2-1:0] dx2;
+    reg [COORD_WIDTH*2-1:0] dy2;
+    reg [COORD_WIDTH*2-1:0] dz2;
+
+    // sum squares (stage 4):
+    reg [COORD_WIDTH*2+1:0] dist_sq;
+    // (saturated to the 32 bits stored in an edge, so the list is in the same order as the sorted edges)
+    wire [31:0] new_dist = (dist_sq > 32'hFFFFFFFF) ? 32'hFFFFFFFF : dist_sq[31:0];
+
+    // sorted list of the closest nodes to idx_i (stage 5), closest first:
+    reg [31:0] list_dist [0:K-1];
+    reg [NODE_ADDR_BITS-1:0] list_idx [0:K-1];
+    reg list_valid [0:K-1];
+
+    // insert_before[s]: the new node is closer than entry s (or entry s is empty). as the list is sorted this is
+    // 0 for the entries before the new node's position, and 1 from it on. a node as close as an entry goes after
+    // it, so ties keep the smaller index first
+    reg [K-1:0] insert_before;
+    integer s;
+    always @(*) begin
+        for (s=0; s<K; s=s+1) begin
+            insert_before[s] = !list_valid[s] || (new_dist < list_dist[s]);
+        end
+    end
+
+    reg [4:0] emit_idx; // list entry being written to edge ram (enough for K up to 31)
+    wire [NODE_ADDR_BITS-1:0] emit_j = list_idx[emit_idx];
+
+    integer k;
+
+    always @(posedge clk) if (ce) begin
+        if (rst) begin
+            state <= S_IDLE;
+            idx_i <= 0;
+            idx_j <= 0;
+            issuing <= 0;
+            num_edges <= 0;
+            edges_dropped <= 0;
+            edge_we <= 0;
+            done <= 0;
+            for (k=0; k<5; k=k+1) begin
+                pipe_valid[k] <= 0;
+            end
+            for (k=0; k<K; k=k+1) begin
+                list_valid[k] <= 0;
+            end
+        end else begin
+            edge_we <= 0;
+
+            case (state)
+                S_IDLE: begin
+                    if (start) begin
+                        state <= S_SCAN;
+                        idx_i <= 0;
+                        idx_j <= 0;
+                        issuing <= 1;
+                        num_edges <= 0;
+                        edges_dropped <= 0;
+                        done <= 0;
+                        for (k=0; k<5; k=k+1) begin
+                            pipe_valid[k] <= 0;
+                        end
+                        for (k=0; k<K; k=k+1) begin
+                            list_valid[k] <= 0;
+                        end
+                    end
+                end
+
+
+                S_SCAN: begin
+                    // stage 1: read nodes:
+                    node_r_addr_a <= idx_i;
+                    node_r_addr_b <= idx_j;
+                    pipe_valid[0] <= issuing;
+                    pipe_j[0] <= idx_j;
+
+                    // shift pipeline:
+                    for (k=0; k<4; k=k+1) begin
+                        pipe_valid[k+1] <= pipe_valid[k];
+                        pipe_j[k+1] <= pipe_j[k];
+                    end
+
+
+                    // stage 2: compute deltas:
+                    if (pipe_valid[1]) begin
+                        dx <= $signed({1'b0, x_a}) - $signed({1'b0, x_b});
+                        dy <= $signed({1'b0, y_a}) - $signed({1'b0, y_b});
+                        dz <= $signed({1'b0, z_a}) - $signed({1'b0, z_b});
+                    end
+
+                    // stage 3: square:
+                    if (pipe_valid[2]) begin
+                        dx2 <= $unsigned($signed({{31{dx[COORD_WIDTH]}}, dx}) * $signed({{31{dx[COORD_WIDTH]}}, dx}));
+                        dy2 <= $unsigned($signed({{31{dy[COORD_WIDTH]}}, dy}) * $signed({{31{dy[COORD_WIDTH]}}, dy}));
+                        dz2 <= $unsigned($signed({{31{dz[COORD_WIDTH]}}, dz}) * $signed({{31{dz[COORD_WIDTH]}}, dz}));
+                    end
+
+                    // stage 4: sum squares:
+                    if (pipe_valid[3]) begin
+                        dist_sq <= dx2 + dy2 + dz2;
+                    end
+
+                    // stage 5: sorted insert, every entry from the new node's position on moves down one (and the
+                    // last falls off the end):
+                    if (pipe_valid[4] && pipe_j[4] != idx_i) begin
+                        for (k=K-1; k>0; k=k-1) begin
+                            if (insert_before[k-1]) begin
+                                list_dist[k] <= list_dist[k-1];
+                                list_idx[k] <= list_idx[k-1];
+                                list_valid[k] <= list_valid[k-1];
+                            end else if (insert_before[k]) begin
+                                list_dist[k] <= new_dist;
+                                list_idx[k] <= pipe_j[4];
+                                list_valid[k] <= 1;
+                            end
+                        end
+                        if (insert_before[0]) begin
+                            list_dist[0] <= new_dist;
+                            list_idx[0] <= pipe_j[4];
+                            list_valid[0] <= 1;
+                        end
+                    end
+
+                    // advance j, then flush the pipeline:
+                    if (issuing) begin
+                        if (last_j) begin
+                            issuing <= 0;
+                        end else begin
+                            idx_j <= idx_j + 1;
+                        end
+                    end else if (!pipe_valid[0] && !pipe_valid[1] && !pipe_valid[2] && !pipe_valid[3] && !pipe_valid[4]) begin
+                        state <= S_EMIT;
+                        emit_idx <= 0;
+                    end
+                end
+
+
+                S_EMIT: begin
+                    if (list_valid[emit_idx]) begin
+                        if (num_edges < MAX_EDGES) begin
+                            edge_we <= 1;
+                            edge_w_addr <= num_edges[EDGE_ADDR_BITS-1:0];
+                            edge_w_data <= {list_dist[emit_idx],
+                                            {(16-NODE_ADDR_BITS){1'b0}}, (idx_i < emit_j) ? idx_i : emit_j,
+                                            {(16-NODE_ADDR_BITS){1'b0}}, (idx_i < emit_j) ? emit_j : idx_i};
+                            num_edges <= num_edges + 1;
+                        end else begin
+                            $display("WARNING: Not all nearest neighbour edges were stored!");
+                            edges_dropped <= 1;
+                        end
+                    end
+
+                    if (emit_idx == K - 1) begin
+                        // next node, with an empty list:
+                        for (k=0; k<K; k=k+1) begin
+                            list_valid[k] <= 0;
+                        end
+                        if (idx_i >= num_nodes - 1) begin
+                            state <= S_DONE;
+                        end else begin
+                            idx_i <= idx_i + 1;
+                            idx_j <= 0;
+                            issuing <= 1;
+                            state <= S_SCAN;
+                        end
+                    end else begin
+                        emit_idx <= emit_idx + 1;
+                    end
+                end
+
+
+                S_DONE: begin
+                    done <= 1;
+                end
+            endcase
+        end
+    end
+
+endmodule
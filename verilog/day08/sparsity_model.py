@@ -0,0 +1,424 @@
+import argparse
+import csv
+import random
+import statistics
+import sys
+from multiprocessing import Pool
+
+import numpy as np
+
+# model of the histogram / threshold edge selection stage in `edge_generator` (day08_core.v)
+# used to estimate how much edge RAM is actually needed, and how often the sparsity heuristic
+# picks a set of edges that is not enough to solve the puzzle, without having to simulate the core.
+# with --knn, models `knn_edge_generator` (KNN_EDGES=1) instead, which keeps the K closest nodes to each node
+
+# constants mirroring the RTL (keep in sync with day08_core.v):
+BUCKET_BASE = 250000  # edge_generator.BUCKET_BASE
+NUM_BUCKETS = 16  # edge_generator.NUM_BUCKETS
+BUCKET_COUNTER_BITS = 20  # width of bucket_counts[k]
+MAX_EDGES = 16384  # day08_core.MAX_EDGES
+PART1_EDGES = 1000  # day08_core.PART1_EDGES
+KNN_K = 12  # day08_core.KNN_K
+EDGE_DIST_MAX = 0xFFFFFFFF  # an edge's distance is saturated to 32 bits
+COORD_MAX = 100000  # coordinate range used by gen_day08
+# edge_generator stops issuing pairs at its last pair, so the pair (N-2, N-1) never reaches the histogram or
+# edge RAM (in both S_HISTOGRAM and S_COLLECT):
+DROPS_LAST_PAIR = True
+
+THRESHOLDS = np.array([BUCKET_BASE << k for k in range(NUM_BUCKETS)], dtype=np.int64)
+
+CSV_FIELDS = [
+    "n",
+    "seed",
+    "bucket",
+    "threshold",
+    "kept_edges",
+    "headroom",
+    "truncated",
+    "mst_bottleneck",
+    "required_edges",
+    "required_max_edges",
+    "part1_ok",
+    "part2_ok",
+]
+
+KNN_CSV_FIELDS = [
+    "n",
+    "seed",
+    "k",
+    "written_edges",
+    "unique_edges",
+    "truncated",
+    "edge_ram_bits",
+    "mst_bottleneck",
+    "part1_ok",
+    "part2_ok",
+]
+
+
+def gen_points(n: int, seed: int, coord_max: int = COORD_MAX) -> np.ndarray:
+    # same RNG call sequence as gen_day08, so a seed here describes the same input file
+    rng = random.Random(seed)
+    coords = [rng.randint(0, coord_max) for _ in range(3 * n)]
+    return np.array(coords, dtype=np.int64).reshape(n, 3)
+
+
+def pairwise_dist_sq(points: np.ndarray) -> np.ndarray:
+    # dense N x N matrix of squared euclidean distances (no sqrt, same as hardware)
+    d = np.zeros((len(points), len(points)), dtype=np.int64)
+    for axis in range(3):
+        delta = points[:, axis, None] - points[None, :, axis]
+        d += delta * delta
+    return d
+
+
+def mst_bottleneck(dist_sq: np.ndarray) -> int:
+    # longest edge of the MST (dense Prim's, one vectorised row update per node)
+    # the edge set selected by the heuristic solves part 2 iff it contains every edge up to this weight
+    n = len(dist_sq)
+    if n < 2:
+        return 0
+    sentinel = np.iinfo(np.int64).max
+    in_tree = np.zeros(n, dtype=bool)
+    in_tree[0] = True
+    best = dist_sq[0].copy()
+    best[0] = sentinel
+    longest = 0
+    for _ in range(n - 1):
+        v = int(np.argmin(best))
+        longest = max(longest, int(best[v]))
+        in_tree[v] = True
+        np.minimum(best, dist_sq[v], out=best)
+        best[in_tree] = sentinel
+    return longest
+
+
+def select_bucket(counts: np.ndarray, max_edges: int = MAX_EDGES) -> int:
+    # S_THRESHOLD: scan down from the top bucket, take the first that fits in edge RAM (bucket 0 if none do)
+    wrapped = counts & ((1 << BUCKET_COUNTER_BITS) - 1)
+    for k in range(NUM_BUCKETS - 1, -1, -1):
+        if wrapped[k] < max_edges or k == 0:
+            return k
+    return 0
+
+
+def analyse_points(
+    points: np.ndarray, max_edges: int = MAX_EDGES, part1_edges: int = PART1_EDGES
+) -> dict:
+    """Models edge_generator + dsu for one set of points
+
+    Args:
+        points (np.ndarray): N x 3 array of coordinates.
+        max_edges (int, optional): Edge RAM capacity. Defaults to MAX_EDGES.
+        part1_edges (int, optional): Number of edges used for part 1. Defaults to PART1_EDGES.
+
+    Returns:
+        dict: one row of the campaign CSV (see CSV_FIELDS)
+    """
+    n = len(points)
+    dist_sq = pairwise_dist_sq(points)
+    # the pairs the RTL sees, (i, j) for i < j, without its dropped last pair:
+    seen_sq = dist_sq.copy()
+    dropped = DROPS_LAST_PAIR and n >= 2
+    if dropped:
+        seen_sq[n - 2, n - 1] = seen_sq[n - 1, n - 2] = np.iinfo(np.int64).max
+    iu, ju = np.triu_indices(n, k=1)
+    edges = dist_sq[iu, ju]
+    if dropped:
+        edges = edges[:-1]  # (N-2, N-1) is the last pair in (i, j) order
+
+    # S_HISTOGRAM:
+    counts = np.array([np.count_nonzero(edges < t) for t in THRESHOLDS], dtype=np.int64)
+
+    # S_THRESHOLD + S_COLLECT:
+    bucket = select_bucket(counts, max_edges)
+    threshold = int(THRESHOLDS[bucket])
+    below = int(counts[bucket])
+    kept = min(below, max_edges)
+    # only possible when bucket 0 is forced: edges are then dropped in (i,j) order, not by distance
+    truncated = below > max_edges
+
+    # correctness: kept edges are every edge the RTL sees below the threshold, so the DSU sees a prefix of the
+    # sorted edges without the dropped pair. part 2 is only right if that graph's MST has the same longest edge,
+    # and part 1 if the dropped pair isn't one of the part 1 edges (counted as a failure even if it would have
+    # joined two nodes already in the same circuit)
+    bottleneck = mst_bottleneck(dist_sq)
+    seen_bottleneck = mst_bottleneck(seen_sq) if dropped else bottleneck
+    part1_needs_dropped = (
+        dropped
+        and part1_edges > 0
+        and np.count_nonzero(edges < dist_sq[n - 2, n - 1]) < part1_edges
+    )
+    part1_ok = (not truncated) and kept >= part1_edges and not part1_needs_dropped
+    part2_ok = (
+        (not truncated)
+        and seen_bottleneck < threshold
+        and seen_bottleneck == bottleneck
+    )
+
+    # smallest edge RAM that would have worked for this input:
+    #   required_edges: ideal selection (every edge up to the MST bottleneck, and the part 1 edges)
+    #   required_max_edges: what MAX_EDGES needs to be given the power of 2 bucket boundaries
+    required_edges = max(int(np.count_nonzero(edges <= bottleneck)), part1_edges)
+    valid_buckets = (THRESHOLDS > bottleneck) & (counts >= part1_edges)
+    if valid_buckets.any():
+        required_max_edges = int(counts[np.argmax(valid_buckets)]) + 1
+    else:
+        # no bucket is large enough, BUCKET_BASE needs to change:
+        required_max_edges = -1
+
+    return {
+        "n": n,
+        "bucket": bucket,
+        "threshold": threshold,
+        "kept_edges": kept,
+        "headroom": max_edges - kept,
+        "truncated": int(truncated),
+        "mst_bottleneck": bottleneck,
+        "required_edges": required_edges,
+        "required_max_edges": required_max_edges,
+        "part1_ok": int(part1_ok),
+        "part2_ok": int(part2_ok),
+    }
+
+
+def edge_keys(dist_sq: np.ndarray, u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    # edges as the 64-bit words written to edge RAM: {distance (saturated), u, v}, sorted in the same order
+    d = np.minimum(dist_sq, EDGE_DIST_MAX).astype(np.uint64)
+    return (
+        (d << np.uint64(32))
+        | (u.astype(np.uint64) << np.uint64(16))
+        | v.astype(np.uint64)
+    )
+
+
+def knn_edges(dist_sq: np.ndarray, k: int = KNN_K) -> np.ndarray:
+    """Reference of the edges knn_edge_generator writes to edge RAM, with the repeats removed
+
+    Args:
+        dist_sq (np.ndarray): N x N matrix of squared distances (see pairwise_dist_sq).
+        k (int, optional): Closest nodes kept per node. Defaults to KNN_K.
+
+    Returns:
+        np.ndarray: sorted edge words (see edge_keys), in the order the dsu uses them
+    """
+    n = len(dist_sq)
+    k = min(k, n - 1)
+    if k <= 0:
+        return np.zeros(0, dtype=np.uint64)
+    # each node's list is ordered by (saturated distance, index), which is unique per node:
+    order = np.minimum(dist_sq, EDGE_DIST_MAX) * n + np.arange(n)[None, :]
+    np.fill_diagonal(order, np.iinfo(np.int64).max)
+    nearest = np.argpartition(order, k - 1, axis=1)[:, :k]
+    i = np.repeat(np.arange(n), k)
+    j = nearest.ravel()
+    return np.unique(edge_keys(dist_sq[i, j], np.minimum(i, j), np.maximum(i, j)))
+
+
+def kruskal_answers(
+    points: np.ndarray, edges: np.ndarray, part1_edges: int = PART1_EDGES
+) -> tuple[int, int]:
+    # the dsu's answers from the sorted edge words: part 1 from the first part1_edges edges (or all of
+    # them, if there are fewer), part 2 from the edge that joins the last two components (0 if none does)
+    n = len(points)
+    parent = list(range(n))
+    size = [1] * n
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            x = parent[x]
+        return x
+
+    def top3_product() -> int:
+        top = sorted((size[r] for r in range(n) if parent[r] == r), reverse=True)
+        return int(np.prod(top[:3]))
+
+    part1 = None
+    last = None
+    components = n
+    for count, word in enumerate(edges.tolist(), start=1):
+        u, v = (word >> 16) & 0xFFFF, word & 0xFFFF
+        ru, rv = find(u), find(v)
+        if ru != rv:
+            if size[ru] < size[rv]:
+                ru, rv = rv, ru
+            parent[rv] = ru
+            size[ru] += size[rv]
+            components -= 1
+            last = (u, v)
+        if count == part1_edges:
+            part1 = top3_product()
+        if part1 is not None and components == 1:
+            break
+    if part1 is None:
+        part1 = top3_product()
+    part2 = int(points[last[0], 0] * points[last[1], 0]) if components == 1 else 0
+    return part1, part2
+
+
+def analyse_points_knn(
+    points: np.ndarray,
+    k: int = KNN_K,
+    max_edges: int = MAX_EDGES,
+    part1_edges: int = PART1_EDGES,
+) -> dict:
+    """Models knn_edge_generator + dsu for one set of points
+
+    Args:
+        points (np.ndarray): N x 3 array of coordinates.
+        k (int, optional): Closest nodes kept per node. Defaults to KNN_K.
+        max_edges (int, optional): Edge RAM capacity. Defaults to MAX_EDGES.
+        part1_edges (int, optional): Number of edges used for part 1. Defaults to PART1_EDGES.
+
+    Returns:
+        dict: one row of the --knn campaign CSV (see KNN_CSV_FIELDS)
+    """
+    n = len(points)
+    dist_sq = pairwise_dist_sq(points)
+    kept = knn_edges(dist_sq, k)
+    # every node writes its whole list, so an edge in both nodes' lists is written twice:
+    written = n * min(k, n - 1)
+    truncated = written > max_edges
+
+    # correctness: the answers from the kept edges against the answers from every edge
+    iu, ju = np.triu_indices(n, k=1)
+    every_edge = np.sort(edge_keys(dist_sq[iu, ju], iu, ju))
+    expected = kruskal_answers(points, every_edge, part1_edges)
+    found = kruskal_answers(points, kept, part1_edges)
+
+    return {
+        "n": n,
+        "k": k,
+        "written_edges": written,
+        "unique_edges": len(kept),
+        "truncated": int(truncated),
+        "edge_ram_bits": written * 64,
+        "mst_bottleneck": mst_bottleneck(dist_sq),
+        "part1_ok": int(not truncated and found[0] == expected[0]),
+        "part2_ok": int(not truncated and found[1] == expected[1]),
+    }
+
+
+def _run_trial(args: tuple[int, int, int, int, int]) -> dict:
+    n, seed, max_edges, coord_max, knn = args
+    points = gen_points(n, seed, coord_max)
+    if knn:
+        row = analyse_points_knn(points, knn, max_edges)
+    else:
+        row = analyse_points(points, max_edges)
+    row["seed"] = seed
+    return row
+
+
+def run_campaign(
+    sizes: list[int],
+    seeds: range,
+    max_edges: int = MAX_EDGES,
+    coord_max: int = COORD_MAX,
+    jobs: int = 1,
+    knn: int = 0,
+) -> list[dict]:
+    """Runs the model over every (size, seed) pair
+
+    Args:
+        sizes (list[int]): Numbers of points to test.
+        seeds (range): Seeds to test for each size (same seeds as gen_day08).
+        max_edges (int, optional): Edge RAM capacity. Defaults to MAX_EDGES.
+        coord_max (int, optional): Largest coordinate value. Defaults to COORD_MAX.
+        jobs (int, optional): Number of worker processes. Defaults to 1.
+        knn (int, optional): If non-zero, model knn_edge_generator keeping this many closest nodes per node,
+            instead of the sparsity heuristic. Defaults to 0.
+
+    Returns:
+        list[dict]: one row per trial
+    """
+    trials = [(n, seed, max_edges, coord_max, knn) for n in sizes for seed in seeds]
+    if jobs > 1:
+        with Pool(jobs) as pool:
+            return pool.map(_run_trial, trials, chunksize=16)
+    return [_run_trial(t) for t in trials]
+
+
+def summarise(rows: list[dict], max_edges: int = MAX_EDGES) -> None:
+    print(
+        "| N | Trials | Kept edges (min / mean / max) | Min headroom | P1 fail | P2 fail | Required MAX_EDGES (p99 / max) |"
+    )
+    print("| --- | --- | --- | --- | --- | --- | --- |")
+    for n in sorted(set(r["n"] for r in rows)):
+        subset = [r for r in rows if r["n"] == n]
+        kept = [r["kept_edges"] for r in subset]
+        required = sorted(r["required_max_edges"] for r in subset)
+        p99 = required[min(len(required) - 1, int(0.99 * len(required)))]
+        p1_fail = sum(1 - r["part1_ok"] for r in subset)
+        p2_fail = sum(1 - r["part2_ok"] for r in subset)
+        print(
+            f"| {n} | {len(subset)} | {min(kept)} / {statistics.mean(kept):.0f} / {max(kept)} "
+            f"| {max_edges - max(kept)} | {p1_fail} | {p2_fail} | {p99} / {required[-1]} |"
+        )
+
+
+def summarise_knn(rows: list[dict]) -> None:
+    print(
+        "| N | Trials | K | Edges written | Unique edges (mean) | P1 fail | P2 fail |"
+    )
+    print("| --- | --- | --- | --- | --- | --- | --- |")
+    for n in sorted(set(r["n"] for r in rows)):
+        subset = [r for r in rows if r["n"] == n]
+        unique = statistics.mean(r["unique_edges"] for r in subset)
+        p1_fail = sum(1 - r["part1_ok"] for r in subset)
+        p2_fail = sum(1 - r["part2_ok"] for r in subset)
+        print(
+            f"| {n} | {len(subset)} | {subset[0]['k']} | {subset[0]['written_edges']} | {unique:.0f} "
+            f"| {p1_fail} | {p2_fail} |"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Model of the day 8 histogram/threshold edge selection heuristic"
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[700, 800, 900, 1000])
+    parser.add_argument(
+        "--seeds", type=int, default=1000, help="number of seeds per size"
+    )
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--max-edges", type=int, default=MAX_EDGES)
+    parser.add_argument("--coord-max", type=int, default=COORD_MAX)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument(
+        "--knn",
+        type=int,
+        default=0,
+        help="model knn_edge_generator with this many closest nodes per node (e.g. 12)",
+    )
+    parser.add_argument(
+        "--csv", type=str, default=None, help="file to write per-trial rows to"
+    )
+    args = parser.parse_args()
+
+    rows = run_campaign(
+        args.sizes,
+        range(args.first_seed, args.first_seed + args.seeds),
+        args.max_edges,
+        args.coord_max,
+        args.jobs,
+        args.knn,
+    )
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(
+                f, fieldnames=KNN_CSV_FIELDS if args.knn else CSV_FIELDS
+            )
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Saved results to {args.csv}", file=sys.stderr)
+
+    if args.knn:
+        summarise_knn(rows)
+    else:
+        summarise(rows, args.max_edges)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,10 +3,18 @@ module day09_core #(
     parameter LOG_MAX_POINTS = 9,
     parameter LOG_MAX_POINT_VAL = 17,
     parameter SEGS_PER_STAGE = 32,
-    parameter LOG_SEGS = 5
+    parameter LOG_SEGS = 5,
+    // part 2 candidate order: 0 sends every pair of points (in index order) that beats the best valid rectangle
+    // so far. 1 first counts the pairs in each area bucket (while finding part 1), then makes passes that each send
+    // the pairs in the next largest buckets, stopping after the first pass that finds a valid rectangle, as every
+    // pair left is smaller. the first pass sends at least 1 / 2^PASS_SHIFT of the pairs, and each later one twice
+    // as many as the last
+    parameter AREA_ORDER = 1,
+    parameter PASS_SHIFT = 4
 ) (
     // Synchronous inputs:
     input wire clk,
+    input wire ce, // clock enable: all state holds while low (e.g. waiting for streamed input)
     input wire rst,
 
     // IO to interface with ROM:
@@ -37,7 +45,13 @@ module day09_core #(
     localparam S_PART1_COMPUTE = 9;
     localparam S_PART2_WAIT = 10;
     localparam S_DONE = 11;
-    reg [3:0] state;
+    // AREA_ORDER = 1:
+    localparam S_SCAN = 12; // a pass over every pair of points, one per clock cycle
+    localparam S_SEND_READ = 13;
+    localparam S_SEND = 14; // send the pair to the pipeline, then carry on with the pass
+    localparam S_PASS_END = 15;
+    localparam S_NEXT_WINDOW = 16; // pick the area buckets of the next pass
+    reg [4:0] state;
 
     // point storage:
     reg [LOG_MAX_POINTS:0] point_count;
@@ -57,6 +71,7 @@ module day09_core #(
         .ADDR_BITS(LOG_MAX_POINTS+1)
     ) point_x_ram (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .we_a(ram_we_a), 
         .addr_a(ram_addr_a), 
@@ -74,6 +89,7 @@ module day09_core #(
         .ADDR_BITS(LOG_MAX_POINTS+1)
     ) point_y_ram (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .we_a(ram_we_a), 
         .addr_a(ram_addr_a), 
@@ -100,6 +116,33 @@ module day09_core #(
     reg [LOG_MAX_POINT_VAL:0] p1_dy;
     reg [63:0] p1_area;
 
+    // area buckets (AREA_ORDER = 1): 4 per power of 2, from the top 3 bits of the area
+    localparam AREA_BITS = 2 * (LOG_MAX_POINT_VAL + 1);
+    localparam NUM_BUCKETS = 4 * AREA_BITS;
+    localparam BUCKET_BITS = 8; // enough for LOG_MAX_POINT_VAL up to 31
+    reg [2*LOG_MAX_POINTS:0] bucket_count [0:NUM_BUCKETS-1];
+    reg [BUCKET_BITS-1:0] window_hi;
+    reg [BUCKET_BITS-1:0] window_lo;
+    reg [2*LOG_MAX_POINTS+1:0] window_count;
+    reg [2*LOG_MAX_POINTS+1:0] window_target; // the least pairs in the window
+    reg scan_sending; // 0 = the counting pass, 1 = a pass sending the pairs in the window to the pipeline
+    reg scan_valid; // the point rams hold the pair (scan_i, scan_j)
+    reg [LOG_MAX_POINTS:0] scan_i;
+    reg [LOG_MAX_POINTS:0] scan_j;
+
+    function [BUCKET_BITS-1:0] area_bucket;
+        input [63:0] area;
+        integer b;
+        begin
+            area_bucket = area[1:0]; // areas below 4 have a bucket each
+            for (b = 2; b < AREA_BITS; b = b + 1) begin
+                if (area[b]) begin
+                    area_bucket = b * 4 + area[b-1 -: 2];
+                end
+            end
+        end
+    endfunction
+
     // loop counters
     reg [LOG_MAX_POINTS:0] pipe_i;
     reg [LOG_MAX_POINTS:0] pipe_j;
@@ -140,6 +183,8 @@ module day09_core #(
     wire [LOG_MAX_POINT_VAL:0] feed_w = feed_maxX - feed_minX + 1;
     wire [LOG_MAX_POINT_VAL:0] feed_h = feed_maxY - feed_minY + 1;
     wire [63:0] feed_area = feed_w * feed_h;
+    wire [BUCKET_BITS-1:0] feed_bucket = area_bucket(feed_area);
+    wire feed_in_window = (feed_bucket >= window_lo) && (feed_bucket <= window_hi);
 
     // first stage input:
     reg pipe_in_valid;
@@ -150,7 +195,7 @@ module day09_core #(
     assign stage_area[0] = feed_area;
     assign stage_cut[0] = 0;
     assign stage_hits[0] = 0;
-    assign stage_data_valid[0] = (state == S_PART1_COMPUTE && pipe_i < point_count);
+    assign stage_data_valid[0] = (state == S_PART1_COMPUTE && pipe_i < point_count) || state == S_SEND;
 
     // tracking number of rectangles sent
     reg [31:0] rectangles_sent;
@@ -181,6 +226,7 @@ module day09_core #(
                 .LOG_SEGS(LOG_SEGS)
             ) stage_inst (
                 .clk(clk),
+                .ce(ce),
                 .rst(rst),
                 
                 // Segment loading
@@ -220,7 +266,7 @@ module day09_core #(
     endgenerate
 
     integer k;
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         // defaults:
         ram_we_a <= 0;
         ram_w_data_x <= 0;
@@ -251,6 +297,11 @@ module day09_core #(
             for (k=0; k<NUM_STAGES; k=k+1) begin
                 stage_load_en[k] <= 0;
             end
+            for (k=0; k<NUM_BUCKETS; k=k+1) begin
+                bucket_count[k] <= 0;
+            end
+            scan_sending <= 0;
+            scan_valid <= 0;
             first_in_valid <= 0;
             ram_addr_a <= 0;
             ram_addr_b <= 0;
@@ -335,7 +386,15 @@ module day09_core #(
                         state <= S_LOAD_WAIT;
                     end else begin
                         // finished loading pipeline, begin iterating over rectangles
-                        state <= S_PART1;
+                        if (AREA_ORDER) begin
+                            // (starting with the counting pass)
+                            ram_addr_a <= 1;
+                            ram_addr_b <= 0;
+                            scan_valid <= 0;
+                            state <= S_SCAN;
+                        end else begin
+                            state <= S_PART1;
+                        end
                         pipe_i <= 1;
                         pipe_j <= 0;
                         rectangles_sent <= 0;
@@ -444,6 +503,110 @@ module day09_core #(
                 end
 
 
+                //! --------------------------------------------
+                //! Area-ordered candidates (AREA_ORDER = 1):
+                //! --------------------------------------------
+                S_SCAN: begin
+                    // the point rams are read for a new pair every clock cycle (ram_addr_a/b), and hold the
+                    // previous pair (scan_i, scan_j):
+                    if (scan_valid && scan_sending && feed_in_window && feed_area > part2_result) begin
+                        // read the pair again (the rams have moved on) and send it to the pipeline:
+                        ram_addr_a <= scan_i;
+                        ram_addr_b <= scan_j;
+                        scan_valid <= 0;
+                        state <= S_SEND_READ;
+                    end else begin
+                        if (scan_valid && !scan_sending) begin
+                            // counting pass: part 1, and the number of pairs in each area bucket
+                            if (feed_area > part1_result) begin
+                                part1_result <= feed_area;
+                            end
+                            bucket_count[feed_bucket] <= bucket_count[feed_bucket] + 1;
+                        end
+
+                        if (ram_addr_a < point_count) begin
+                            scan_i <= ram_addr_a;
+                            scan_j <= ram_addr_b;
+                            scan_valid <= 1;
+                            if (ram_addr_b + 1 < ram_addr_a) begin
+                                ram_addr_b <= ram_addr_b + 1;
+                            end else begin
+                                ram_addr_a <= ram_addr_a + 1;
+                                ram_addr_b <= 0;
+                            end
+                        end else begin
+                            scan_valid <= 0;
+                            if (!scan_valid) begin
+                                state <= S_PASS_END;
+                            end
+                        end
+                    end
+                end
+
+
+                S_SEND_READ: begin
+                    state <= S_SEND;
+                end
+
+
+                S_SEND: begin
+                    if (first_in_valid) begin
+                        if (stage_in_ready[0]) begin
+                            rectangles_sent <= rectangles_sent + 1;
+                            // carry on with the pass from the next pair:
+                            if (ram_addr_b + 1 < ram_addr_a) begin
+                                ram_addr_b <= ram_addr_b + 1;
+                            end else begin
+                                ram_addr_a <= ram_addr_a + 1;
+                                ram_addr_b <= 0;
+                            end
+                            state <= S_SCAN;
+                        end
+                    end else begin
+                        first_in_valid <= 1;
+                    end
+                end
+
+
+                S_PASS_END: begin
+                    // wait for the pass's rectangles to leave the pipeline:
+                    if (rectangles_received >= rectangles_sent) begin
+                        if (!scan_sending) begin
+                            scan_sending <= 1;
+                            window_hi <= NUM_BUCKETS - 1;
+                            window_lo <= NUM_BUCKETS - 1;
+                            window_count <= 0;
+                            window_target <= ((point_count * (point_count - 1)) >> 1) >> PASS_SHIFT;
+                            state <= S_NEXT_WINDOW;
+                        end else if (part2_result != 0 || window_lo == 0) begin
+                            // every pair left is smaller than the rectangle found
+                            state <= S_DONE;
+                            done <= 1;
+                        end else begin
+                            window_hi <= window_lo - 1;
+                            window_lo <= window_lo - 1;
+                            window_count <= 0;
+                            window_target <= window_target << 1;
+                            state <= S_NEXT_WINDOW;
+                        end
+                    end
+                end
+
+
+                S_NEXT_WINDOW: begin
+                    // widen the window one bucket at a time, until it holds window_target pairs:
+                    if (window_count + bucket_count[window_lo] >= window_target || window_lo == 0) begin
+                        ram_addr_a <= 1;
+                        ram_addr_b <= 0;
+                        scan_valid <= 0;
+                        state <= S_SCAN;
+                    end else begin
+                        window_count <= window_count + bucket_count[window_lo];
+                        window_lo <= window_lo - 1;
+                    end
+                end
+
+
                 S_DONE: begin
                     done <= 1;
                 end
@@ -3,10 +3,13 @@ module day09_core #(
     parameter LOG_MAX_POINTS = 9, // my puzzle input had 496 lines(points), adjust ass necessary
     // NOTE: if using small inputs - PLEASE LOWER THIS NUMBER, the iverilog simulator does not 
     // optimise it and simulating a pipeline of 512 units will take a while
-    parameter LOG_MAX_POINT_VAL = 17 // all my points are under 100k < 2^17
+    parameter LOG_MAX_POINT_VAL = 17, // all my points are under 100k < 2^17
+    parameter AREA_ORDER = 0, // (unused, this core checks every pair in index order)
+    parameter PASS_SHIFT = 0 // (unused)
 ) (
     // Synchronous inputs:
     input wire clk,
+    input wire ce, // clock enable: all state holds while low (e.g. waiting for streamed input)
     input wire rst,
 
     // IO to interface with ROM:
@@ -149,7 +152,7 @@ module day09_core #(
     endgenerate
 
     // FSM:
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             rom_addr <= 0;
@@ -5,6 +5,7 @@ module pipeline_stage #(
     parameter LOG_SEGS = 5
 ) (
     input clk,
+    input ce, // clock enable
     input rst,
 
     // segment loading:
@@ -55,6 +56,7 @@ module pipeline_stage #(
         .ADDR_BITS(LOG_SEGS)
     ) u_seg_ram (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .we(seg_we),
         .w_addr(seg_w_addr),
@@ -105,7 +107,7 @@ module pipeline_stage #(
     wire [LOG_MAX_POINT_VAL+1:0] cy2 = lat_minY + lat_maxY;
     wire local_hit = seg_active && seg_is_vertical && ((seg_x1*2) > cx2) && (cy2 > (seg_minY*2)) && (cy2 < (seg_maxY * 2));
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             seg_count <= 0;
@@ -5,6 +5,7 @@ module day10_core #(
 ) (
     // Synchronous inputs:
     input wire clk,
+    input wire ce, // clock enable: all state holds while low (e.g. waiting for streamed input)
     input wire rst,
 
     // IO to interface with ROM:
@@ -49,6 +50,7 @@ module day10_core #(
         .N_ADDR_BITS(N_ADDR_BITS)
     ) u_parser_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .start(parser_start),
         .done_line(parser_done_line),
@@ -73,6 +75,7 @@ module day10_core #(
         .MAX_BUTTONS(MAX_BUTTONS)
     ) u_gf2_solver_0 (
         .clk(clk),
+        .ce(ce),
         .rst(gf2_rst),
         .start(gf2_start),
         .A(button_matrix),
@@ -96,6 +99,7 @@ module day10_core #(
         .MAX_PRESS_BITS(8)
     ) u_ilp_solver_0 (
         .clk(clk),
+        .ce(ce),
         .rst(ilp_rst),
         .start(ilp_start),
         .A(button_matrix),
@@ -106,7 +110,7 @@ module day10_core #(
         .done(ilp_done)
     );
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             parser_start <= 0;
@@ -214,6 +218,7 @@ module parser #(
     parameter N_ADDR_BITS = 16
 )  (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
     
     // control:
@@ -257,7 +262,7 @@ module parser #(
     integer i;
     reg waited;
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             done_line <= 0;
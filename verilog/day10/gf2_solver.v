@@ -5,6 +5,7 @@ module gf2_solver #(
     parameter MAX_BUTTONS = 13
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
 
     // input: coefficient matrix (A) and target bit vector (b)
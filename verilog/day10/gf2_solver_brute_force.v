@@ -3,6 +3,7 @@ module gf2_solver #(
     parameter MAX_BUTTONS = 13
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
 
     // input: coefficient matrix (A) and target bit vector (b)
@@ -42,7 +43,7 @@ module gf2_solver #(
     reg [MAX_LIGHTS-1:0] result_masked;
     reg [MAX_LIGHTS-1:0] b_masked;
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             done <= 0;
@@ -22,6 +22,7 @@ module gf_solver_tb;
         .MAX_LIGHTS(10)
     ) u_gf2_solver (
         .clk(clk),
+        .ce(1'b1),
         .rst(rst),
         .start(start),
         .A(A),
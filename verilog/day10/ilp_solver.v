@@ -6,6 +6,7 @@ module ilp_solver #(
     parameter MAX_PRESS_BITS = 8
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
     
     // inputs:
@@ -79,7 +80,7 @@ module ilp_solver #(
     integer i;
     integer j;
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             done <= 0;
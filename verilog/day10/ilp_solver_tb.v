@@ -23,6 +23,7 @@ module tb_ilp_solver;
         .MAX_PRESS_BITS(8)
     ) u_ilp_solver_0 (
         .clk(clk),
+        .ce(1'b1),
         .rst(rst),
         .start(start),
         .A(A),
@@ -3,6 +3,7 @@ module day11_core #(
 ) (
     // Synchronous inputs:
     input wire clk,
+    input wire ce, // clock enable: all state holds while low (e.g. waiting for streamed input)
     input wire rst,
 
     // IO to interface with ROM:
@@ -43,8 +44,8 @@ module day11_core #(
     wire [EDGE_BITS-1:0] pc_addr_edge;
     reg pc_start;
     reg [NODE_BITS-1:0] pc_s; // start node ID
-    reg [NODE_BITS-1:0] pc_t; // end node ID
-    wire [63:0] pc_result;
+    wire [3*NODE_BITS-1:0] pc_t; // end node IDs: "out", "dac", "fft" (from the low bits)
+    wire [3*64-1:0] pc_result; // number of paths from pc_s to each end node
     wire pc_done;
 
 
@@ -65,37 +66,25 @@ module day11_core #(
     localparam P_DONE = 4;
 
     // FSM:
+    // the path counter counts the paths to "out", "dac" and "fft" at the same time, and remembers the counts of
+    // every node it has visited, so the counts from each start node only need to search the part of the graph
+    // the previous start nodes didn't reach
     localparam S_PARSE = 0;
-    localparam S_P1_SETUP = 1;
-    localparam S_P1_START = 2;
-    localparam S_P1_WAIT = 3;
+    localparam S_COUNT_SETUP = 1;
+    localparam S_COUNT_START = 2;
+    localparam S_COUNT_WAIT = 3;
+    localparam S_P2_MUL = 4; // svr -> dac -> fft and svr -> fft -> dac
+    localparam S_P2_SUM = 5; // ... -> out
 
-    localparam S_P2A_1_SETUP = 4;
-    localparam S_P2A_1_START = 5;
-    localparam S_P2A_1_WAIT = 6;
-
-    localparam S_P2A_2_SETUP = 7;
-    localparam S_P2A_2_START = 8;
-    localparam S_P2A_2_WAIT = 9;
-
-    localparam S_P2A_3_SETUP = 10;
-    localparam S_P2A_3_START = 11;
-    localparam S_P2A_3_WAIT = 12;
-
-    localparam S_P2B_1_SETUP = 13;
-    localparam S_P2B_1_START = 14;
-    localparam S_P2B_1_WAIT = 15;
-
-    localparam S_P2B_2_SETUP = 16;
-    localparam S_P2B_2_START = 17;
-    localparam S_P2B_2_WAIT = 18;
-
-    localparam S_P2B_3_SETUP = 19;
-    localparam S_P2B_3_START = 20;
-    localparam S_P2B_3_WAIT = 21;
+    localparam S_DONE = 6;
+    reg [2:0] state;
 
-    localparam S_DONE = 22;
-    reg [4:0] state;
+    // lanes of the path counts (the order of pc_t):
+    localparam T_OUT = 0;
+    localparam T_DAC = 1;
+    localparam T_FFT = 2;
+    reg [1:0] count_idx; // start node being counted from, in order: "you", "svr", "dac", "fft"
+    reg [3*64-1:0] counts [0:3]; // the path counts from each start node (to "out", "dac", "fft")
 
     reg [63:0] p2_acc [0:1]; // path 1 (svr -> dac -> fft -> out) and path 2 (svr -> fft -> dac -> out)
     integer i;
@@ -104,6 +93,7 @@ module day11_core #(
     wire gm_ready;
     name_resolver nr_u0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
 
         .name_in(nr_query),
@@ -115,6 +105,7 @@ module day11_core #(
     );
     graph_manager gm_u0(
         .clk(clk),
+        .ce(ce),
         .rst(rst),
 
         .add_edge_en(gm_we),
@@ -130,13 +121,18 @@ module day11_core #(
         .init_done(gm_ready)
     );
 
-    path_counter pc_u0 (
+    assign pc_t = {ids[4], ids[3], ids[1]};
+
+    path_counter #(
+        .NUM_TARGETS(3)
+    ) pc_u0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .start(pc_start),
 
         .src_node(pc_s),
-        .dst_node(pc_t),
+        .dst_nodes(pc_t),
         .count_out(pc_result),
         .done(pc_done),
 
@@ -147,13 +143,14 @@ module day11_core #(
         .gm_edge_to(gm_to)
     );
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             rom_addr <= 0;
             parser_state <= P_INIT;
             state <= S_PARSE;
             buf_count <= 0;
             has_src <= 0;
+            count_idx <= 0;
             gm_we <= 0;
             nr_valid <= 0;
             done <= 0;
@@ -182,7 +179,7 @@ module day11_core #(
                             if (rom_valid) begin
                                 if (rom_data == 0) begin
                                     // $display("reached eof at %d", rom_addr);
-                                    state <= S_P1_SETUP; // begin solving
+                                    state <= S_COUNT_SETUP; // begin solving
                                     parser_state <= P_DONE;
                                 end else if (rom_data >= "a" && rom_data <= "z") begin // assume ALWAYS lowercase alpha chars in node names
                                     name_buf[buf_count] <= rom_data;
@@ -200,7 +197,7 @@ module day11_core #(
                             end else begin
                                 if (rom_addr > 0 && !rom_valid) begin
                                     // $display("finished parsing input file at: %d", rom_addr);
-                                    state <= S_P1_SETUP;
+                                    state <= S_COUNT_SETUP;
                                 end
                             end
                         end
@@ -254,166 +251,53 @@ module day11_core #(
                         P_DONE: begin
                             // do nothing
                             // should neverhappen, but just go to next state as safety:
-                            state <= S_P1_SETUP;
+                            state <= S_COUNT_SETUP;
                         end
                     endcase
                 end
 
-                // PART 1 SOLVER: path_count("you", "out")
-                S_P1_SETUP: begin
-                    pc_s <= ids[0]; // you
-                    pc_t <= ids[1]; // out
-                    state <= S_P1_START;
-                end
-
-                S_P1_START: begin
-                    pc_start <= 1;
-                    state <= S_P1_WAIT;
-                end
-
-
-                S_P1_WAIT: begin
-                    // wait until path counter finished dfs'ing:
-                    if (pc_done) begin
-                        part1_result <= pc_result;
-                        state <= S_P2A_1_SETUP;
-                    end
-                end
-
-                // SOLVING PART 2:
-                // P2A: solve paths from dac -> fft
-                S_P2A_1_SETUP: begin
-                    pc_s <= ids[3]; // dac
-                    pc_t <= ids[4]; // fft
-                    state <= S_P2A_1_START;
+                // count the paths from each start node:
+                S_COUNT_SETUP: begin
+                    case (count_idx)
+                        0: pc_s <= ids[0]; // you
+                        1: pc_s <= ids[2]; // svr
+                        2: pc_s <= ids[3]; // dac
+                        3: pc_s <= ids[4]; // fft
+                    endcase
+                    state <= S_COUNT_START;
                 end
 
-
-                S_P2A_1_START: begin
+                S_COUNT_START: begin
                     pc_start <= 1;
-                    state <= S_P2A_1_WAIT;
+                    state <= S_COUNT_WAIT;
                 end
 
-
-                S_P2A_1_WAIT: begin
+                S_COUNT_WAIT: begin
                     // wait until path counter finished dfs'ing:
                     if (pc_done) begin
-                        // if no paths from dac -> fft, then there does not exist a path svr -> dac -> fft -> out, so skip rest of this subsequence
-                        if (pc_result == 0) begin
-                            p2_acc[0] <= 0;
-                            state <= S_P2B_1_SETUP;
+                        counts[count_idx] <= pc_result;
+                        count_idx <= count_idx + 1;
+                        if (count_idx == 3) begin
+                            state <= S_P2_MUL;
                         end else begin
-                            p2_acc[0] <= pc_result;
-                            state <= S_P2A_2_SETUP;
+                            state <= S_COUNT_SETUP;
                         end
                     end
                 end
 
-                // P2A: solve paths from svr -> dac (only if there exists a path dac -> fft)
-                S_P2A_2_SETUP: begin
-                    pc_s <= ids[2]; // svr
-                    pc_t <= ids[3]; // dac
-                    state <= S_P2A_2_START;
-                end
-
-
-                S_P2A_2_START: begin
-                    pc_start <= 1;
-                    state <= S_P2A_2_WAIT;
-                end
-
-
-                S_P2A_2_WAIT: begin
-                    if (pc_done) begin
-                        p2_acc[0] <= p2_acc[0] * pc_result;
-                        state <= S_P2A_3_SETUP;
-                    end
-                end
-
-                // P2A: solve paths from fft -> out
-                S_P2A_3_SETUP: begin
-                    pc_s <= ids[4]; // fft
-                    pc_t <= ids[1]; // out
-                    state <= S_P2A_3_START;
-                end
-
-
-                S_P2A_3_START: begin
-                    pc_start <= 1;
-                    state <= S_P2A_3_WAIT;
-                end
-
-
-                S_P2A_3_WAIT: begin
-                    if (pc_done) begin
-                        p2_acc[0] <= p2_acc[0] * pc_result;
-                        part2_result <= p2_acc[0] * pc_result;; // no paths exist svr -> fft -> dac -> out, just output this number
-                        state <= S_DONE;
-                    end
-                end
-
-                // P2B: solve paths from svr -> fft
-                S_P2B_1_SETUP: begin
-                    pc_s <= ids[2];
-                    pc_t <= ids[4];
-                    state <= S_P2B_1_START;
-                end
-
-
-                S_P2B_1_START: begin
-                    pc_start <= 1;
-                    state <= S_P2B_1_WAIT;
-                end
-
-
-                S_P2B_1_WAIT: begin
-                    if (pc_done) begin
-                        p2_acc[1] <= pc_result;
-                        state <= S_P2B_2_SETUP;
-                    end
-                end
-
-                // P2B: solve paths from fft -> dac
-                S_P2B_2_SETUP: begin
-                    pc_s <= ids[4];
-                    pc_t <= ids[3];
-                    state <= S_P2B_2_START;
+                // PART 1: paths you -> out
+                // PART 2: (svr -> dac) * (dac -> fft) * (fft -> out) + (svr -> fft) * (fft -> dac) * (dac -> out)
+                // (one of the two is always 0, as the graph has no cycles)
+                S_P2_MUL: begin
+                    part1_result <= counts[0][T_OUT*64 +: 64];
+                    p2_acc[0] <= counts[1][T_DAC*64 +: 64] * counts[2][T_FFT*64 +: 64];
+                    p2_acc[1] <= counts[1][T_FFT*64 +: 64] * counts[3][T_DAC*64 +: 64];
+                    state <= S_P2_SUM;
                 end
 
-
-                S_P2B_2_START: begin
-                    pc_start <= 1;
-                    state <= S_P2B_2_WAIT;
-                end
-
-
-                S_P2B_2_WAIT: begin
-                    if (pc_done) begin
-                        p2_acc[1] <= p2_acc[1] * pc_result;
-                        state <= S_P2B_3_SETUP;
-                    end
-                end
-
-                // P2B: solve paths from dac -> out
-                S_P2B_3_SETUP: begin
-                    pc_s <= ids[3];
-                    pc_t <= ids[1];
-                    state <= S_P2B_3_START;
-                end
-
-
-                S_P2B_3_START: begin
-                    pc_start <= 1;
-                    state <= S_P2B_3_WAIT;
-                end
-
-
-                S_P2B_3_WAIT: begin
-                    if (pc_done) begin
-                        p2_acc[1] <= p2_acc[1] * pc_result;
-                        part2_result <= p2_acc[1] * pc_result;
-                        state <= S_DONE;
-                    end
+                S_P2_SUM: begin
+                    part2_result <= p2_acc[0] * counts[3][T_OUT*64 +: 64] + p2_acc[1] * counts[2][T_OUT*64 +: 64];
+                    state <= S_DONE;
                 end
 
 
@@ -435,6 +319,7 @@ module name_resolver #(
     parameter MAX_NODES = 1024
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
     
     input wire [23:0] name_in, // assumption that ALL nodes are exactly 3 chars
@@ -460,6 +345,7 @@ module name_resolver #(
         .ADDR_BITS(HASH_ADDR_BITS)
     ) u_ram_hash_0(
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .we(hash_we),
         .w_addr(hash_w_addr),
@@ -480,7 +366,7 @@ module name_resolver #(
     reg [9:0] node_count;
     reg [HASH_ADDR_BITS-1:0] current_hash;
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_INIT;
             init_idx <= 0;
@@ -553,6 +439,7 @@ module graph_manager #(
     parameter MAX_EDGES = 8192 // likely an overshoot
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
 
     input wire add_edge_en,
@@ -591,6 +478,7 @@ module graph_manager #(
         .ADDR_BITS(NODE_BITS)
     ) u_node_ram_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .we(node_we),
         .w_addr(node_w_addr),
@@ -605,6 +493,7 @@ module graph_manager #(
         .ADDR_BITS(EDGE_BITS)
     ) u_edge_ram_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .we(edge_we),
         .w_addr(edge_w_addr),
@@ -640,7 +529,7 @@ module graph_manager #(
         end
     end
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_INIT;
             init_idx <= 0;
@@ -704,17 +593,23 @@ module graph_manager #(
 endmodule
 
 
+// counts the paths from a start node to each of NUM_TARGETS end nodes at once, with a depth first search that
+// sums the counts of every node's children. the counts of each node are remembered (until rst), so later
+// searches (from other start nodes, to the same end nodes) stop at any node an earlier search already visited.
+// assumes the graph has no cycles
 module path_counter #(
     parameter NODE_BITS = 10,
-    parameter EDGE_BITS = 13
+    parameter EDGE_BITS = 13,
+    parameter NUM_TARGETS = 1
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
     input wire start,
 
     input wire [NODE_BITS-1:0] src_node,
-    input wire [NODE_BITS-1:0] dst_node,
-    output reg [63:0] count_out,
+    input wire [NUM_TARGETS*NODE_BITS-1:0] dst_nodes, // must not change until rst
+    output reg [NUM_TARGETS*64-1:0] count_out,
     output reg done,
 
     // connection to graph_manager:
@@ -724,6 +619,7 @@ module path_counter #(
     output reg [EDGE_BITS-1:0] gm_read_edge_addr,
     input wire [NODE_BITS-1:0] gm_edge_to
 );
+    localparam COUNTS_WIDTH = NUM_TARGETS*64;
 
     // stack storage: (left as registers for now)
     localparam MAX_STACK_DEPTH = 64;
@@ -731,23 +627,24 @@ module path_counter #(
     reg [EDGE_BITS-1:0] stk_edge_start [0:MAX_STACK_DEPTH-1];
     reg [4:0] stk_edge_count [0:MAX_STACK_DEPTH-1];
     reg [4:0] stk_edge_idx [0:MAX_STACK_DEPTH-1];
-    reg [63:0] stk_sum [0:MAX_STACK_DEPTH-1];
+    reg [COUNTS_WIDTH-1:0] stk_sum [0:MAX_STACK_DEPTH-1];
     reg [6:0] sp;
 
     // memo ram signals:
     reg memo_we;
     reg [NODE_BITS-1:0] memo_w_addr;
-    reg [63:0] memo_w_data;
+    reg [COUNTS_WIDTH-1:0] memo_w_data;
     reg [NODE_BITS-1:0] memo_r_addr;
-    wire [63:0] memo_r_data;
+    wire [COUNTS_WIDTH-1:0] memo_r_data;
     reg [1023:0] memo_v;
 
     ram #(
-        .WIDTH(64),
+        .WIDTH(COUNTS_WIDTH),
         .DEPTH(1024),
         .ADDR_BITS(NODE_BITS)
     ) u_memo_ram_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .we(memo_we),
         .w_addr(memo_w_addr),
@@ -756,6 +653,31 @@ module path_counter #(
         .r_data(memo_r_data)
     );
 
+    // lane-wise sum of two sets of path counts:
+    function [COUNTS_WIDTH-1:0] add_counts;
+        input [COUNTS_WIDTH-1:0] a;
+        input [COUNTS_WIDTH-1:0] b;
+        integer t;
+        begin
+            for (t = 0; t < NUM_TARGETS; t = t + 1) begin
+                add_counts[t*64 +: 64] = a[t*64 +: 64] + b[t*64 +: 64];
+            end
+        end
+    endfunction
+
+    // path counts of the node on top of the stack once all its children are summed (an end node has exactly one
+    // path to itself):
+    reg [COUNTS_WIDTH-1:0] node_counts;
+    integer n;
+    always @(*) begin
+        node_counts = stk_sum[sp];
+        for (n = 0; n < NUM_TARGETS; n = n + 1) begin
+            if (stk_node[sp] == dst_nodes[n*NODE_BITS +: NODE_BITS]) begin
+                node_counts[n*64 +: 64] = 1;
+            end
+        end
+    end
+
     localparam S_IDLE = 0;
     localparam S_START_NODE = 1;
     localparam S_MEMO_WAIT = 2;
@@ -768,7 +690,7 @@ module path_counter #(
     reg [3:0] state;
     reg [NODE_BITS-1:0] curr_u;
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             state <= S_IDLE;
             done <= 0;
@@ -781,7 +703,6 @@ module path_counter #(
                 S_IDLE: begin
                     done <= 0;
                     if (start) begin
-                        memo_v <= 0;
                         sp <= 0;
                         stk_node[0] <= src_node;
                         stk_sum[0] <= 0;
@@ -792,26 +713,15 @@ module path_counter #(
 
                 S_START_NODE: begin
                     curr_u = stk_node[sp];
-                    if (curr_u == dst_node) begin
-                        // found the target:
-                        if (sp == 0) begin
-                            count_out <= 1;
-                            done <= 1;
-                            state <= S_IDLE;
-                        end else begin
-                            stk_sum[sp-1] <= stk_sum[sp-1] + 1;
-                            sp <= sp-1;
-                            state <= S_ITERATE;
-                        end
-                    end else if (memo_v[curr_u]) begin
-                        // subproblem already solved
+                    if (memo_v[curr_u]) begin
+                        // subproblem already solved (by this search, or an earlier one)
                         memo_r_addr <= curr_u;
                         state <= S_MEMO_WAIT;
                     end else begin
-                        // need to solve children:
+                        // need to solve children (end nodes too, as they can lead to the other end nodes):
                         gm_read_node_addr <= curr_u;
                         state <= S_HEAD_ISSUE;
-                    end 
+                    end
                 end
 
 
@@ -826,7 +736,7 @@ module path_counter #(
                         done <= 1;
                         state <= S_IDLE;
                     end else begin
-                        stk_sum[sp-1] <= stk_sum[sp-1] + memo_r_data;
+                        stk_sum[sp-1] <= add_counts(stk_sum[sp-1], memo_r_data);
                         sp <= sp-1;
                         state <= S_ITERATE;
                     end
@@ -851,15 +761,15 @@ module path_counter #(
                         // all edges processed -> write to memo
                         memo_we <= 1;
                         memo_w_addr <= stk_node[sp];
-                        memo_w_data <= stk_sum[sp];
+                        memo_w_data <= node_counts;
                         memo_v[stk_node[sp]] <= 1;
 
                         if (sp == 0) begin
-                            count_out <= stk_sum[sp];
+                            count_out <= node_counts;
                             done <= 1;
                             state <= S_IDLE;
                         end else begin
-                            stk_sum[sp-1] <= stk_sum[sp-1] + stk_sum[sp];
+                            stk_sum[sp-1] <= add_counts(stk_sum[sp-1], node_counts);
                             sp <= sp-1;
                             state <= S_ITERATE;
                         end
@@ -1,28 +1,456 @@
 import os
+import csv
 import subprocess
 import itertools
 import tempfile
 import statistics
 import re
+import sys
+import math
+import time
+import functools
+import argparse
+import traceback
+from multiprocessing import Pool
 from pathlib import Path
 from datetime import datetime
 import numpy as np
-import matplotlib.pyplot as plt
 from generate_input import (
     gen_day01,
     gen_day02,
     gen_day03,
+    gen_day03_bulk,
     gen_day04,
+    gen_day04_density,
     gen_day05,
     gen_day07,
+    gen_day07_grid,
     gen_day08,
     gen_day09,
+    gen_day10,
     gen_day11,
 )
 from generate_input import gen_day06_4_row as gen_day06
+from models import day04_rounds, day09_candidate_checks
 from typing import Callable, Any, Sequence
 
-CLOCK_CYCLE_RE = re.compile(r"Took\s+(\d+)\s+clock cycles")
+# every testbench finishes each input with a single machine-readable line, e.g.
+#   RESULT day=1 status=ok part1=46 part2=7172 cycles=1234
+# (batch mode adds input=<index in manifest>)
+RESULT_RE = re.compile(r"^RESULT((?: \w+=\S+)+)\s*$", re.MULTILINE)
+RESULT_INT_FIELDS = ("part1", "part2", "cycles")
+
+# when built with RAM_MONITOR=1, every ram instance also prints its memory traffic at the end (see ram_monitor
+# in utils/ram.v), e.g.
+#   RAM_MONITOR instance=day08_tb.u_core_0.u_edge_ram_0.u_ram_monitor_0 ports=2 cycles=9000 reads=4000 writes=1000 hazards=0 idle=5000
+RAM_MONITOR_RE = re.compile(r"^RAM_MONITOR((?: \w+=\S+)+)\s*$", re.MULTILINE)
+RAM_MONITOR_FIELDS = ("reads", "writes", "hazards", "idle")
+
+# trial status values written to the results csv files (and reported by the testbenches).
+# timed out trials are censored: we only know they took longer than `time_limit` seconds
+# (or, from a testbench, more than its MAX_CYCLES clock cycles).
+# a testbench's status=ok only means the core finished without reporting a problem, the answers are
+# always checked against the generator's as well (see `_check_result`)
+STATUS_OK = "ok"
+STATUS_TIMEOUT = "timeout"
+# reported by the testbenches: the input didn't fit in the rom, or the core dropped data it needed
+# (e.g. day 8's edge ram filling up)
+STATUS_OVERFLOW = "overflow"
+# reported by the day 8 testbench: the kept edges never joined every point into one circuit
+STATUS_INCOMPLETE = "incomplete"
+# only used when comparing variants (older variants are not always correct, so wrong answers are
+# recorded instead of stopping the comparison)
+STATUS_MISMATCH = "mismatch"
+STATUS_ERROR = "error"
+
+# host-side resource usage of each simulation, written as extra csv columns (see `_run_simulation`)
+RESOURCE_FIELDS = [
+    "compile_time",
+    "wall_time",
+    "user_time",
+    "sys_time",
+    "peak_rss_kb",
+    "cycles_per_sec",
+]
+
+
+# every testbench's rom holds 2^(N_ADDR_BITS + 1) bytes, N_ADDR_BITS = 16 (128KiB) by default
+ROM_MIN_ADDR_BITS = 16
+
+# default capacities of the cores that limit the size of their inputs (the sizes they were built and
+# synthesised with). larger inputs would be truncated or overflow, so these are raised as needed for
+# each input by `_size_parameters`, but never lowered
+CORE_CAPACITIES: dict[str, dict[str, int]] = {
+    "day01": {"OUTPUT_DATA_WIDTH": 16},
+    "day03": {"MAX_LINE_LEN": 128},
+    "day04": {"MAX_ROWS": 250, "MAX_COLS": 250, "LOG2_MAX_ROWS": 8, "LOG2_MAX_COLS": 8},
+    "day05": {"MAX_RANGES": 180, "LOG2_MAX_RANGES": 8},
+    "day07": {"MAX_WIDTH": 256},
+    "day08": {
+        "MAX_NODES": 1024,
+        "NODE_ADDR_BITS": 10,
+        "MAX_EDGES": 16384,
+        "EDGE_ADDR_BITS": 14,
+    },
+    "day09": {"LOG_MAX_POINTS": 9},
+}
+
+
+def _required_capacities(
+    day_dirname: str, lines: list[str], make_vars: dict[str, Any]
+) -> dict[str, int]:
+    # capacity parameters needed by one input file (see CORE_CAPACITIES) for the core built with make_vars
+    lines = [line.strip() for line in lines]
+    if day_dirname == "day01":
+        # each rotation can pass 0 at most (distance // 100 + 1) times, which bounds both answers
+        bound = sum(int(line[1:]) // 100 + 1 for line in lines if line)
+        return {"OUTPUT_DATA_WIDTH": bound.bit_length()}
+    if day_dirname == "day03":
+        return {"MAX_LINE_LEN": max(map(len, lines), default=0)}
+    if day_dirname == "day04":
+        # n_rows and n_cols share LOG2_MAX_ROWS in the core, so the grid is sized as a square
+        size = max([len(lines), *map(len, lines)])
+        return {
+            "MAX_ROWS": size,
+            "MAX_COLS": size,
+            "LOG2_MAX_ROWS": size.bit_length(),
+            "LOG2_MAX_COLS": size.bit_length(),
+        }
+    if day_dirname == "day05":
+        ranges = lines.index("") if "" in lines else len(lines)
+        return {"MAX_RANGES": ranges + 1, "LOG2_MAX_RANGES": (ranges + 1).bit_length()}
+    if day_dirname == "day07":
+        return {"MAX_WIDTH": len(lines[0]) if lines else 0}
+    if day_dirname == "day08":
+        # the parser stops at MAX_NODES - 1 points
+        node_bits = sum(1 for line in lines if line).bit_length()
+        sizes = {"MAX_NODES": 1 << node_bits, "NODE_ADDR_BITS": node_bits}
+        if int(make_vars.get("KNN_EDGES", 0)):
+            # knn_edge_generator writes KNN_K edges per node, and drops (and reports) any past MAX_EDGES.
+            # the heuristic picks its bucket to fit MAX_EDGES, so its edge ram is left as it was built
+            edges = sizes["MAX_NODES"] * int(make_vars.get("KNN_K", 12))
+            edge_bits = (edges - 1).bit_length()
+            sizes.update({"MAX_EDGES": 1 << edge_bits, "EDGE_ADDR_BITS": edge_bits})
+        return sizes
+    if day_dirname == "day09":
+        points = sum(1 for line in lines if line)
+        return {"LOG_MAX_POINTS": max(points - 1, 0).bit_length()}
+    return {}
+
+
+def _size_parameters(
+    day_dirname: str, input_paths: list[Path], make_vars: dict[str, Any] | None = None
+) -> dict[str, int]:
+    # smallest rom address width and core capacities that fit every input (a batch of inputs shares
+    # a single build) with the core built with make_vars (its other Makefile variables, if any), passed
+    # to the day's Makefile as compile-time overrides and recorded in the csv
+    sizes = {"N_ADDR_BITS": ROM_MIN_ADDR_BITS, **CORE_CAPACITIES.get(day_dirname, {})}
+    for path in input_paths:
+        # the rom needs 2 bytes after the file for its newline / null terminator
+        needed = {"N_ADDR_BITS": (path.stat().st_size + 1).bit_length() - 1}
+        if day_dirname in CORE_CAPACITIES:
+            lines = path.read_text(encoding="utf-8").splitlines()
+            needed.update(_required_capacities(day_dirname, lines, make_vars or {}))
+        for name, value in needed.items():
+            sizes[name] = max(sizes[name], value)
+    return sizes
+
+
+def _size_fieldnames(day_dirname: str) -> list[str]:
+    # csv columns written by `_size_parameters`
+    return ["N_ADDR_BITS", *CORE_CAPACITIES.get(day_dirname, {})]
+
+
+def _pyplot():
+    # matplotlib is only imported once something is actually plotted, as it is slow to import and
+    # not needed for headless (--no-plot) runs. plots are only ever saved to file, so no GUI backend
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def _append_row(csv_path: Path, fieldnames: list[str], row: dict) -> None:
+    # append a single trial's results to a csv file (writing the header if the file is new)
+    # the file is closed after every row so completed trials survive crashes / Ctrl-C
+    new_file = not csv_path.exists() or csv_path.stat().st_size == 0
+    with open(csv_path, "a", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        if new_file:
+            writer.writeheader()
+        writer.writerow(row)
+
+
+def _load_rows(csv_path: Path) -> list[dict]:
+    # read back the trial rows of a (possibly interrupted) previous run
+    if not csv_path.exists():
+        return []
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        rows = list(csv.DictReader(f))
+    for row in rows:
+        # older files have no seed column, trial t was always run with seed t-1
+        if not row.get("seed"):
+            row["seed"] = int(row["trial"]) - 1
+        # older files only recorded completed trials
+        if not row.get("status"):
+            row["status"] = STATUS_OK
+    return rows
+
+
+def _run_measured(cmd: list[str], time_limit: float) -> tuple[str, dict]:
+    # run a command, returning its combined stdout/stderr and the resource usage of the child
+    # process as reported by wait4 (so it covers only this process, not the rest of the harness)
+    with tempfile.TemporaryFile(mode="w+") as out:
+        start_time = time.perf_counter()
+        proc = subprocess.Popen(cmd, stdout=out, stderr=subprocess.STDOUT, text=True)
+        while True:
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            if time.perf_counter() - start_time > time_limit:
+                proc.kill()
+                os.wait4(proc.pid, 0)
+                proc.returncode = -1
+                raise subprocess.TimeoutExpired(cmd, time_limit)
+            time.sleep(0.005)
+        wall_time = time.perf_counter() - start_time
+        proc.returncode = os.waitstatus_to_exitcode(status)
+
+        out.seek(0)
+        output = out.read()
+
+    # ru_maxrss is in kilobytes on linux, bytes on macos
+    peak_rss = usage.ru_maxrss // 1024 if sys.platform == "darwin" else usage.ru_maxrss
+    return output, {
+        "wall_time": wall_time,
+        "user_time": usage.ru_utime,
+        "sys_time": usage.ru_stime,
+        "peak_rss_kb": peak_rss,
+    }
+
+
+def _run_simulation(
+    day_dirname: str,
+    input_paths: list[Path],
+    time_limit: float,
+    out_file: Path | None = None,
+    make_vars: dict[str, Any] | None = None,
+) -> tuple[list[str], dict]:
+    # compile the testbench for the given input files with the day's Makefile, then run vvp on its
+    # own so the recorded usage is the simulation only (not make / iverilog).
+    # a single input is passed as INPUT_FILE, several inputs are listed in a manifest and solved by
+    # the testbench's batch mode in one simulation (so startup and elaboration are only paid once).
+    # returns the output for each input, and the resource usage split evenly between them.
+    # `out_file` overrides where the compiled testbench is written (so several simulations of the same
+    # day can run at once), `make_vars` are extra Makefile variables for the build (e.g. core sizes).
+    # must be called from inside the day's directory.
+    # raises subprocess.TimeoutExpired if either step takes longer than time_limit per input
+    batch = len(input_paths) > 1
+    time_limit = time_limit * len(input_paths)
+    if batch:
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as tmp:
+            manifest_path = Path(tmp.name)
+            tmp.write("".join(f"{p}\n" for p in input_paths))
+        make_args = f"MANIFEST={manifest_path}"
+    else:
+        make_args = f"INPUT_FILE={input_paths[0]}"
+
+    make_cmd = ["make", "all", make_args]
+    make_cmd += [f"{k}={v}" for k, v in (make_vars or {}).items()]
+    if out_file is not None:
+        make_cmd.append(f"OUT={out_file}")
+    else:
+        out_file = Path(f"{day_dirname}_tb.out")
+
+    try:
+        start_time = time.perf_counter()
+        build = subprocess.run(
+            make_cmd,
+            capture_output=True,
+            text=True,
+            timeout=time_limit,
+        )
+        compile_time = time.perf_counter() - start_time
+        if build.returncode != 0:
+            raise RuntimeError(
+                f"Failed to compile {day_dirname}:\n{build.stdout}{build.stderr}"
+            )
+
+        output, usage = _run_measured(["vvp", str(out_file)], time_limit)
+    finally:
+        if batch:
+            manifest_path.unlink(missing_ok=True)
+
+    usage["compile_time"] = compile_time
+    if not batch:
+        return [output], usage
+
+    # one block of output per input, each starting with the testbench's "INFO: Batch input" line:
+    outputs = re.split(r"^(?=INFO: Batch input )", output, flags=re.MULTILINE)[1:]
+    if len(outputs) != len(input_paths):
+        raise RuntimeError(
+            f"Expected {len(input_paths)} results from {day_dirname} batch, found {len(outputs)}\nOutput: {output}"
+        )
+    usage = {
+        k: v if k == "peak_rss_kb" else v / len(input_paths) for k, v in usage.items()
+    }
+    return outputs, usage
+
+
+def _parse_result(output: str) -> dict:
+    # parse the RESULT line from the output of one simulation (or one input of a batch).
+    # raises RuntimeError unless there is exactly one well-formed line
+    lines = RESULT_RE.findall(output)
+    if len(lines) != 1:
+        raise RuntimeError(
+            f"Expected one RESULT line in simulation output, found {len(lines)}\nOutput: {output}"
+        )
+    result = dict(field.split("=", 1) for field in lines[0].split())
+    try:
+        for key in RESULT_INT_FIELDS:
+            result[key] = int(result[key])
+    except (KeyError, ValueError):
+        raise RuntimeError(f"Malformed RESULT line: RESULT{lines[0]}")
+    return result
+
+
+def _parse_ram_monitor(output: str) -> dict[str, dict[str, int]]:
+    # parse the RAM_MONITOR lines from the output of one simulation (or one input of a batch), keyed by
+    # the ram's instance path in the core (without the testbench and the monitor itself)
+    traffic = {}
+    for line in RAM_MONITOR_RE.findall(output):
+        fields = dict(field.split("=", 1) for field in line.split())
+        instance = ".".join(fields.pop("instance").split(".")[1:-1])
+        traffic[instance] = {k: int(v) for k, v in fields.items()}
+    return traffic
+
+
+def _check_result(result: dict, expected: tuple[int, int]) -> bool:
+    # both parts must match the generator's answers exactly
+    parts = (result["part1"], result["part2"])
+    return result["status"] == STATUS_OK and parts == tuple(int(e) for e in expected)
+
+
+def _usage_columns(usage: dict, cycles: int) -> dict:
+    # format resource usage for a results csv row (adds simulated clock cycles per wall-clock second)
+    row = {k: round(v, 3) for k, v in usage.items() if k != "peak_rss_kb"}
+    row["peak_rss_kb"] = usage["peak_rss_kb"]
+    row["cycles_per_sec"] = (
+        round(cycles / usage["wall_time"]) if usage["wall_time"] else ""
+    )
+    return row
+
+
+def _time_limit(
+    size: int,
+    wall_times: dict[int, list[float]],
+    timeout: float,
+    max_timeout: float | None,
+    margin: float,
+) -> float:
+    # time limit for a trial of the given size, extrapolated from wall times of the smaller sizes
+    # measured so far. growth is fitted between the two largest measured sizes (clamped to between
+    # linear and cubic), assumed quadratic if only one size has been measured.
+    # `timeout` is the smallest limit ever used, `max_timeout` the largest
+    limit = timeout
+    measured = sorted(s for s, ts in wall_times.items() if ts and s < size)
+    if measured:
+        s1 = measured[-1]
+        t1 = max(wall_times[s1])
+        exponent = 2.0
+        if len(measured) > 1:
+            s0 = measured[-2]
+            t0 = max(wall_times[s0])
+            if t0 > 0 and t1 > 0 and s1 > s0:
+                exponent = min(max(math.log(t1 / t0) / math.log(s1 / s0), 1.0), 3.0)
+        limit = max(timeout, margin * t1 * (size / s1) ** exponent)
+
+    if max_timeout is not None:
+        limit = min(limit, max_timeout)
+    return limit
+
+
+# per size summary written next to the results csv by `general_benchmark`
+SUMMARY_FIELDS = [
+    "input_size",
+    "trials",
+    "censored",
+    "mean",
+    "stdev",
+    "median",
+    "p10",
+    "p90",
+    "ci_low",
+    "ci_high",
+    "outlier_seeds",
+]
+
+
+def _bootstrap_ci(
+    values: Sequence[float],
+    confidence: float = 0.95,
+    resamples: int = 2000,
+    seed: int = 0,
+) -> tuple[float, float]:
+    # percentile bootstrap confidence interval of the median. unlike mean +- stdev this makes no
+    # assumption about the distribution of the cycle counts, which are heavy-tailed on some days
+    # (e.g. day 8's bucket selection, day 10's ILP search)
+    if len(values) < 2:
+        value = float(values[0]) if values else math.nan
+        return value, value
+    rng = np.random.default_rng(seed)
+    samples = rng.choice(np.asarray(values, dtype=float), size=(resamples, len(values)))
+    medians = np.median(samples, axis=1)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(medians, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+def _ci_width(values: Sequence[float]) -> float:
+    # width of the median's confidence interval, relative to the median
+    low, high = _bootstrap_ci(values)
+    median = statistics.median(values) if values else 0
+    return (high - low) / median if median else math.inf
+
+
+def _outlier_seeds(cycles_by_seed: dict[int, int], k: float = 1.5) -> list[int]:
+    # seeds whose cycle counts are outside tukey's fences (more than k interquartile ranges beyond the
+    # quartiles). needs a few trials to say anything, so nothing is flagged below 4
+    if len(cycles_by_seed) < 4:
+        return []
+    q1, q3 = np.percentile(list(cycles_by_seed.values()), [25, 75])
+    low, high = q1 - k * (q3 - q1), q3 + k * (q3 - q1)
+    return sorted(s for s, c in cycles_by_seed.items() if c < low or c > high)
+
+
+def _summarise(
+    size: int, cycles_by_seed: dict[int, int], censored: int
+) -> dict[str, Any]:
+    # one row of the summary csv (see SUMMARY_FIELDS)
+    values = list(cycles_by_seed.values())
+    row: dict[str, Any] = {
+        "input_size": size,
+        "trials": len(values),
+        "censored": censored,
+    }
+    if values:
+        ci_low, ci_high = _bootstrap_ci(values)
+        p10, p90 = np.percentile(values, [10, 90])
+        row.update(
+            {
+                "mean": round(statistics.mean(values), 1),
+                "stdev": round(statistics.stdev(values), 1) if len(values) > 1 else 0,
+                "median": statistics.median(values),
+                "p10": round(float(p10), 1),
+                "p90": round(float(p90), 1),
+                "ci_low": round(ci_low, 1),
+                "ci_high": round(ci_high, 1),
+                "outlier_seeds": ";".join(map(str, _outlier_seeds(cycles_by_seed))),
+            }
+        )
+    return row
 
 
 def general_benchmark(
@@ -38,6 +466,18 @@ def general_benchmark(
     | None = None,  # function to generate input file. arguments are [n: int, fname: str, seed: int]
     input_desc: str = "",  # short description of input to include on graph
     day_name: str = "Day X",  # name of day to include as graph title
+    resume: str | None = None,  # csv file of an interrupted run to continue
+    max_timeout: float | None = None,  # upper bound on the adaptive time limit
+    timeout_margin: float = 3.0,  # how much slower than predicted a trial may be before it is cut off
+    batch_size: int = 1,  # number of trials to solve in each simulation (testbench batch mode)
+    sizes: (
+        Sequence[int] | None
+    ) = None,  # explicit input sizes to test (instead of lo, hi, n)
+    plot: bool = True,  # whether to save a plot of the results
+    ci_target: (
+        float | None
+    ) = None,  # relative width of the median's confidence interval to run trials until
+    max_repeats: int = 30,  # most trials per size when ci_target is set
 ) -> dict:
     """Generic benchmark function to generalise functionality for all verilog testbenches
 
@@ -46,17 +486,53 @@ def general_benchmark(
         hi (int, optional): The largest input size to benchmark. Defaults to 1000.
         n (int, optional): The number of sample points (will be linearly spaced between lo and hi). Defaults to 10.
         repeats (int, optional): Number of trials per input size. Defaults to 5.
-        timeout (int, optional): Number of seconds to run each simulation for. Defaults to 5.
+        timeout (int, optional): Minimum number of seconds to run each simulation for. Defaults to 5.
+        resume (str | None, optional): Path to the csv file of a previous run. Trials already in the file
+            (same size, trial and seed) are skipped and new trials are appended to it. Defaults to None.
+        max_timeout (float | None, optional): Largest time limit to use for any trial. Defaults to None (no limit).
+        timeout_margin (float, optional): Multiple of the predicted wall time to allow each trial. Defaults to 3.0.
+        batch_size (int, optional): Number of trials of the same size to solve in a single simulation, using the
+            testbench's batch mode. Defaults to 1 (one simulation per trial).
+        sizes (Sequence[int] | None, optional): Input sizes to test, overrides lo, hi and n. Defaults to None.
+        plot (bool, optional): Save a plot of the results next to the csv file. Defaults to True.
+        ci_target (float | None, optional): Width of the 95% confidence interval of the median to aim for, as a
+            fraction of the median (e.g. 0.02). After the first `repeats` trials of a size, more are run (`batch_size`
+            at a time) until the interval is narrower than this. Defaults to None (always `repeats` trials).
+        max_repeats (int, optional): Most trials to run per size when `ci_target` is set. Defaults to 30.
+
+    Results are appended to the csv file as each trial completes, so an interrupted run can be continued
+    by passing its csv file as `resume`.
+
+    The time limit for each size is extrapolated from the wall time of the smaller sizes (see `_time_limit`).
+    Trials that time out are recorded as censored rows (status "timeout", no clock cycles) rather than
+    being dropped, are re-run when resuming, and are marked on the plot.
+
+    Each completed row also records the host resources used by the simulation (`RESOURCE_FIELDS`): compile
+    time, vvp wall time, user/sys CPU time, peak RSS and simulated clock cycles per second. When trials are
+    batched, times are the batch's total divided by the number of trials in it (see the `batch_size` column).
+
+    A summary of each size is written to `<csv name>_summary.csv` (`SUMMARY_FIELDS`): the median, 10th / 90th
+    percentiles and a bootstrap confidence interval of the median (see `_bootstrap_ci`), as well as the mean and
+    stdev. Seeds with outlying cycle counts (`_outlier_seeds`) are listed there, and their input files are
+    regenerated into a `<csv name>_outliers` directory for inspection. The plot shows the median and its
+    confidence interval rather than the mean and stdev.
 
     # Todo: write key assumptions / requirements for this function to work
     """
     # validate inputs:
     if not input_generator_function:
         raise ValueError("input file generator function must be provided.")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
 
     # setup:
-    sizes = np.linspace(lo, hi, n, dtype=int)
+    if sizes is None:
+        sizes = np.linspace(lo, hi, n, dtype=int)
+    sizes = [int(s) for s in sizes]
     results = {size: [] for size in sizes}
+    seed_cycles = {size: {} for size in sizes}  # cycles of each completed trial by seed
+    censored = {size: 0 for size in sizes}  # number of timed out trials per size
+    wall_times = {size: [] for size in sizes}  # wall time of completed trials
     root = Path(__file__).resolve().parent
     day_dir = (root / f"../{day_dirname}").resolve()
 
@@ -64,6 +540,43 @@ def general_benchmark(
     if not day_dir.exists():
         raise RuntimeError(f"{day_dirname} directory was not found at {day_dir}")
 
+    # results file:
+    out_dir = root / "benchmarks"
+    out_dir.mkdir(exist_ok=True)
+    if resume:
+        csv_path = Path(resume).resolve()
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        csv_path = out_dir / f"{day_dirname}_benchmark_{timestamp}.csv"
+    fieldnames = [
+        "input_size",
+        "trial",
+        "seed",
+        "status",
+        "clock_cycles",
+        *RESOURCE_FIELDS,
+        "batch_size",
+        "time_limit",
+        *_size_fieldnames(day_dirname),
+    ]
+
+    # load trials that have already been run (a later row for the same trial replaces an earlier one):
+    previous = {}
+    for row in _load_rows(csv_path):
+        previous[(int(row["input_size"]), int(row["trial"]), int(row["seed"]))] = row
+    completed = set()
+    for (size, trial, seed), row in previous.items():
+        if row["status"] != STATUS_OK:
+            continue  # censored trials are tried again
+        completed.add((size, trial, seed))
+        results.setdefault(size, []).append(int(row["clock_cycles"]))
+        seed_cycles.setdefault(size, {})[seed] = int(row["clock_cycles"])
+        censored.setdefault(size, 0)
+        if row.get("wall_time"):
+            wall_times.setdefault(size, []).append(float(row["wall_time"]))
+    if completed:
+        print(f"\t{day_name}: resuming from {csv_path} ({len(completed)} trials done)")
+
     original_cwd = Path.cwd()
 
     try:
@@ -71,88 +584,216 @@ def general_benchmark(
 
         # test all size inputs:
         for size in sizes:
-            print(f"\t{day_name}: Running tests for size = {size}")
-            # repeat for each trial:
-            for trial in range(repeats):
-                print(f"\t\trunning trial {trial + 1}")
-                # use a tempfile to generate input into (avoid clutteringg wd)
-                with tempfile.NamedTemporaryFile(
-                    mode="w", suffix=".txt", delete=False
-                ) as tmp:
-                    input_path = Path(tmp.name)
-
-                    # generate input file:
-                    expected_results = input_generator_function(
-                        n=size, output_filename=str(input_path), seed=trial
-                    )
-
-                    # run simulator:
-                    try:
-                        proc = subprocess.run(
-                            ["make", "run", f"INPUT_FILE={input_path}"],
-                            capture_output=True,
-                            text=True,
-                            timeout=timeout,
-                        )
-                    except subprocess.TimeoutExpired:
-                        print(f"\tTrial {trial}: timed out")
+            time_limit = _time_limit(
+                size, wall_times, timeout, max_timeout, timeout_margin
+            )
+            print(
+                f"\t{day_name}: Running tests for size = {size} (time limit {time_limit:.1f}s)"
+            )
+            # `repeats` trials, then more until the confidence interval is narrow enough (if ci_target is set):
+            first_trial, num_trials = 0, repeats
+            while True:
+                pending = []
+                for trial in range(first_trial, num_trials):
+                    seed = trial
+                    if (size, trial + 1, seed) in completed:
+                        print(f"\t\tskipping trial {trial + 1} (already done)")
                         continue
+                    pending.append((trial, seed))
 
-                    stdout = proc.stdout + proc.stderr
-
-                    # check expected results appear in the simulation output:
-                    if (str(expected_results[0]) not in stdout) or (
-                        str(expected_results[0]) not in stdout
-                    ):
-                        raise RuntimeError(
-                            f"Incorrect output for size={size}, trial={trial}\n\texpected: {expected_results}\nSimulation output:{stdout}"
-                        )
-
-                    # record clock cycles:
-                    mat = CLOCK_CYCLE_RE.search(stdout)
-                    if not mat:
-                        raise RuntimeError(
-                            f"Number of clock cycles not found in output for size={size}, trial={trial}\nOutput: {stdout}"
-                        )
-                    cycles = int(mat.group(1))
-                    results[size].append(cycles)
+                # run the remaining trials, `batch_size` at a time in a single simulation:
+                for i in range(0, len(pending), batch_size):
+                    batch = pending[i : i + batch_size]
+                    print(
+                        f"\t\trunning trial(s) {', '.join(str(t + 1) for t, _ in batch)}"
+                    )
+                    # use tempfiles to generate input into (avoid clutteringg wd)
+                    input_paths = []
+                    for _ in batch:
+                        with tempfile.NamedTemporaryFile(
+                            mode="w", suffix=".txt", delete=False
+                        ) as tmp:
+                            input_paths.append(Path(tmp.name))
 
-                    # remove temp file:
-                    input_path.unlink(missing_ok=True)
+                    try:
+                        # generate input files:
+                        expected_results = [
+                            input_generator_function(
+                                n=size, output_filename=str(input_path), seed=seed
+                            )
+                            for input_path, (_, seed) in zip(input_paths, batch)
+                        ]
+
+                        # run simulator, with the rom and core sized for the inputs:
+                        make_vars = _size_parameters(day_dirname, input_paths)
+                        rows = [
+                            {
+                                "input_size": size,
+                                "trial": trial + 1,
+                                "seed": seed,
+                                "batch_size": len(batch),
+                                "time_limit": round(time_limit, 3),
+                                **make_vars,
+                            }
+                            for trial, seed in batch
+                        ]
+                        try:
+                            outputs, usage = _run_simulation(
+                                day_dirname,
+                                input_paths,
+                                time_limit,
+                                make_vars=make_vars,
+                            )
+                        except subprocess.TimeoutExpired:
+                            # the whole batch is lost, so every trial in it is censored
+                            print(
+                                f"\tTrial(s) {', '.join(str(t + 1) for t, _ in batch)}: timed out after {time_limit:.1f}s per trial"
+                            )
+                            censored[size] += len(batch)
+                            for row in rows:
+                                row["status"] = STATUS_TIMEOUT
+                                _append_row(csv_path, fieldnames, row)
+                            continue
+
+                        for (trial, seed), expected, stdout, row in zip(
+                            batch, expected_results, outputs, rows
+                        ):
+                            # check both answers against the generator's:
+                            result = _parse_result(stdout)
+                            if not _check_result(result, expected):
+                                raise RuntimeError(
+                                    f"Incorrect output for size={size}, trial={trial + 1}\n\texpected: {expected}\n\tgot: {result}\nSimulation output:{stdout}"
+                                )
+                            cycles = result["cycles"]
+                            results[size].append(cycles)
+                            seed_cycles[size][seed] = cycles
+                            wall_times[size].append(usage["wall_time"])
+                            row.update({"status": STATUS_OK, "clock_cycles": cycles})
+                            row.update(_usage_columns(usage, cycles))
+                            _append_row(csv_path, fieldnames, row)
+                    finally:
+                        # remove temp files:
+                        for input_path in input_paths:
+                            input_path.unlink(missing_ok=True)
+
+                if ci_target is None or num_trials >= max_repeats:
+                    break
+                values = list(seed_cycles[size].values())
+                if not values:
+                    break  # every trial timed out, more won't help
+                width = _ci_width(values)
+                if width <= ci_target:
+                    break
+                print(
+                    f"\t\tconfidence interval is {width:.1%} of the median (target {ci_target:.1%}), adding trials"
+                )
+                first_trial, num_trials = num_trials, min(
+                    max_repeats, num_trials + batch_size
+                )
     finally:
         os.chdir(original_cwd)
 
-    # save results to file:
-    out_dir = root / "benchmarks"
-    out_dir.mkdir(exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    csv_path = out_dir / f"{day_dirname}_benchmark_{timestamp}.csv"
-
-    with open(csv_path, "w", encoding="utf-8") as f:
-        # header row:
-        f.write("input_size,trial,clock_cycles\n")
-
-        # data rows:
-        for s, vs in results.items():
-            for i, v in enumerate(vs):
-                f.write(f"{s},{i + 1},{v}\n")
-
     print(f"Saved results to {csv_path}")
 
-    # plot results:
-    means = []
-    stdevs = []
-    for s, vs in results.items():
-        means.append(statistics.mean(vs))
-        stdevs.append(statistics.stdev(vs) if len(vs) > 1 else 0)
+    # per-size summary (statistics only use completed trials):
+    summary = [
+        _summarise(s, seed_cycles.get(s, {}), censored.get(s, 0))
+        for s in sorted(set(results) | set(censored))
+    ]
+    summary_path = csv_path.with_name(csv_path.stem + "_summary.csv")
+    with open(summary_path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_FIELDS)
+        writer.writeheader()
+        writer.writerows(summary)
+    print(f"Saved summary to {summary_path}")
+
+    # keep the inputs of outlying trials (the generators are deterministic, so just regenerate them):
+    outliers = [
+        (row["input_size"], int(seed))
+        for row in summary
+        for seed in filter(None, row.get("outlier_seeds", "").split(";"))
+    ]
+    if outliers:
+        outlier_dir = csv_path.with_name(csv_path.stem + "_outliers")
+        outlier_dir.mkdir(exist_ok=True)
+        for size, seed in outliers:
+            input_generator_function(
+                n=size,
+                output_filename=str(outlier_dir / f"size{size}_seed{seed}.txt"),
+                seed=seed,
+            )
+        print(f"Saved {len(outliers)} outlying input(s) to {outlier_dir}")
+
+    if not plot:
+        return results
+
+    # plot the median with its confidence interval, and the 10th-90th percentile band:
+    plt = _pyplot()
+    stats = [row for row in summary if row["trials"]]
+    plot_sizes = [row["input_size"] for row in stats]
+    medians = [row["median"] for row in stats]
 
     plt.figure(figsize=(8, 5))
-    plt.errorbar(sizes, means, yerr=stdevs, fmt="o-", label="Mean clock cycles")
+    plt.fill_between(
+        plot_sizes,
+        [row["p10"] for row in stats],
+        [row["p90"] for row in stats],
+        alpha=0.2,
+        label="10th-90th percentile",
+    )
+    plt.errorbar(
+        plot_sizes,
+        medians,
+        yerr=[
+            [m - row["ci_low"] for m, row in zip(medians, stats)],
+            [row["ci_high"] - m for m, row in zip(medians, stats)],
+        ],
+        fmt="o-",
+        capsize=3,
+        label="Median clock cycles (95% CI)",
+    )
+    outlier_points = [(size, seed_cycles[size][seed]) for size, seed in outliers]
+    if outlier_points:
+        plt.scatter(
+            [s for s, _ in outlier_points],
+            [c for _, c in outlier_points],
+            marker="^",
+            color="orange",
+            label="Outlying trials",
+        )
+
+    # mark censored points: sizes where only some trials timed out are circled at their (biased low) median,
+    # sizes where every trial timed out have no cycle count so are marked along the top of the plot
+    partial = [(s, m) for s, m in zip(plot_sizes, medians) if censored.get(s)]
+    if partial:
+        plt.scatter(
+            [s for s, _ in partial],
+            [m for _, m in partial],
+            s=120,
+            facecolors="none",
+            edgecolors="red",
+            label="Some trials timed out",
+        )
+    all_censored = sorted(s for s, c in censored.items() if c and not results.get(s))
+    if all_censored:
+        plt.scatter(
+            all_censored,
+            [0.97] * len(all_censored),
+            marker="x",
+            color="red",
+            transform=plt.gca().get_xaxis_transform(),
+            label="All trials timed out",
+        )
+        # markers are in axes coordinates vertically, so widen the x axis by hand to include them
+        x_all = plot_sizes + all_censored
+        pad = 0.05 * max(max(x_all) - min(x_all), 1)
+        plt.xlim(min(x_all) - pad, max(x_all) + pad)
+
     plt.xlabel(f"Input size ({input_desc})")
-    plt.ylabel(f"Total Clock cycles (average of {repeats} per size)")
+    plt.ylabel("Total Clock cycles (median per size)")
     plt.title(f"{day_name} Clock cycles vs Input size")
     plt.legend()
-    plot_path = out_dir / f"{day_dirname}_benchmark_{timestamp}.png"
+    plot_path = csv_path.with_suffix(".png")
     plt.savefig(plot_path, dpi=300)
     plt.close()
     print(f"Saved plot to {plot_path}")
@@ -172,12 +813,29 @@ def benchmark_sweep(
     arg_adapter: Callable[[dict[str, int]], Any] = lambda p: list(p.values())[0],
     repeats: int = 5,
     timeout: int = 5,
+    # trials csv file of an interrupted sweep to continue
+    resume: str | None = None,
+    # number of trials of the same config to solve in a single simulation (testbench batch mode)
+    batch_size: int = 1,
+    # whether to save plots of the results
+    plot: bool = True,
+    # adapter to convert param dict to extra Makefile variables (e.g. to size the core for the input),
+    # e.g., lambda p: {'MAX_WIDTH': p['width']}. the variables are also written to the trials csv
+    make_adapter: Callable[[dict[str, int]], dict[str, Any]] | None = None,
+    # upper bound on the adaptive time limit
+    max_timeout: float | None = None,
+    # how much slower than predicted a trial may be before it is cut off
+    timeout_margin: float = 3.0,
 ) -> dict:
+    # the time limit for each config is extrapolated from the wall times of the smaller configs (see
+    # `_time_limit`), where a config's size is the product of its parameter values
     root = Path(__file__).resolve().parent
     day_dir = (root / f"../{day_dirname}").resolve()
 
     if not day_dir.exists():
         raise RuntimeError(f"Directory not found: {day_dir}")
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
 
     # Generate all combinations of parameters
     param_names = list(param_grid.keys())
@@ -194,6 +852,45 @@ def benchmark_sweep(
     out_dir.mkdir(exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
+    # every trial is appended to the trials file as soon as it finishes:
+    if resume:
+        trials_path = Path(resume).resolve()
+    else:
+        trials_path = out_dir / f"{day_dirname}_trials_{timestamp}.csv"
+    make_names = list(make_adapter(sweep_configs[0])) if make_adapter else []
+    make_names += [f for f in _size_fieldnames(day_dirname) if f not in make_names]
+    trial_fieldnames = (
+        param_names
+        + make_names
+        + [
+            "trial",
+            "seed",
+            "status",
+            "clock_cycles",
+            *RESOURCE_FIELDS,
+            "batch_size",
+            "time_limit",
+        ]
+    )
+
+    # cycles of each completed trial, keyed by (param values, trial, seed).
+    # timed out (censored) trials are stored as None, and are tried again when resuming
+    trial_cycles = {}
+    # wall times of completed trials, keyed by config size (for the time limits):
+    wall_times: dict[int, list[float]] = {}
+    for row in _load_rows(trials_path):
+        key = (
+            tuple(int(row[p]) for p in param_names),
+            int(row["trial"]),
+            int(row["seed"]),
+        )
+        ok = row["status"] == STATUS_OK
+        trial_cycles[key] = int(row["clock_cycles"]) if ok else None
+        if ok and row.get("wall_time"):
+            wall_times.setdefault(math.prod(key[0]), []).append(float(row["wall_time"]))
+    if trial_cycles:
+        print(f"Resuming from {trials_path} ({len(trial_cycles)} trials done)")
+
     try:
         os.chdir(day_dir)
         print(f"Benchmarking {day_name}")
@@ -203,50 +900,110 @@ def benchmark_sweep(
             config_str = ", ".join([f"{k}={v}" for k, v in config.items()])
             print(f"\tTesting: {config_str}")
             gen_arg = arg_adapter(config)
-
-            trial_cycles = []
-
+            make_vars = make_adapter(config) if make_adapter else {}
+            config_key = tuple(int(config[p]) for p in param_names)
+            config_size = math.prod(config_key)
+            time_limit = _time_limit(
+                config_size, wall_times, timeout, max_timeout, timeout_margin
+            )
+            print(f"\t\ttime limit {time_limit:.1f}s")
+
+            pending = []
             for t in range(repeats):
-                with tempfile.NamedTemporaryFile(
-                    mode="w", suffix=".txt", delete=False
-                ) as tmp:
-                    input_path = Path(tmp.name)
-                    try:
-                        expected = input_generator_function(
+                if trial_cycles.get((config_key, t + 1, t)) is not None:
+                    print(f"\t\tTrial {t + 1}: already done, skipping")
+                    continue
+                pending.append(t)
+
+            # run the remaining trials, `batch_size` at a time in a single simulation:
+            for i in range(0, len(pending), batch_size):
+                batch = pending[i : i + batch_size]
+                input_paths = []
+                for _ in batch:
+                    with tempfile.NamedTemporaryFile(
+                        mode="w", suffix=".txt", delete=False
+                    ) as tmp:
+                        input_paths.append(Path(tmp.name))
+                rows = []
+                for t in batch:
+                    row = config.copy()
+                    row.update(
+                        {
+                            "trial": t + 1,
+                            "seed": t,
+                            "batch_size": len(batch),
+                            "time_limit": round(time_limit, 3),
+                        }
+                    )
+                    rows.append(row)
+                try:
+                    expected_results = [
+                        input_generator_function(
                             n=gen_arg, output_filename=str(input_path), seed=t
                         )
+                        for input_path, t in zip(input_paths, batch)
+                    ]
+
+                    # rom and core sized for the inputs, unless the sweep sets them itself:
+                    batch_vars = {
+                        **_size_parameters(day_dirname, input_paths),
+                        **make_vars,
+                    }
+                    for row in rows:
+                        row.update(batch_vars)
+                    outputs, usage = _run_simulation(
+                        day_dirname, input_paths, time_limit, make_vars=batch_vars
+                    )
 
-                        proc = subprocess.run(
-                            ["make", "run", f"INPUT_FILE={input_path}"],
-                            capture_output=True,
-                            text=True,
-                            timeout=timeout,
+                    for t, expected, stdout, row in zip(
+                        batch, expected_results, outputs, rows
+                    ):
+                        try:
+                            result = _parse_result(stdout)
+                        except RuntimeError:
+                            print(f"\t\tTrial {t + 1}: No RESULT line found")
+                            continue
+                        if expected and not _check_result(result, expected):
+                            print(f"\t\tTrial {t + 1}: Output mismatch (Warning)")
+                        cycles = result["cycles"]
+                        trial_cycles[(config_key, t + 1, t)] = cycles
+                        wall_times.setdefault(config_size, []).append(
+                            usage["wall_time"]
                         )
-                        stdout = proc.stdout + proc.stderr
-
-                        if expected and (str(expected[0]) not in stdout):
-                            print(f"\t\tTrial {t}: Output mismatch (Warning)")
-                        match = CLOCK_CYCLE_RE.search(stdout)
-                        if match:
-                            trial_cycles.append(int(match.group(1)))
-                        else:
-                            print(f"\t\tTrial {t}: No clock cycles found")
-                    except subprocess.TimeoutExpired:
-                        print(f"\t\tTrial {t}: Timed out")
-                    except Exception as e:
-                        print(f"\t\tTrial {t}: Error {e}")
-                    finally:
+                        row.update({"status": STATUS_OK, "clock_cycles": cycles})
+                        row.update(_usage_columns(usage, cycles))
+                        _append_row(trials_path, trial_fieldnames, row)
+                except subprocess.TimeoutExpired:
+                    # the whole batch is lost, so every trial in it is censored
+                    for t, row in zip(batch, rows):
+                        print(f"\t\tTrial {t + 1}: Timed out after {time_limit:.1f}s")
+                        trial_cycles[(config_key, t + 1, t)] = None
+                        row["status"] = STATUS_TIMEOUT
+                        _append_row(trials_path, trial_fieldnames, row)
+                except Exception as e:
+                    print(
+                        f"\t\tTrial(s) {', '.join(str(t + 1) for t in batch)}: Error {e}"
+                    )
+                finally:
+                    for input_path in input_paths:
                         input_path.unlink(missing_ok=True)
-            if trial_cycles:
-                avg_cycles = statistics.mean(trial_cycles)
-                std_cycles = (
-                    statistics.stdev(trial_cycles) if len(trial_cycles) > 1 else 0
-                )
+
+            # summarise every trial recorded for this config (including resumed ones):
+            config_trials = [
+                c for (k, _, _), c in trial_cycles.items() if k == config_key
+            ]
+            cycles = [c for c in config_trials if c is not None]
+            if cycles:
+                avg_cycles = statistics.mean(cycles)
+                std_cycles = statistics.stdev(cycles) if len(cycles) > 1 else 0
 
                 record = config.copy()
                 record["mean_cycles"] = avg_cycles
                 record["stdev_cycles"] = std_cycles
+                record["censored"] = len(config_trials) - len(cycles)
                 results.append(record)
+            elif config_trials:
+                print(f"\t\tSkipping {config_str}: every trial timed out.")
             else:
                 print(f"\t\tSkipping {config_str} due to failures.")
 
@@ -258,6 +1015,7 @@ def benchmark_sweep(
         print("NO results collected")
         return {}
 
+    print(f"Saved trials CSV to {trials_path}")
     csv_path = out_dir / f"{day_dirname}_benchmark_{timestamp}.csv"
     keys = list(results[0].keys())
 
@@ -268,7 +1026,10 @@ def benchmark_sweep(
     print(f"Saved CSV to {csv_path}")
 
     # visualise:
-    visualise_results(results, param_names, day_name, out_dir, day_dirname, timestamp)
+    if plot:
+        visualise_results(
+            results, param_names, day_name, out_dir, day_dirname, timestamp
+        )
     return results
 
 
@@ -280,6 +1041,7 @@ def visualise_results(
     file_prefix: str,
     timestamp: str,
 ):
+    plt = _pyplot()
     if len(param_names) == 1:
         # 1D Plot (just line plot)
         p1 = param_names[0]
@@ -294,6 +1056,8 @@ def visualise_results(
         plt.errorbar(
             x_vals, y_vals, yerr=y_errs, fmt="o-", capsize=5, linewidth=2, markersize=6
         )
+        if _mark_censored(results, p1):
+            plt.legend(loc="best")
         plt.xlabel(p1.replace("_", " ").title(), fontsize=12)
         plt.ylabel("Clock Cycles", fontsize=12)
         plt.title(f"{day_name}: Performance vs {p1}", fontsize=14)
@@ -326,10 +1090,29 @@ def visualise_results(
         )
 
 
+def _mark_censored(results: list[dict], x_param: str) -> bool:
+    # circle points where some trials timed out (their mean only includes the trials that finished)
+    partial = [r for r in results if r.get("censored")]
+    if not partial:
+        return False
+    plt = _pyplot()
+    plt.scatter(
+        [r[x_param] for r in partial],
+        [r["mean_cycles"] for r in partial],
+        s=120,
+        facecolors="none",
+        edgecolors="red",
+        label="Some trials timed out",
+        zorder=3,
+    )
+    return True
+
+
 def _plot_multiline_view(
     results: list[dict], x_param: str, line_param: str, day_name: str, out_path: Path
 ):
     # Helper function to generate a multiline plot.
+    plt = _pyplot()
     # Find unique values for the parameter that defines the separate lines
     unique_line_vals = sorted(list(set(r[line_param] for r in results)))
     plt.figure(figsize=(10, 6))
@@ -360,6 +1143,7 @@ def _plot_multiline_view(
             color=colors[i],
             alpha=0.8,
         )
+    _mark_censored(results, x_param)
 
     # Formatting
     plt.xlabel(x_param.replace("_", " ").title(), fontsize=12)
@@ -384,8 +1168,304 @@ def _plot_multiline_view(
     print(f"Saved 2D multiline view to {out_path}")
 
 
+def benchmark_variants(
+    day_dirname: str,
+    day_name: str,
+    input_generator_function: Callable[..., Any],
+    variants: dict[str, dict[str, Any]],
+    sizes: Sequence[int],
+    repeats: int = 3,
+    timeout: float = 60,
+    batch_size: int = 1,
+    plot: bool = True,
+    trial_fields: Sequence[str] = (),
+    trial_columns: Callable[[Path, dict[str, Any], str], dict[str, Any]] | None = None,
+) -> Path:
+    """Runs alternative implementations of the same day on identical inputs and compares them
+
+    Args:
+        day_dirname (str): Name of the day's directory, e.g. "day08".
+        day_name (str): Name of the day to include in the plot title.
+        input_generator_function (Callable[..., Any]): Function to generate the input files.
+        variants (dict[str, dict[str, Any]]): Variant name -> Makefile variables to build it with (e.g. its own
+            SRCS source list, or a parameter that selects a sub-module). The first variant is the baseline.
+        sizes (Sequence[int]): Input sizes to test.
+        repeats (int, optional): Number of inputs (seeds) per size. Defaults to 3.
+        timeout (float, optional): Number of seconds allowed per input. Defaults to 60.
+        batch_size (int, optional): Number of inputs to solve in each simulation. Defaults to 1.
+        plot (bool, optional): Save a plot of the clock cycles and speedups. Defaults to True.
+        trial_fields (Sequence[str], optional): Names of the extra columns returned by trial_columns. Defaults to ().
+        trial_columns (Callable[[Path, dict[str, Any], str], dict[str, Any]] | None, optional): Called with the
+            input file, the variant's Makefile variables and the simulation's output after each input is solved,
+            and returns extra columns for its row (e.g. a model's predictions). Defaults to None.
+
+    Each input file is generated once and solved by every variant, so the variants only differ in the
+    design. Every simulation is written to a `<day>_variants_<timestamp>.csv` trials file. Wrong answers are
+    recorded (status "mismatch", or the testbench's status if it reported a problem) rather than stopping the
+    comparison, since older variants are not always correct, and their clock cycles are still compared (wrong
+    variants are labelled as such on the plot, and the number of inputs each variant got wrong is printed).
+    The size of each input is recorded with the bytes of input consumed per clock cycle (over the whole
+    solve), which is the ingest rate the input interface needs to sustain.
+
+    Returns:
+        Path: The side-by-side csv file, with one row per input: the clock cycles and status of each variant,
+            the speedup of each variant over the baseline (baseline cycles / variant cycles), and each variant's
+            trial_fields
+    """
+    if not variants:
+        raise ValueError("at least one variant must be given.")
+    root = Path(__file__).resolve().parent
+    day_dir = (root / f"../{day_dirname}").resolve()
+    if not day_dir.exists():
+        raise RuntimeError(f"{day_dirname} directory was not found at {day_dir}")
+
+    out_dir = root / "benchmarks"
+    out_dir.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    trials_path = out_dir / f"{day_dirname}_variants_{timestamp}.csv"
+    fieldnames = [
+        "variant",
+        "input_size",
+        "trial",
+        "seed",
+        "status",
+        "clock_cycles",
+        "input_bytes",
+        "bytes_per_cycle",
+        *RESOURCE_FIELDS,
+        "batch_size",
+        "time_limit",
+        *_size_fieldnames(day_dirname),
+        *trial_fields,
+    ]
+
+    names = list(variants)
+    baseline = names[0]
+    # clock cycles and status of each variant on each input, keyed by (size, seed)
+    cycles: dict[tuple[int, int], dict[str, int]] = {}
+    statuses: dict[tuple[int, int], dict[str, str]] = {}
+    extras: dict[tuple[int, int], dict[str, dict[str, Any]]] = {}
+    input_bytes: dict[tuple[int, int], int] = {}
+
+    original_cwd = Path.cwd()
+    try:
+        os.chdir(day_dir)
+        for size in sizes:
+            seeds = list(range(repeats))
+            for i in range(0, len(seeds), batch_size):
+                batch = seeds[i : i + batch_size]
+                input_paths = []
+                for _ in batch:
+                    with tempfile.NamedTemporaryFile(
+                        mode="w", suffix=".txt", delete=False
+                    ) as tmp:
+                        input_paths.append(Path(tmp.name))
+                try:
+                    expected_results = [
+                        input_generator_function(
+                            n=size, output_filename=str(input_path), seed=seed
+                        )
+                        for input_path, seed in zip(input_paths, batch)
+                    ]
+                    for seed, input_path in zip(batch, input_paths):
+                        input_bytes[(size, seed)] = input_path.stat().st_size
+
+                    for name, variant_vars in variants.items():
+                        # the rom / core sizes each variant needs for these inputs:
+                        size_vars = _size_parameters(
+                            day_dirname, input_paths, variant_vars
+                        )
+                        print(
+                            f"\t{day_name}: size = {size}, seed(s) {', '.join(map(str, batch))}, variant {name}"
+                        )
+                        rows = [
+                            {
+                                "variant": name,
+                                "input_size": size,
+                                "trial": seed + 1,
+                                "seed": seed,
+                                "input_bytes": input_bytes[(size, seed)],
+                                "batch_size": len(batch),
+                                "time_limit": timeout,
+                                **size_vars,
+                            }
+                            for seed in batch
+                        ]
+                        try:
+                            outputs, usage = _run_simulation(
+                                day_dirname,
+                                input_paths,
+                                timeout,
+                                make_vars={**size_vars, **variant_vars},
+                            )
+                        except subprocess.TimeoutExpired:
+                            print(f"\t\ttimed out after {timeout}s per input")
+                            for seed, row in zip(batch, rows):
+                                row["status"] = STATUS_TIMEOUT
+                                statuses.setdefault((size, seed), {})[
+                                    name
+                                ] = STATUS_TIMEOUT
+                                _append_row(trials_path, fieldnames, row)
+                            continue
+
+                        for seed, input_path, expected, stdout, row in zip(
+                            batch, input_paths, expected_results, outputs, rows
+                        ):
+                            try:
+                                result = _parse_result(stdout)
+                            except RuntimeError:
+                                print(f"\t\tseed {seed}: no RESULT line found")
+                                row["status"] = STATUS_ERROR
+                                statuses.setdefault((size, seed), {})[
+                                    name
+                                ] = STATUS_ERROR
+                                _append_row(trials_path, fieldnames, row)
+                                continue
+                            if _check_result(result, expected):
+                                row["status"] = STATUS_OK
+                            else:
+                                print(
+                                    f"\t\tseed {seed}: wrong answer (status {result['status']}), expected {expected}, got ({result['part1']}, {result['part2']})"
+                                )
+                                # keep the testbench's reason if it gave one:
+                                row["status"] = (
+                                    STATUS_MISMATCH
+                                    if result["status"] == STATUS_OK
+                                    else result["status"]
+                                )
+                            row["clock_cycles"] = result["cycles"]
+                            row["bytes_per_cycle"] = round(
+                                row["input_bytes"] / max(result["cycles"], 1), 4
+                            )
+                            row.update(_usage_columns(usage, result["cycles"]))
+                            if trial_columns is not None:
+                                extra = trial_columns(
+                                    input_path, {**size_vars, **variant_vars}, stdout
+                                )
+                                row.update(extra)
+                                extras.setdefault((size, seed), {})[name] = extra
+                            cycles.setdefault((size, seed), {})[name] = result["cycles"]
+                            statuses.setdefault((size, seed), {})[name] = row["status"]
+                            _append_row(trials_path, fieldnames, row)
+                finally:
+                    for input_path in input_paths:
+                        input_path.unlink(missing_ok=True)
+    finally:
+        os.chdir(original_cwd)
+
+    # side-by-side table:
+    comparison_path = out_dir / f"{day_dirname}_comparison_{timestamp}.csv"
+    comparison_fields = ["input_size", "trial", "seed", "input_bytes"]
+    comparison_fields += [f"{name}_cycles" for name in names]
+    comparison_fields += [f"{name}_status" for name in names]
+    comparison_fields += [f"{name}_speedup" for name in names[1:]]
+    comparison_fields += [f"{name}_bytes_per_cycle" for name in names]
+    comparison_fields += [f"{name}_{field}" for field in trial_fields for name in names]
+    with open(comparison_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=comparison_fields)
+        writer.writeheader()
+        for (size, seed), status in sorted(statuses.items()):
+            by_variant = cycles.get((size, seed), {})
+            row = {
+                "input_size": size,
+                "trial": seed + 1,
+                "seed": seed,
+                "input_bytes": input_bytes[(size, seed)],
+            }
+            for name in names:
+                row[f"{name}_cycles"] = by_variant.get(name, "")
+                row[f"{name}_status"] = status.get(name, "")
+                if name in by_variant:
+                    row[f"{name}_bytes_per_cycle"] = round(
+                        input_bytes[(size, seed)] / max(by_variant[name], 1), 4
+                    )
+                for field in trial_fields:
+                    value = extras.get((size, seed), {}).get(name, {}).get(field)
+                    if value is not None:
+                        row[f"{name}_{field}"] = value
+            for name in names[1:]:
+                if baseline in by_variant and name in by_variant:
+                    row[f"{name}_speedup"] = round(
+                        by_variant[baseline] / by_variant[name], 3
+                    )
+            writer.writerow(row)
+    print(f"Saved trials to {trials_path}")
+    print(f"Saved comparison to {comparison_path}")
+    for name in names:
+        solved = [status[name] for status in statuses.values() if name in status]
+        wrong = sum(1 for status in solved if status != STATUS_OK)
+        print(f"\t{name}: {wrong} / {len(solved)} inputs not solved correctly")
+
+    if plot:
+        plt = _pyplot()
+        fig, (ax_cycles, ax_speedup) = plt.subplots(1, 2, figsize=(13, 5))
+        plot_sizes = sorted(set(size for size, _ in cycles))
+        for name in names:
+            xs, means, stdevs = [], [], []
+            for size in plot_sizes:
+                vs = [
+                    c[name] for (s, _), c in cycles.items() if s == size and name in c
+                ]
+                if vs:
+                    xs.append(size)
+                    means.append(statistics.mean(vs))
+                    stdevs.append(statistics.stdev(vs) if len(vs) > 1 else 0)
+            wrong = any(
+                st.get(name) in (STATUS_MISMATCH, STATUS_OVERFLOW, STATUS_INCOMPLETE)
+                for st in statuses.values()
+            )
+            label = f"{name} (wrong answers)" if wrong else name
+            line = ax_cycles.errorbar(
+                xs, means, yerr=stdevs, fmt="o-", capsize=4, label=label
+            )
+
+            if name == baseline:
+                continue
+            xs, speedups = [], []
+            for size in plot_sizes:
+                vs = [
+                    c[baseline] / c[name]
+                    for (s, _), c in cycles.items()
+                    if s == size and baseline in c and name in c
+                ]
+                if vs:
+                    xs.append(size)
+                    speedups.append(statistics.mean(vs))
+            # same colour as the variant's cycles:
+            ax_speedup.plot(xs, speedups, "o-", label=label, color=line[0].get_color())
+
+        ax_cycles.set_title(f"{day_name}: clock cycles of each variant")
+        ax_cycles.set_xlabel("Input size")
+        ax_cycles.set_ylabel("Clock cycles")
+        ax_cycles.legend()
+        ax_cycles.grid(True, alpha=0.3)
+        ax_speedup.axhline(1, color="grey", linestyle="--")
+        ax_speedup.set_title(f"Speedup over {baseline}")
+        ax_speedup.set_xlabel("Input size")
+        ax_speedup.set_ylabel("Speedup (x)")
+        ax_speedup.legend()
+        ax_speedup.grid(True, alpha=0.3)
+        fig.tight_layout()
+        plot_path = comparison_path.with_suffix(".png")
+        fig.savefig(plot_path, dpi=150)
+        plt.close(fig)
+        print(f"Saved plot to {plot_path}")
+
+    return comparison_path
+
+
 def benchmark_day01(
-    lo: int = 10, hi: int = 1000, n: int = 10, repeats: int = 5, timeout: int = 5
+    lo: int = 10,
+    hi: int = 1000,
+    n: int = 10,
+    repeats: int = 5,
+    timeout: int = 5,
+    resume: str | None = None,
+    batch_size: int = 1,
+    sizes: Sequence[int] | None = None,
+    plot: bool = True,
+    ci_target: float | None = None,
+    max_repeats: int = 30,
 ) -> dict:
     return general_benchmark(
         lo,
@@ -397,11 +1477,27 @@ def benchmark_day01(
         input_generator_function=gen_day01,
         input_desc="number of rotations in input file",
         day_name="Day 1",
+        resume=resume,
+        batch_size=batch_size,
+        sizes=sizes,
+        plot=plot,
+        ci_target=ci_target,
+        max_repeats=max_repeats,
     )
 
 
 def benchmark_day02(
-    lo: int = 10, hi: int = 1000, n: int = 10, repeats: int = 5, timeout: int = 5
+    lo: int = 10,
+    hi: int = 1000,
+    n: int = 10,
+    repeats: int = 5,
+    timeout: int = 5,
+    resume: str | None = None,
+    batch_size: int = 1,
+    sizes: Sequence[int] | None = None,
+    plot: bool = True,
+    ci_target: float | None = None,
+    max_repeats: int = 30,
 ) -> dict:
     return general_benchmark(
         lo,
@@ -413,11 +1509,27 @@ def benchmark_day02(
         input_generator_function=gen_day02,
         input_desc="number of ranges in input file",
         day_name="Day 2",
+        resume=resume,
+        batch_size=batch_size,
+        sizes=sizes,
+        plot=plot,
+        ci_target=ci_target,
+        max_repeats=max_repeats,
     )
 
 
 def benchmark_day03(
-    lo: int = 10, hi: int = 1000, n: int = 10, repeats: int = 5, timeout: int = 20
+    lo: int = 10,
+    hi: int = 1000,
+    n: int = 10,
+    repeats: int = 5,
+    timeout: int = 20,
+    resume: str | None = None,
+    batch_size: int = 1,
+    sizes: Sequence[int] | None = None,
+    plot: bool = True,
+    ci_target: float | None = None,
+    max_repeats: int = 30,
 ) -> dict:
     return general_benchmark(
         lo,
@@ -429,11 +1541,55 @@ def benchmark_day03(
         input_generator_function=gen_day03,
         input_desc="number of banks",
         day_name="Day 3",
+        resume=resume,
+        batch_size=batch_size,
+        sizes=sizes,
+        plot=plot,
+        ci_target=ci_target,
+        max_repeats=max_repeats,
+    )
+
+
+def benchmark_day03_long(
+    lengths: Sequence[int] = (100, 256, 512, 1024, 2048),
+    banks: int = 50,
+    repeats: int = 3,
+    timeout: int = 60,
+    resume: str | None = None,
+    batch_size: int = 1,
+    plot: bool = True,
+) -> dict:
+    # banks longer than the default MAX_LINE_LEN = 128. the core is rebuilt for each length with
+    # MAX_LINE_LEN rounded up to a power of 2, and the number of banks is kept small to fit in the rom
+    return benchmark_sweep(
+        day_dirname="day03",
+        day_name="Day 3 (long banks)",
+        input_generator_function=gen_day03_bulk,
+        param_grid={"bank_length": list(lengths)},
+        arg_adapter=lambda p: (banks, p["bank_length"], p["bank_length"]),
+        repeats=repeats,
+        timeout=timeout,
+        resume=resume,
+        batch_size=batch_size,
+        plot=plot,
+        make_adapter=lambda p: {
+            "MAX_LINE_LEN": 1 << max(p["bank_length"] - 1, 1).bit_length()
+        },
     )
 
 
 def benchmark_day04(
-    lo: int = 10, hi: int = 1000, n: int = 10, repeats: int = 5, timeout: int = 20
+    lo: int = 10,
+    hi: int = 1000,
+    n: int = 10,
+    repeats: int = 5,
+    timeout: int = 20,
+    resume: str | None = None,
+    batch_size: int = 1,
+    sizes: Sequence[int] | None = None,
+    plot: bool = True,
+    ci_target: float | None = None,
+    max_repeats: int = 30,
 ) -> dict:
     return general_benchmark(
         lo,
@@ -445,7 +1601,71 @@ def benchmark_day04(
         input_generator_function=gen_day04,
         input_desc="dimension of grid",
         day_name="Day 4",
+        resume=resume,
+        batch_size=batch_size,
+        sizes=sizes,
+        plot=plot,
+        ci_target=ci_target,
+        max_repeats=max_repeats,
+    )
+
+
+def _day04_model_columns(
+    input_path: Path, make_vars: dict[str, Any], output: str
+) -> dict[str, Any]:
+    # day04_rounds' predictions for the banked core next to its measured clock cycles (the single-port core,
+    # built from its own SRCS, is not modelled). the round cycles are the clock cycles after the grid is
+    # loaded (a cycle per character, and 4 more), which is the part dirty row tracking speeds up
+    if "SRCS" in make_vars:
+        return {}
+    text = input_path.read_text(encoding="utf-8")
+    model = day04_rounds(
+        text,
+        track_dirty_rows=bool(make_vars.get("TRACK_DIRTY_ROWS", 1)),
+        max_rows=make_vars["MAX_ROWS"],
     )
+    return {
+        "rounds": model["rounds"],
+        "rows_scanned": model["rows_scanned"],
+        "model_cycles": model["cycles"],
+        "round_cycles": _parse_result(output)["cycles"] - len(text) - 4,
+    }
+
+
+def benchmark_day04_dirty_rows(
+    sizes: Sequence[int] = (50, 100, 150, 200, 250),
+    densities: Sequence[int] = (30, 50, 70),
+    repeats: int = 3,
+    timeout: int = 60,
+    batch_size: int = 1,
+    plot: bool = True,
+) -> list[Path]:
+    # the banked core's removal rounds rescanning the whole grid or only the rows next to the last round's
+    # removals (COMPARISONS[4] without the single-port core), at each density of rolls (percentage of cells)
+    # up to the core's default 250x250 grid. returns a comparison csv file per density
+    comparison = COMPARISONS[4]
+    variants = {
+        name: comparison["variants"][name]
+        for name in ("banked_full_rescan", "banked_dirty_rows")
+    }
+    return [
+        benchmark_variants(
+            day_dirname="day04",
+            day_name=f"Day 4 (density {density}%)",
+            input_generator_function=lambda n, output_filename, seed, density=density: gen_day04_density(
+                (n, density), output_filename, seed
+            ),
+            variants=variants,
+            sizes=sizes,
+            repeats=repeats,
+            timeout=timeout,
+            batch_size=batch_size,
+            plot=plot,
+            trial_fields=comparison["trial_fields"],
+            trial_columns=comparison["trial_columns"],
+        )
+        for density in densities
+    ]
 
 
 def benchmark_day05(
@@ -457,6 +1677,9 @@ def benchmark_day05(
     num_queries_count: int = 5,
     repeats: int = 5,
     timeout: int = 5,
+    resume: str | None = None,
+    batch_size: int = 1,
+    plot: bool = True,
 ) -> dict:
     range_sizes = np.linspace(
         num_ranges_lo, num_ranges_hi, num_ranges_count, dtype=int
@@ -473,11 +1696,50 @@ def benchmark_day05(
         arg_adapter=lambda p: (p["num_ranges"], p["num_queries"]),
         repeats=repeats,
         timeout=timeout,
+        resume=resume,
+        batch_size=batch_size,
+        plot=plot,
+    )
+
+
+def benchmark_day05_queries(
+    num_queries: Sequence[int] = (1000, 10_000, 100_000, 1_000_000),
+    num_ranges: int = 100,
+    repeats: int = 3,
+    timeout: int = 600,
+    resume: str | None = None,
+    batch_size: int = 1,
+    plot: bool = True,
+) -> dict:
+    # query throughput: a fixed set of ranges with up to a million ids to look up. the search pipeline
+    # can take a new id every clock cycle, so each id only costs the clock cycles to parse its characters
+    # (on top of the fixed cost of sorting and merging the ranges)
+    return benchmark_sweep(
+        day_dirname="day05",
+        day_name="Day 5 (queries)",
+        input_generator_function=gen_day05,
+        param_grid={"num_queries": list(num_queries)},
+        arg_adapter=lambda p: (num_ranges, p["num_queries"]),
+        repeats=repeats,
+        timeout=timeout,
+        resume=resume,
+        batch_size=batch_size,
+        plot=plot,
     )
 
 
 def benchmark_day06(
-    lo: int = 10, hi: int = 1000, n: int = 10, repeats: int = 5, timeout: int = 20
+    lo: int = 10,
+    hi: int = 1000,
+    n: int = 10,
+    repeats: int = 5,
+    timeout: int = 20,
+    resume: str | None = None,
+    batch_size: int = 1,
+    sizes: Sequence[int] | None = None,
+    plot: bool = True,
+    ci_target: float | None = None,
+    max_repeats: int = 30,
 ) -> dict:
     return general_benchmark(
         lo,
@@ -489,11 +1751,27 @@ def benchmark_day06(
         input_generator_function=gen_day06,
         input_desc="Number of math problems to solve",
         day_name="Day 6",
+        resume=resume,
+        batch_size=batch_size,
+        sizes=sizes,
+        plot=plot,
+        ci_target=ci_target,
+        max_repeats=max_repeats,
     )
 
 
 def benchmark_day07(
-    lo: int = 10, hi: int = 250, n: int = 10, repeats: int = 5, timeout: int = 20
+    lo: int = 10,
+    hi: int = 250,
+    n: int = 10,
+    repeats: int = 5,
+    timeout: int = 20,
+    resume: str | None = None,
+    batch_size: int = 1,
+    sizes: Sequence[int] | None = None,
+    plot: bool = True,
+    ci_target: float | None = None,
+    max_repeats: int = 30,
 ) -> dict:
     return general_benchmark(
         lo,
@@ -505,11 +1783,57 @@ def benchmark_day07(
         input_generator_function=gen_day07,
         input_desc="Dimension of grid",
         day_name="Day 7",
+        resume=resume,
+        batch_size=batch_size,
+        sizes=sizes,
+        plot=plot,
+        ci_target=ci_target,
+        max_repeats=max_repeats,
+    )
+
+
+def benchmark_day07_wide(
+    widths: Sequence[int] = (256, 512, 1024, 2048, 4096),
+    height: int = 24,
+    repeats: int = 3,
+    timeout: int = 60,
+    resume: str | None = None,
+    batch_size: int = 1,
+    plot: bool = True,
+) -> dict:
+    # grids wider than the default MAX_WIDTH = 256. the core is rebuilt for each width with MAX_WIDTH
+    # rounded up to a power of 2 (and ADDR_BITS to match), the grids are kept short so they fit in the rom
+    def make_vars(p: dict[str, int]) -> dict[str, int]:
+        width_bits = max(p["width"] - 1, 1).bit_length()
+        return {"MAX_WIDTH": 1 << width_bits, "ADDR_BITS": width_bits + 1}
+
+    return benchmark_sweep(
+        day_dirname="day07",
+        day_name="Day 7 (wide grids)",
+        input_generator_function=gen_day07_grid,
+        param_grid={"width": list(widths)},
+        arg_adapter=lambda p: (p["width"], height),
+        repeats=repeats,
+        timeout=timeout,
+        resume=resume,
+        batch_size=batch_size,
+        plot=plot,
+        make_adapter=make_vars,
     )
 
 
 def benchmark_day08(
-    lo: int = 700, hi: int = 1000, n: int = 3, repeats: int = 3, timeout: int = 60
+    lo: int = 700,
+    hi: int = 1000,
+    n: int = 3,
+    repeats: int = 3,
+    timeout: int = 60,
+    resume: str | None = None,
+    batch_size: int = 1,
+    sizes: Sequence[int] | None = None,
+    plot: bool = True,
+    ci_target: float | None = None,
+    max_repeats: int = 30,
 ) -> dict:
     return general_benchmark(
         lo,
@@ -521,11 +1845,37 @@ def benchmark_day08(
         input_generator_function=gen_day08,
         input_desc="Number of junction boxes",
         day_name="Day 8",
+        resume=resume,
+        batch_size=batch_size,
+        sizes=sizes,
+        plot=plot,
+        ci_target=ci_target,
+        max_repeats=max_repeats,
     )
 
 
+def _day08_edge_columns(
+    input_path: Path, make_vars: dict[str, Any], output: str
+) -> dict[str, Any]:
+    # edges written to edge ram by the edge generator (64 bits each)
+    edges = re.search(r"Edge generation done \((\d+) edges\)", output)
+    if edges is None:
+        return {}
+    return {"edges": int(edges.group(1)), "edge_bits": 64 * int(edges.group(1))}
+
+
 def benchmark_day09(
-    lo: int = 20, hi: int = 500, n: int = 10, repeats: int = 5, timeout: int = 60
+    lo: int = 20,
+    hi: int = 500,
+    n: int = 10,
+    repeats: int = 5,
+    timeout: int = 60,
+    resume: str | None = None,
+    batch_size: int = 1,
+    sizes: Sequence[int] | None = None,
+    plot: bool = True,
+    ci_target: float | None = None,
+    max_repeats: int = 30,
 ) -> dict:
     return general_benchmark(
         lo,
@@ -537,11 +1887,96 @@ def benchmark_day09(
         input_generator_function=gen_day09,
         input_desc="Number of vertices",
         day_name="Day 9",
+        resume=resume,
+        batch_size=batch_size,
+        sizes=sizes,
+        plot=plot,
+        ci_target=ci_target,
+        max_repeats=max_repeats,
+    )
+
+
+# models.day09_candidate_checks' columns, and the percentage of the index order's segment checks that the
+# bucketed order avoids:
+DAY09_MODEL_FIELDS = (
+    "candidates",
+    "index_order_sent",
+    "index_order_checks",
+    "area_order_sent",
+    "area_order_checks",
+    "bucketed_passes",
+    "bucketed_sent",
+    "bucketed_checks",
+    "checks_avoided_percent",
+)
+
+
+@functools.lru_cache(maxsize=16)
+def _day09_model(text: str, log_max_points: int) -> dict[str, int]:
+    # the model only depends on the input, so it is worked out once for all the variants that solve it
+    return day09_candidate_checks(text, log_max_points=log_max_points)
+
+
+def _day09_model_columns(
+    input_path: Path, make_vars: dict[str, Any], output: str
+) -> dict[str, Any]:
+    # models.day09_candidate_checks' rectangles sent through the segment pipeline and segment checks in
+    # index order, ideal area order and the core's bucketed area order, and the checks the bucketed order avoids
+    model = _day09_model(
+        input_path.read_text(encoding="utf-8"), make_vars["LOG_MAX_POINTS"]
+    )
+    columns = {field: model[field] for field in DAY09_MODEL_FIELDS if field in model}
+    columns["checks_avoided_percent"] = round(
+        100
+        * (model["index_order_checks"] - model["bucketed_checks"])
+        / max(model["index_order_checks"], 1),
+        1,
+    )
+    return columns
+
+
+def benchmark_day09_area_order(
+    sizes: Sequence[int] = (500, 1000),
+    repeats: int = 3,
+    timeout: int = 600,
+    batch_size: int = 1,
+    plot: bool = True,
+) -> Path:
+    # the part 2 candidates sent in index order or in passes from the largest areas down (COMPARISONS[9]
+    # without the old unsynthesisable core, which takes far longer at these sizes), with the model's counts.
+    # every pass over the pairs takes a clock cycle per pair, so for larger inputs run
+    # models.day09_candidate_checks on its own (see the README)
+    comparison = COMPARISONS[9]
+    variants = {
+        name: comparison["variants"][name] for name in ("index_order", "area_order")
+    }
+    return benchmark_variants(
+        day_dirname="day09",
+        day_name="Day 9 (area order)",
+        input_generator_function=gen_day09,
+        variants=variants,
+        sizes=sizes,
+        repeats=repeats,
+        timeout=timeout,
+        batch_size=batch_size,
+        plot=plot,
+        trial_fields=comparison["trial_fields"],
+        trial_columns=comparison["trial_columns"],
     )
 
 
 def benchmark_day11(
-    lo: int = 10, hi: int = 250, n: int = 10, repeats: int = 5, timeout: int = 20
+    lo: int = 10,
+    hi: int = 250,
+    n: int = 10,
+    repeats: int = 5,
+    timeout: int = 20,
+    resume: str | None = None,
+    batch_size: int = 1,
+    sizes: Sequence[int] | None = None,
+    plot: bool = True,
+    ci_target: float | None = None,
+    max_repeats: int = 30,
 ) -> dict:
     return general_benchmark(
         lo,
@@ -553,30 +1988,622 @@ def benchmark_day11(
         input_generator_function=gen_day11,
         input_desc="Number of cables",
         day_name="Day 11",
+        resume=resume,
+        batch_size=batch_size,
+        sizes=sizes,
+        plot=plot,
+        ci_target=ci_target,
+        max_repeats=max_repeats,
+    )
+
+
+# default configuration of each day's benchmark (as used for the plots in the README)
+BENCHMARKS: dict[int, tuple[Callable[..., dict], dict[str, Any]]] = {
+    1: (benchmark_day01, dict(lo=10, hi=1000, n=5, repeats=5, batch_size=5)),
+    2: (benchmark_day02, dict(lo=10, hi=100, n=5, repeats=5)),
+    3: (benchmark_day03, dict(lo=10, hi=1000, n=5, repeats=5)),
+    4: (benchmark_day04, dict(lo=10, hi=140, n=5, repeats=5, timeout=30)),
+    5: (
+        benchmark_day05,
+        dict(
+            num_ranges_lo=10,
+            num_ranges_hi=200,
+            num_ranges_count=5,
+            num_queries_lo=100,
+            num_queries_hi=1000,
+            num_queries_count=5,
+            repeats=5,
+            timeout=5,
+        ),
+    ),
+    6: (benchmark_day06, dict(lo=10, hi=1000, n=5, repeats=5, timeout=5)),
+    7: (benchmark_day07, dict(lo=10, hi=250, n=5, repeats=5, timeout=5)),
+    8: (benchmark_day08, dict(lo=700, hi=1000, n=3, repeats=3, timeout=60)),
+    9: (benchmark_day09, dict(lo=20, hi=500, n=10, repeats=5, timeout=60)),
+    11: (benchmark_day11, dict(lo=20, hi=750, n=5, repeats=5, timeout=20)),
+}
+
+
+# alternative implementations kept in the tree, compared on identical inputs by `benchmark_variants`
+# (--compare). each variant is the Makefile variables that build it, and the first (older) one is the baseline
+COMPARISONS: dict[int, dict[str, Any]] = {
+    # characters read from the rom per cycle (wide rom word), the byte-wide rom is the baseline:
+    1: dict(
+        input_generator_function=gen_day01,
+        sizes=(100, 1000, 4000),
+        timeout=60,
+        variants={
+            f"word{w}": ({"ROM_WORD_BYTES": w} if w > 1 else {}) for w in (1, 2, 4, 8)
+        },
+    ),
+    # range_summer lanes that sub-ranges are sent to, a single lane (the next range parsed while it sums) is the baseline:
+    2: dict(
+        input_generator_function=gen_day02,
+        sizes=(10, 100, 1000),
+        timeout=60,
+        variants={
+            f"lanes{n}": ({"NUM_LANES": n} if n > 1 else {}) for n in (1, 2, 4, 8)
+        },
+    ),
+    3: dict(
+        input_generator_function=gen_day03,
+        sizes=(10, 100, 1000),
+        timeout=60,
+        variants={
+            f"word{w}": ({"ROM_WORD_BYTES": w} if w > 1 else {})
+            for w in (1, 2, 4, 8, 16)
+        },
+    ),
+    # the grid rows / beam columns read from a single-port ram one at a time, or from a banked ram
+    # (utils/ram.v ram_banked) that reads a row / column and both its neighbours in the same cycle.
+    # day 4 also with every removal round rescanning the whole grid, or only the rows next to the last round's removals:
+    4: dict(
+        input_generator_function=gen_day04,
+        sizes=(20, 70, 140),
+        timeout=60,
+        variants={
+            "single_port": {
+                "SRCS": "day04_tb.v day04_core_single_port.v ../utils/rom.v ../utils/stream_window.v ../utils/ram.v row_logic.v"
+            },
+            "banked_full_rescan": {"TRACK_DIRTY_ROWS": 0},
+            "banked_dirty_rows": {},
+        },
+        # models.day04_rounds' rows scanned and clock cycles for the banked variants:
+        trial_fields=("rounds", "rows_scanned", "model_cycles", "round_cycles"),
+        trial_columns=_day04_model_columns,
+    ),
+    # each id searched for one at a time by a binary search over the merged ranges, or issued into the
+    # search pipeline as soon as it is parsed (100 ranges, with the given number of ids):
+    5: dict(
+        input_generator_function=lambda n, output_filename, seed: gen_day05(
+            (100, n), output_filename, seed
+        ),
+        sizes=(1000, 10_000, 100_000),
+        timeout=300,
+        variants={
+            "sequential_search": {
+                "SRCS": "day05_tb.v day05_core_sequential_search.v ../utils/rom.v ../utils/stream_window.v ../utils/ram.v"
+            },
+            "search_pipeline": {},
+        },
+    ),
+    # (the counts overflow the core's 64 bits for wider grids)
+    7: dict(
+        input_generator_function=gen_day07,
+        sizes=(20, 70, 140),
+        timeout=60,
+        variants={
+            "single_port": {
+                "SRCS": "day07_tb.v day07_core_single_port.v ../utils/rom.v ../utils/stream_window.v ../utils/ram.v"
+            },
+            "banked": {},
+        },
+    ),
+    # the sparsity heuristic's edges sorted by the older bitonic sorter or by heap sort, or each node's 12 closest
+    # nodes (knn_edge_generator.v) sorted by heap sort, with the edges each writes to edge ram:
+    8: dict(
+        input_generator_function=gen_day08,
+        sizes=(200, 500, 1000),
+        timeout=300,
+        variants={
+            "bitonic_sort": {"USE_BITONIC_SORT": 1},
+            "heap_sort": {},
+            "knn": {"KNN_EDGES": 1},
+        },
+        trial_fields=("edges", "edge_bits"),
+        trial_columns=_day08_edge_columns,
+    ),
+    # the pipelined core sending the part 2 candidates in index order, or in passes from the largest areas down:
+    9: dict(
+        input_generator_function=gen_day09,
+        sizes=(20, 100, 250, 500),
+        timeout=120,
+        variants={
+            "old_unsynthesisable": {
+                "SRCS": "day09_tb.v day09_core_old_unsynthesisable.v ../utils/rom.v ../utils/stream_window.v ../utils/ram.v"
+            },
+            "index_order": {"AREA_ORDER": 0},
+            "area_order": {},
+        },
+        # models.day09_candidate_checks' part 2 candidates and segment checks in each order:
+        trial_fields=DAY09_MODEL_FIELDS,
+        trial_columns=_day09_model_columns,
+    ),
+    10: dict(
+        input_generator_function=gen_day10,
+        sizes=(5, 20, 50),
+        timeout=120,
+        variants={
+            "gf2_brute_force": {
+                "SRCS": "day10_tb.v day10_core.v ilp_solver.v gf2_solver_brute_force.v ../utils/rom.v ../utils/stream_window.v"
+            },
+            "gf2_elimination": {},
+        },
+    ),
+    # a separate search for each path count (4 or 5 of them), or a search that counts the paths to "out", "dac"
+    # and "fft" together and keeps its memo between the 4 start nodes:
+    11: dict(
+        input_generator_function=gen_day11,
+        sizes=(100, 300, 750),
+        timeout=120,
+        variants={
+            "sequential": {
+                "SRCS": "day11_tb.v day11_core_sequential.v ../utils/rom.v ../utils/stream_window.v ../utils/ram.v"
+            },
+            "multi_target": {},
+        },
+    ),
+}
+
+
+def compare_day(
+    day: int,
+    sizes: Sequence[int] | None = None,
+    repeats: int = 3,
+    batch_size: int = 1,
+    plot: bool = True,
+) -> Path:
+    # compare the variants of one day in COMPARISONS, returning the side-by-side csv file
+    kwargs = {**COMPARISONS[day], "repeats": repeats, "batch_size": batch_size}
+    if sizes is not None:
+        kwargs["sizes"] = list(sizes)
+    return benchmark_variants(
+        day_dirname=f"day{day:02d}", day_name=f"Day {day}", plot=plot, **kwargs
+    )
+
+
+# generator, sizes and timeout of the inputs for comparing the rom against streamed input (--stream)
+STREAM_TARGETS: dict[int, tuple[Callable[..., Any], Sequence[int], int]] = {
+    1: (gen_day01, (100, 1000, 4000), 30),
+    2: (gen_day02, (10, 50, 100), 30),
+    3: (gen_day03, (10, 100, 1000), 30),
+    4: (gen_day04, (20, 70, 140), 60),
+    # ranges, with 4x as many queries:
+    5: (
+        lambda n, output_filename, seed: gen_day05((n, 4 * n), output_filename, seed),
+        (20, 100, 200),
+        30,
+    ),
+    6: (gen_day06, (10, 100, 1000), 30),
+    7: (gen_day07, (20, 100, 250), 30),
+    8: (gen_day08, (200, 500, 1000), 300),
+    9: (gen_day09, (20, 100, 250), 120),
+    10: (gen_day10, (5, 20, 50), 120),
+    11: (gen_day11, (20, 100, 500), 60),
+}
+
+
+def stream_day(
+    day: int,
+    sizes: Sequence[int] | None = None,
+    repeats: int = 3,
+    batch_size: int = 1,
+    gap_percents: Sequence[int] = (50,),
+    plot: bool = True,
+) -> Path:
+    # solve the same inputs from the rom and streamed through utils/stream_window.v (`make run STREAM=1`),
+    # with a source that always has a byte ready and with sources that have none for gap_percents% of cycles
+    # (a bursty dma). the speedup is below 1 when the core waits for input, and bytes_per_cycle is the ingest
+    # rate sustained over the whole solve
+    input_generator_function, default_sizes, timeout = STREAM_TARGETS[day]
+    variants: dict[str, dict[str, Any]] = {"rom": {}, "stream": {"STREAM": 1}}
+    for gap in gap_percents:
+        variants[f"stream_gap{gap}"] = {"STREAM": 1, "STREAM_GAP_PERCENT": gap}
+    return benchmark_variants(
+        day_dirname=f"day{day:02d}",
+        day_name=f"Day {day} (streamed input)",
+        input_generator_function=input_generator_function,
+        variants=variants,
+        sizes=list(default_sizes if sizes is None else sizes),
+        repeats=repeats,
+        timeout=timeout,
+        batch_size=batch_size,
+        plot=plot,
     )
 
 
+# days whose cores have ram instances to monitor (--ram-traffic), using the inputs of STREAM_TARGETS
+RAM_TRAFFIC_DAYS = (4, 5, 6, 7, 8, 9, 11)
+
+
+def ram_traffic_day(
+    day: int,
+    sizes: Sequence[int] | None = None,
+    repeats: int = 3,
+    batch_size: int = 1,
+    plot: bool = True,
+) -> Path:
+    # solve generated inputs with every ram instance monitored (`make run RAM_MONITOR=1`), writing the reads,
+    # writes, hazards and idle cycles of each instance to a `<day>_ram_traffic_<timestamp>.csv` file with one
+    # row per input. `<instance>_util` is the fraction of the instance's port-cycles that were used, which
+    # shows which memories (and so which phases) the design is bound by
+    input_generator_function, default_sizes, timeout = STREAM_TARGETS[day]
+    day_dirname = f"day{day:02d}"
+    root = Path(__file__).resolve().parent
+    out_dir = root / "benchmarks"
+    out_dir.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    csv_path = out_dir / f"{day_dirname}_ram_traffic_{timestamp}.csv"
+
+    rows = []
+    instances: list[str] = []  # in the order first seen
+    original_cwd = Path.cwd()
+    try:
+        os.chdir(root / f"../{day_dirname}")
+        for size in default_sizes if sizes is None else sizes:
+            seeds = list(range(repeats))
+            for i in range(0, len(seeds), batch_size):
+                batch = seeds[i : i + batch_size]
+                print(
+                    f"\tDay {day}: size = {size}, seed(s) {', '.join(map(str, batch))}, ram traffic"
+                )
+                input_paths = []
+                for _ in batch:
+                    with tempfile.NamedTemporaryFile(
+                        mode="w", suffix=".txt", delete=False
+                    ) as tmp:
+                        input_paths.append(Path(tmp.name))
+                try:
+                    expected_results = [
+                        input_generator_function(
+                            n=size, output_filename=str(input_path), seed=seed
+                        )
+                        for input_path, seed in zip(input_paths, batch)
+                    ]
+                    size_vars = _size_parameters(day_dirname, input_paths)
+                    try:
+                        outputs, _ = _run_simulation(
+                            day_dirname,
+                            input_paths,
+                            timeout,
+                            make_vars={**size_vars, "RAM_MONITOR": 1},
+                        )
+                    except subprocess.TimeoutExpired:
+                        print(f"\t\ttimed out after {timeout}s per input")
+                        rows += [
+                            {
+                                "input_size": size,
+                                "trial": seed + 1,
+                                "seed": seed,
+                                "status": STATUS_TIMEOUT,
+                            }
+                            for seed in batch
+                        ]
+                        continue
+
+                    for seed, expected, stdout in zip(batch, expected_results, outputs):
+                        result = _parse_result(stdout)
+                        row = {
+                            "input_size": size,
+                            "trial": seed + 1,
+                            "seed": seed,
+                            "status": (
+                                STATUS_OK
+                                if _check_result(result, expected)
+                                else STATUS_MISMATCH
+                            ),
+                            "clock_cycles": result["cycles"],
+                        }
+                        for instance, counts in _parse_ram_monitor(stdout).items():
+                            if instance not in instances:
+                                instances.append(instance)
+                            for field in RAM_MONITOR_FIELDS:
+                                row[f"{instance}_{field}"] = counts[field]
+                            port_cycles = counts["ports"] * max(counts["cycles"], 1)
+                            row[f"{instance}_util"] = round(
+                                (counts["reads"] + counts["writes"]) / port_cycles, 4
+                            )
+                        rows.append(row)
+                finally:
+                    for input_path in input_paths:
+                        input_path.unlink(missing_ok=True)
+    finally:
+        os.chdir(original_cwd)
+
+    fieldnames = ["input_size", "trial", "seed", "status", "clock_cycles"]
+    for instance in instances:
+        fieldnames += [f"{instance}_{field}" for field in (*RAM_MONITOR_FIELDS, "util")]
+    with open(csv_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"Saved ram traffic to {csv_path}")
+
+    if plot and instances:
+        plt = _pyplot()
+        plt.figure(figsize=(8, 5))
+        plot_sizes = sorted(
+            set(row["input_size"] for row in rows if "clock_cycles" in row)
+        )
+        for instance in instances:
+            utils = [
+                statistics.mean(
+                    row[f"{instance}_util"]
+                    for row in rows
+                    if row["input_size"] == size and f"{instance}_util" in row
+                )
+                for size in plot_sizes
+            ]
+            plt.plot(plot_sizes, utils, "o-", label=instance)
+        plt.xlabel("Input size")
+        plt.ylabel("Port utilisation (accesses / port-cycles)")
+        plt.title(f"Day {day}: ram bandwidth utilisation")
+        plt.legend()
+        plt.grid(True, alpha=0.3)
+        plot_path = csv_path.with_suffix(".png")
+        plt.savefig(plot_path, dpi=150)
+        plt.close()
+        print(f"Saved plot to {plot_path}")
+
+    return csv_path
+
+
+def _run_day(day: int, overrides: dict[str, Any]) -> dict:
+    # run one day's benchmark (in a worker process when running days in parallel), returning a row
+    # of the summary index. the files written are found by looking for new files with the day's prefix
+    benchmark_fn, kwargs = BENCHMARKS[day]
+    kwargs = {**kwargs, **overrides}
+    out_dir = Path(__file__).resolve().parent / "benchmarks"
+    prefix = f"day{day:02d}_"
+    before = set(out_dir.glob(f"{prefix}*")) if out_dir.exists() else set()
+
+    start_time = time.perf_counter()
+    try:
+        benchmark_fn(**kwargs)
+        status = STATUS_OK
+    except Exception as e:
+        traceback.print_exc()
+        status = f"error: {e}".splitlines()[0]
+    elapsed = time.perf_counter() - start_time
+
+    after = set(out_dir.glob(f"{prefix}*")) if out_dir.exists() else set()
+    return {
+        "day": day,
+        "status": status,
+        "elapsed": round(elapsed, 1),
+        "files": ";".join(sorted(f.name for f in after - before)),
+    }
+
+
+def benchmark_days(
+    days: Sequence[int] | None = None,
+    jobs: int = 1,
+    sizes: Sequence[int] | None = None,
+    repeats: int | None = None,
+    batch_size: int | None = None,
+    plot: bool = True,
+    ci_target: float | None = None,
+    max_repeats: int | None = None,
+) -> Path:
+    """Runs the benchmarks of several days, optionally in parallel, and writes a summary index
+
+    Args:
+        days (Sequence[int] | None, optional): Days to benchmark. Defaults to None (every day in BENCHMARKS).
+        jobs (int, optional): Number of days to benchmark at once. Defaults to 1.
+        sizes (Sequence[int] | None, optional): Input sizes to test, instead of each day's default range.
+            Ignored by day 5, which sweeps two parameters. Defaults to None.
+        repeats (int | None, optional): Number of trials per size, instead of each day's default. Defaults to None.
+        batch_size (int | None, optional): Number of trials per simulation, instead of each day's default.
+            Defaults to None.
+        plot (bool, optional): Whether to save plots of the results. Defaults to True.
+        ci_target (float | None, optional): Run more trials of each size until the median's confidence interval is
+            this fraction of it (see `general_benchmark`). Ignored by day 5. Defaults to None.
+        max_repeats (int | None, optional): Most trials per size when ci_target is set. Defaults to None (30).
+
+    Each day runs in its own directory with its own output files, so days are independent and are run
+    in separate processes (the benchmark functions change the working directory, so they cannot share one).
+
+    Returns:
+        Path: The summary index csv file, listing the status, run time and output files of each day
+    """
+    days = sorted(BENCHMARKS) if days is None else list(days)
+    unknown = [d for d in days if d not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"No benchmark for day(s) {unknown}")
+
+    jobs_args = []
+    for day in days:
+        overrides: dict[str, Any] = {"plot": plot}
+        if repeats is not None:
+            overrides["repeats"] = repeats
+        if batch_size is not None:
+            overrides["batch_size"] = batch_size
+        if sizes is not None:
+            if day == 5:
+                print("Day 5 sweeps two parameters, ignoring sizes")
+            else:
+                overrides["sizes"] = list(sizes)
+        if ci_target is not None:
+            if day == 5:
+                print("Day 5 sweeps two parameters, ignoring ci_target")
+            else:
+                overrides["ci_target"] = ci_target
+                if max_repeats is not None:
+                    overrides["max_repeats"] = max_repeats
+        jobs_args.append((day, overrides))
+
+    if jobs > 1:
+        with Pool(min(jobs, len(days))) as pool:
+            index = pool.starmap(_run_day, jobs_args, chunksize=1)
+    else:
+        index = [_run_day(day, overrides) for day, overrides in jobs_args]
+
+    out_dir = Path(__file__).resolve().parent / "benchmarks"
+    out_dir.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    index_path = out_dir / f"index_{timestamp}.csv"
+    with open(index_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["day", "status", "elapsed", "files"])
+        writer.writeheader()
+        writer.writerows(index)
+
+    for row in index:
+        print(f"Day {row['day']}: {row['status']} ({row['elapsed']}s)")
+    print(f"Saved summary index to {index_path}")
+    return index_path
+
+
 def benchmark_all() -> None:
-    benchmark_day01(lo=10, hi=1000, n=5, repeats=5)
-    benchmark_day02(lo=10, hi=100, n=5, repeats=5)
-    benchmark_day03(lo=10, hi=1000, n=5, repeats=5)
-    benchmark_day04(lo=10, hi=140, n=5, repeats=5, timeout=30)
-    benchmark_day05(
-        num_ranges_lo=10,
-        num_ranges_hi=200,
-        num_ranges_count=5,
-        num_queries_lo=100,
-        num_queries_hi=1000,
-        num_queries_count=5,
-        repeats=5,
-        timeout=5,
-    )
-    benchmark_day06(lo=10, hi=1000, n=5, repeats=5, timeout=5)
-    benchmark_day07(lo=10, hi=250, n=5, repeats=5, timeout=5)
-    benchmark_day08(lo=700, hi=1000, n=3, repeats=3, timeout=60)
-    benchmark_day09(lo=20, hi=500, n=10, repeats=5, timeout=60)
-    benchmark_day11(lo=20, hi=750, n=5, repeats=5, timeout=20)
+    benchmark_days()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the verilog solutions with generated inputs"
+    )
+    parser.add_argument(
+        "--days",
+        type=int,
+        nargs="+",
+        default=None,
+        help=f"days to benchmark (default: all of {sorted(BENCHMARKS)})",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=None,
+        help="input sizes to test (default: each day's own range, not used for day 5)",
+    )
+    parser.add_argument(
+        "--repeats", type=int, default=None, help="trials per input size"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=None, help="trials per simulation"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="number of days to benchmark in parallel"
+    )
+    parser.add_argument(
+        "--ci-target",
+        type=float,
+        default=None,
+        help="run more trials until the median's 95%% confidence interval is this fraction of it (e.g. 0.02)",
+    )
+    parser.add_argument(
+        "--max-repeats",
+        type=int,
+        default=None,
+        help="most trials per input size with --ci-target (default: 30)",
+    )
+    parser.add_argument(
+        "--no-plot",
+        action="store_true",
+        help="only write csv files (matplotlib is not imported)",
+    )
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help=f"compare the alternative implementations of each day instead (days {sorted(COMPARISONS)})",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="compare reading the input from the rom with streaming it (ingest bytes per cycle) instead",
+    )
+    parser.add_argument(
+        "--ram-traffic",
+        action="store_true",
+        help=f"record the reads / writes of each ram instance instead (days {list(RAM_TRAFFIC_DAYS)})",
+    )
+    parser.add_argument(
+        "--gap-percents",
+        type=int,
+        nargs="+",
+        default=[50],
+        help="with --stream, also stream from sources with no byte ready for these percentages of cycles",
+    )
+    args = parser.parse_args()
+
+    if args.stream:
+        days = sorted(STREAM_TARGETS) if args.days is None else args.days
+        unknown = [d for d in days if d not in STREAM_TARGETS]
+        if unknown:
+            parser.error(f"No streaming inputs for day(s) {unknown}")
+        jobs_args = [
+            (
+                day,
+                args.sizes,
+                args.repeats or 3,
+                args.batch_size or 1,
+                args.gap_percents,
+                not args.no_plot,
+            )
+            for day in days
+        ]
+        if args.jobs > 1:
+            with Pool(min(args.jobs, len(days))) as pool:
+                pool.starmap(stream_day, jobs_args, chunksize=1)
+        else:
+            for job_args in jobs_args:
+                stream_day(*job_args)
+        return
+
+    if args.ram_traffic:
+        days = list(RAM_TRAFFIC_DAYS) if args.days is None else args.days
+        unknown = [d for d in days if d not in RAM_TRAFFIC_DAYS]
+        if unknown:
+            parser.error(f"No ram instances to monitor for day(s) {unknown}")
+        jobs_args = [
+            (day, args.sizes, args.repeats or 3, args.batch_size or 1, not args.no_plot)
+            for day in days
+        ]
+        if args.jobs > 1:
+            with Pool(min(args.jobs, len(days))) as pool:
+                pool.starmap(ram_traffic_day, jobs_args, chunksize=1)
+        else:
+            for job_args in jobs_args:
+                ram_traffic_day(*job_args)
+        return
+
+    if args.compare:
+        days = sorted(COMPARISONS) if args.days is None else args.days
+        unknown = [d for d in days if d not in COMPARISONS]
+        if unknown:
+            parser.error(f"No variants to compare for day(s) {unknown}")
+        jobs_args = [
+            (day, args.sizes, args.repeats or 3, args.batch_size or 1, not args.no_plot)
+            for day in days
+        ]
+        if args.jobs > 1:
+            with Pool(min(args.jobs, len(days))) as pool:
+                pool.starmap(compare_day, jobs_args, chunksize=1)
+        else:
+            for job_args in jobs_args:
+                compare_day(*job_args)
+        return
+
+    benchmark_days(
+        days=args.days,
+        jobs=args.jobs,
+        sizes=args.sizes,
+        repeats=args.repeats,
+        batch_size=args.batch_size,
+        plot=not args.no_plot,
+        ci_target=args.ci_target,
+        max_repeats=args.max_repeats,
+    )
 
 
 if __name__ == "__main__":
-    benchmark_all()
+    main()
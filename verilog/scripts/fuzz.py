@@ -0,0 +1,384 @@
+import argparse
+import csv
+import math
+import os
+import random
+import subprocess
+import tempfile
+from datetime import datetime
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Callable
+
+from benchmark import _check_result, _parse_result, _run_simulation
+from generate_input import (
+    gen_day01,
+    gen_day02,
+    gen_day03,
+    gen_day04,
+    gen_day05,
+    gen_day07,
+    gen_day08,
+    gen_day09,
+    gen_day10,
+    gen_day11,
+)
+from generate_input import gen_day06_4_row as gen_day06
+
+# differential fuzzing of the verilog solutions against the answers computed by the input generators:
+# many small random inputs per day are solved in batches (testbench batch mode) by parallel workers,
+# both parts are compared exactly, and failing inputs are shrunk to the smallest failing input size
+
+# (generator, smallest size, largest size) of the random inputs for each day.
+# sizes are kept small so that thousands of cases can be simulated
+FUZZ_TARGETS: dict[int, tuple[Callable, int, int]] = {
+    1: (gen_day01, 1, 200),  # rotations
+    2: (gen_day02, 1, 10),  # ranges
+    3: (gen_day03, 1, 40),  # banks
+    4: (gen_day04, 3, 40),  # grid dimension
+    5: (gen_day05, 1, 40),  # ranges (with 4x as many queries)
+    6: (gen_day06, 1, 60),  # math problems
+    7: (gen_day07, 5, 40),  # grid dimension
+    # junction boxes (part 1 uses the first 1000 edges, so needs a few hundred)
+    8: (gen_day08, 200, 500),
+    9: (gen_day09, 4, 40),  # vertices
+    10: (gen_day10, 1, 20),  # machines
+    11: (gen_day11, 15, 80),  # devices
+}
+
+# edits to a generated input that must not change its answers
+MUTATIONS: dict[str, Callable[[str], str]] = {
+    "none": lambda text: text,
+    "no_final_newline": lambda text: text.rstrip("\n"),
+    "blank_line_at_end": lambda text: text + "\n",
+    # day 6 pads every row to the width of the grid, like the real puzzle input:
+    "no_trailing_spaces": lambda text: "\n".join(
+        line.rstrip(" ") for line in text.split("\n")
+    ),
+}
+
+# case results:
+PASS = "pass"
+MISMATCH = "mismatch"
+TIMEOUT = "timeout"
+ERROR = "error"  # no (or a malformed) RESULT line, or the simulation failed to build
+SKIPPED = "skipped"  # the generator could not produce an input for this size / seed
+FAILURES = (MISMATCH, TIMEOUT, ERROR)
+
+CSV_FIELDS = [
+    "day",
+    "case",
+    "size",
+    "seed",
+    "mutation",
+    "status",
+    "expected_part1",
+    "expected_part2",
+    "part1",
+    "part2",
+    "cycles",
+]
+
+
+def _gen_arg(day: int, size: int):
+    # generator argument for a fuzzing size
+    return (size, 4 * size) if day == 5 else size
+
+
+def _write_case(case: dict, path: Path) -> tuple[int, int]:
+    # generate the input file for a case, returning the expected answers
+    gen_func = FUZZ_TARGETS[case["day"]][0]
+    expected = gen_func(
+        n=_gen_arg(case["day"], case["size"]),
+        output_filename=str(path),
+        seed=case["seed"],
+    )
+    text = path.read_text()
+    path.write_text(MUTATIONS[case["mutation"]](text))
+    return expected
+
+
+def _run_cases(cases: list[dict], timeout: float) -> list[dict]:
+    # solve a list of cases (all for the same day) in one batch simulation, returning one result row
+    # per case. if the batch times out or fails, its cases are re-run on their own so the failure is
+    # attributed to the case(s) that caused it
+    day = cases[0]["day"]
+    day_dirname = f"day{day:02d}"
+    os.chdir(Path(__file__).resolve().parent.parent / day_dirname)
+
+    rows = [
+        {
+            **c,
+            "expected_part1": "",
+            "expected_part2": "",
+            "part1": "",
+            "part2": "",
+            "cycles": "",
+        }
+        for c in cases
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        runnable = []
+        for row in rows:
+            input_path = tmp / f"case{row['case']}.txt"
+            try:
+                expected = _write_case(row, input_path)
+            except Exception:
+                row["status"] = SKIPPED
+                continue
+            row["expected_part1"], row["expected_part2"] = expected
+            runnable.append((row, input_path))
+        if not runnable:
+            return rows
+
+        try:
+            outputs, _ = _run_simulation(
+                day_dirname,
+                [p for _, p in runnable],
+                timeout,
+                out_file=tmp / f"{day_dirname}_tb.out",
+            )
+        except (subprocess.TimeoutExpired, RuntimeError) as e:
+            if len(runnable) > 1:
+                # split the batch up to find which case(s) failed:
+                singles = [_run_cases([row], timeout)[0] for row, _ in runnable]
+                by_case = {r["case"]: r for r in singles}
+                return [by_case.get(r["case"], r) for r in rows]
+            status = TIMEOUT if isinstance(e, subprocess.TimeoutExpired) else ERROR
+            runnable[0][0]["status"] = status
+            return rows
+
+        for (row, _), stdout in zip(runnable, outputs):
+            try:
+                result = _parse_result(stdout)
+            except RuntimeError:
+                row["status"] = ERROR
+                continue
+            row.update(
+                part1=result["part1"], part2=result["part2"], cycles=result["cycles"]
+            )
+            expected = (row["expected_part1"], row["expected_part2"])
+            row["status"] = PASS if _check_result(result, expected) else MISMATCH
+    return rows
+
+
+def _fails(case: dict, timeout: float) -> dict | None:
+    row = _run_cases([case], timeout)[0]
+    return row if row["status"] in FAILURES else None
+
+
+def _shrink(args: tuple[dict, float, int]) -> dict:
+    """Shrinks a failing case to the smallest input that still fails
+
+    Args:
+        args (tuple[dict, float, int]): (failing case row, time limit per simulation, maximum number of simulations)
+
+    The input mutation is dropped if the case still fails without it, then the input size is reduced
+    (keeping the same seed), trying the smallest size first and then halving the distance to the
+    current failing size. Every candidate is checked by simulating it, so the result is always a
+    genuinely failing input.
+
+    Returns:
+        dict: result row of the smallest failing case found
+    """
+    case, timeout, budget = args
+    best = case
+    lo = FUZZ_TARGETS[case["day"]][1]
+
+    if best["mutation"] != "none" and budget > 0:
+        budget -= 1
+        row = _fails({**best, "mutation": "none"}, timeout)
+        if row:
+            best = row
+
+    while budget > 0:
+        candidates = sorted({lo, (lo + best["size"]) // 2, best["size"] - 1})
+        for size in candidates:
+            if size < lo or size >= best["size"] or budget <= 0:
+                continue
+            budget -= 1
+            row = _fails({**best, "size": size}, timeout)
+            if row:
+                best = row
+                break
+        else:
+            break  # no smaller size fails
+    return best
+
+
+def _schedule(days: list[int], cases: int, seed: int) -> list[dict]:
+    # random cases for each day: sizes are log-uniform, with extra weight on the smallest and largest
+    # sizes, and a third of the inputs are mutated
+    rng = random.Random(seed)
+    schedule = []
+    for day in days:
+        _, lo, hi = FUZZ_TARGETS[day]
+        for i in range(cases):
+            r = rng.random()
+            if r < 0.1:
+                size = lo
+            elif r < 0.2:
+                size = hi
+            else:
+                size = int(round(math.exp(rng.uniform(math.log(lo), math.log(hi)))))
+            mutation = "none"
+            if rng.random() < 1 / 3:
+                mutation = rng.choice([m for m in MUTATIONS if m != "none"])
+            schedule.append(
+                {
+                    "day": day,
+                    "case": i,
+                    "size": size,
+                    "seed": rng.randrange(2**31),
+                    "mutation": mutation,
+                }
+            )
+    return schedule
+
+
+def _failure_rate_interval(
+    failures: int, n: int, z: float = 1.96
+) -> tuple[float, float]:
+    # 95% wilson score interval for the failure rate (still informative with 0 failures)
+    if n == 0:
+        return 0.0, 1.0
+    p = failures / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def fuzz(
+    days: list[int],
+    cases: int = 1000,
+    jobs: int = 1,
+    batch_size: int = 50,
+    timeout: float = 30,
+    seed: int = 0,
+    max_shrink: int = 5,
+    shrink_budget: int = 30,
+) -> Path:
+    """Runs a differential fuzzing campaign of the verilog solutions against the generators' answers
+
+    Args:
+        days (list[int]): Days to fuzz (keys of FUZZ_TARGETS).
+        cases (int, optional): Number of random inputs per day. Defaults to 1000.
+        jobs (int, optional): Number of simulations to run at once. Defaults to 1.
+        batch_size (int, optional): Number of inputs solved per simulation. Defaults to 50.
+        timeout (float, optional): Time limit per input, in seconds. Defaults to 30.
+        seed (int, optional): Seed of the campaign (sizes, seeds and mutations of each case). Defaults to 0.
+        max_shrink (int, optional): Number of failing cases per day to shrink. Defaults to 5.
+        shrink_budget (int, optional): Number of simulations allowed when shrinking each case. Defaults to 30.
+
+    Every case is written to `benchmarks/fuzz_<timestamp>.csv`, and a minimal reproducer of each shrunk
+    failure (the input file, named after its size / seed / mutation) to `benchmarks/fuzz_<timestamp>/`.
+
+    Returns:
+        Path: the csv file of case results
+    """
+    unknown = [d for d in days if d not in FUZZ_TARGETS]
+    if unknown:
+        raise ValueError(f"No fuzzing target for day(s) {unknown}")
+
+    out_dir = Path(__file__).resolve().parent / "benchmarks"
+    out_dir.mkdir(exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    csv_path = out_dir / f"fuzz_{timestamp}.csv"
+
+    schedule = _schedule(days, cases, seed)
+    batches = []
+    for day in days:
+        day_cases = [c for c in schedule if c["day"] == day]
+        for i in range(0, len(day_cases), batch_size):
+            batches.append(day_cases[i : i + batch_size])
+
+    rows = []
+    with Pool(max(1, jobs)) as pool, open(
+        csv_path, "w", encoding="utf-8", newline=""
+    ) as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+        writer.writeheader()
+        tasks = [(batch, timeout) for batch in batches]
+        for batch_rows in pool.starmap(_run_cases, tasks, chunksize=1):
+            writer.writerows(batch_rows)
+            f.flush()
+            rows.extend(batch_rows)
+            print(f"\t{len(rows)}/{len(schedule)} cases done")
+
+        # shrink (a few of) the failures of each day:
+        to_shrink = []
+        for day in days:
+            failed = [r for r in rows if r["day"] == day and r["status"] in FAILURES]
+            failed.sort(key=lambda r: r["size"])
+            to_shrink += [(r, timeout, shrink_budget) for r in failed[:max_shrink]]
+        shrunk = pool.map(_shrink, to_shrink, chunksize=1) if to_shrink else []
+
+    print(f"Saved case results to {csv_path}")
+
+    if shrunk:
+        repro_dir = out_dir / f"fuzz_{timestamp}"
+        repro_dir.mkdir(exist_ok=True)
+        for (original, _, _), row in zip(to_shrink, shrunk):
+            name = f"day{row['day']:02d}_n{row['size']}_seed{row['seed']}_{row['mutation']}.txt"
+            _write_case(row, repro_dir / name)
+            print(
+                f"Day {row['day']}: case {original['case']} ({original['status']}, size {original['size']}) "
+                f"shrunk to size {row['size']} ({row['status']}): expected "
+                f"({row['expected_part1']}, {row['expected_part2']}), got ({row['part1']}, {row['part2']}) "
+                f"-> {repro_dir / name}"
+            )
+
+    print(
+        "| Day | Cases | Pass | Mismatch | Timeout | Error | Skipped | Failure rate (95% CI) |"
+    )
+    print("| --- | --- | --- | --- | --- | --- | --- | --- |")
+    for day in days:
+        day_rows = [r for r in rows if r["day"] == day]
+        counts = {
+            s: sum(r["status"] == s for r in day_rows)
+            for s in (PASS, *FAILURES, SKIPPED)
+        }
+        tested = len(day_rows) - counts[SKIPPED]
+        failures = sum(counts[s] for s in FAILURES)
+        lo, hi = _failure_rate_interval(failures, tested)
+        print(
+            f"| {day} | {len(day_rows)} | {counts[PASS]} | {counts[MISMATCH]} | {counts[TIMEOUT]} "
+            f"| {counts[ERROR]} | {counts[SKIPPED]} | {lo:.2%} - {hi:.2%} |"
+        )
+    return csv_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Differential fuzzing of the verilog solutions against the reference answers of generate_input.py"
+    )
+    parser.add_argument("--days", type=int, nargs="+", default=sorted(FUZZ_TARGETS))
+    parser.add_argument("--cases", type=int, default=1000, help="random inputs per day")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--batch-size", type=int, default=50, help="inputs solved per simulation"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30, help="time limit per input (seconds)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="campaign seed")
+    parser.add_argument(
+        "--max-shrink", type=int, default=5, help="failing cases to shrink per day"
+    )
+    args = parser.parse_args()
+
+    fuzz(
+        args.days,
+        cases=args.cases,
+        jobs=args.jobs,
+        batch_size=args.batch_size,
+        timeout=args.timeout,
+        seed=args.seed,
+        max_shrink=args.max_shrink,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,12 @@
 #!/user/bin/python3
+import bisect
 import random
 import math
 import string
 import functools as ft
+import itertools
+from fractions import Fraction
+import numpy as np
 
 from typing import Any
 
@@ -10,6 +14,26 @@ DEFAULT_SEED = sum(ord(c) for c in "Advent of FPGA")
 
 
 # generate day 1 inputs:
+def _day01_answers(
+    steps: np.ndarray, start_pos: int = 50, dial_size: int = 100
+) -> tuple[int, int, int]:
+    # vectorised day 1 solution for an array of signed rotations (R = +distance, L = -distance)
+    # returns (part1, part2, final position) so that a long input can be solved in chunks
+    positions = (start_pos + np.cumsum(steps, dtype=np.int64)) % dial_size
+    before = np.concatenate(([start_pos], positions[:-1]))
+    part1 = int(np.count_nonzero(positions == 0))
+
+    # part 2: times the dial passes through 0 during each rotation. measured as distance travelled
+    # from the last 0 behind the start position, going right that is `before`, going left it is
+    # `-before mod dial_size` (a left rotation starting on 0 doesn't count that 0 again)
+    distance = np.abs(steps)
+    behind = np.where(steps > 0, before, (dial_size - before) % dial_size)
+    part2 = int(np.sum((behind + distance) // dial_size))
+
+    final_pos = int(positions[-1]) if len(positions) else start_pos
+    return part1, part2, final_pos
+
+
 def gen_day01(
     n: int, output_filename: str, seed: int = DEFAULT_SEED
 ) -> tuple[int, int]:
@@ -17,9 +41,6 @@ def gen_day01(
     # output_filename = self explanatory
     # returns two ints: (part1_answer, part2_answer)
 
-    DIAL_SIZE = 100
-    START_POS = 50
-
     rng = random.Random(seed)
 
     # Generate rotations file:
@@ -34,48 +55,48 @@ def gen_day01(
         for d, dist in rotations:
             f.write(f"{d}{dist}\n")
 
-    # find part 1 answer:
-    position = START_POS
-    part1 = 0
-
-    for direction, value in rotations:
-        mod_value = value % DIAL_SIZE
-
-        if direction == "R":
-            position += mod_value
-            if position > 99:
-                position -= 100
-        else:
-            position -= mod_value
-            if position < 0:
-                position += 100
+    steps = np.array(
+        [dist if d == "R" else -dist for d, dist in rotations], dtype=np.int64
+    )
+    part1, part2, _ = _day01_answers(steps)
+    return part1, part2
 
-        if position == 0:
-            part1 += 1
 
-    # part 2:
-    position = START_POS
+def gen_day01_bulk(
+    n: int,
+    output_filename: str,
+    seed: int = DEFAULT_SEED,
+    chunk_size: int = 1 << 20,
+) -> tuple[int, int]:
+    # n = input size (can be 10M+ rotations)
+    # output_filename = self explanatory
+    # returns two ints: (part1_answer, part2_answer)
+    #
+    # rotations are generated, solved and written `chunk_size` at a time, carrying the dial position
+    # between chunks. uses numpy's rng, so the files differ from gen_day01's for the same seed
+    rng = np.random.default_rng(seed)
+    position = 50
+    part1 = 0
     part2 = 0
 
-    for direction, value in rotations:
-        mod_value = value % DIAL_SIZE
-        part2 += value // DIAL_SIZE
-
-        # cursed to handle all cases
-        if direction == "R":
-            position += mod_value
-            if position > 99:
-                part2 += 1
-                position -= 100
-        else:
-            old_position = position
-            position -= mod_value
-            if position < 0:
-                if old_position != 0:
-                    part2 += 1
-                position += 100
-            if position == 0:
-                part2 += 1
+    with open(output_filename, "w", encoding="utf-8") as f:
+        for start in range(0, n, chunk_size):
+            size = min(chunk_size, n - start)
+            is_right = rng.integers(0, 2, size=size).astype(bool)
+            # allow distances over 100 (part 2)
+            distance = rng.integers(1, 301, size=size)
+
+            steps = np.where(is_right, distance, -distance)
+            p1, p2, position = _day01_answers(steps, position)
+            part1 += p1
+            part2 += p2
+
+            f.write(
+                "".join(
+                    f"{'R' if r else 'L'}{d}\n"
+                    for r, d in zip(is_right.tolist(), distance.tolist())
+                )
+            )
 
     return part1, part2
 
@@ -217,6 +238,20 @@ def gen_day02(
     return (p1_ans, p2_ans)
 
 
+def _bank_joltage(bank: str, k: int) -> int:
+    # largest k digit number that can be made from the digits of `bank` (keeping their order), in O(len):
+    # a monotonic stack keeps the digits chosen so far, and a smaller digit is popped whenever a larger
+    # one arrives and there are still enough digits left after it to fill the remaining places
+    drops = len(bank) - k
+    stack = []
+    for c in bank:
+        while drops and stack and stack[-1] < c:
+            stack.pop()
+            drops -= 1
+        stack.append(c)
+    return int("".join(stack[:k]))
+
+
 def gen_day03(
     n: int, output_filename: str, seed: int = DEFAULT_SEED
 ) -> tuple[int, int]:
@@ -224,25 +259,6 @@ def gen_day03(
     # output_filename = self explanatory
     # returns two ints: (part1_answer, part2_answer)
 
-    # function to solve task:
-    def get_bank_joltage_n(bank: str, n: int = 2):
-        selected = [""] * n
-        pos = -1
-
-        for j in range(n):
-            m = bank[pos + 1]
-            mPos = pos + 1
-            for i in range(pos + 1, len(bank) - (n - j - 1)):
-                if bank[i] > m:
-                    m = bank[i]
-                    mPos = i
-            selected[j] = m
-            pos = mPos
-        total = 0
-        for c in selected:
-            total = total * 10 + int(c)
-        return total
-
     # setup:
     random.seed(seed)
 
@@ -255,27 +271,69 @@ def gen_day03(
         bank_length = random.randint(12, 100)
         bank = "".join(random.choice("123456789") for _ in range(bank_length))
         banks.append(bank)
-        p1_ans += get_bank_joltage_n(bank, 2)
-        p2_ans += get_bank_joltage_n(bank, 12)
+        p1_ans += _bank_joltage(bank, 2)
+        p2_ans += _bank_joltage(bank, 12)
 
     # write to file:
     with open(output_filename, "w") as f:
-        f.write("\n".join(banks))
+        f.write("".join(bank + "\n" for bank in banks))
+
+    return p1_ans, p2_ans
+
+
+def gen_day03_bulk(
+    n: int | tuple[int, int, int],
+    output_filename: str,
+    seed: int = DEFAULT_SEED,
+    chunk_size: int = 1 << 16,
+) -> tuple[int, int]:
+    # n = number of banks, or (number of banks, min bank length, max bank length) for long banks
+    #     (default lengths are 12 to 100, like gen_day03)
+    # output_filename = self explanatory
+    # returns two ints: (part1_answer, part2_answer)
+    #
+    # for millions of banks: the digits for `chunk_size` banks at a time are drawn in a single numpy
+    # call, and each chunk is written out before the next is generated. uses numpy's rng, so the
+    # files differ from gen_day03's for the same seed
+    num_banks, min_len, max_len = (n, 12, 100) if isinstance(n, int) else n
+    if not 12 <= min_len <= max_len:
+        raise ValueError("bank lengths must be at least 12 (the part 2 answer length)")
+
+    rng = np.random.default_rng(seed)
+    p1_ans = 0
+    p2_ans = 0
+
+    with open(output_filename, "w") as f:
+        for start in range(0, num_banks, chunk_size):
+            lengths = rng.integers(
+                min_len, max_len + 1, size=min(chunk_size, num_banks - start)
+            )
+            digits = rng.integers(ord("1"), ord("9") + 1, size=int(lengths.sum()))
+            text = digits.astype(np.uint8).tobytes().decode("ascii")
+
+            ends = np.cumsum(lengths).tolist()
+            banks = [text[e - l : e] for e, l in zip(ends, lengths.tolist())]
+            for bank in banks:
+                p1_ans += _bank_joltage(bank, 2)
+                p2_ans += _bank_joltage(bank, 12)
+            f.write("".join(bank + "\n" for bank in banks))
 
     return p1_ans, p2_ans
 
 
 def gen_day04(
-    n: int, output_filename: str, seed: int = DEFAULT_SEED
+    n: int, output_filename: str, seed: int = DEFAULT_SEED, density: float | None = None
 ) -> tuple[int, int]:
     # n = input size
     # output_filename = self explanatory
+    # density = fraction of cells with a roll of paper (random if not given)
     # returns two ints: (part1_answer, part2_answer)
 
     random.seed(seed)
-    density = random.uniform(
-        0.45, 0.65
-    )  # gives a relatively even spread without trivialising
+    if density is None:
+        density = random.uniform(
+            0.45, 0.65
+        )  # gives a relatively even spread without trivialising
 
     grid = []
     for _ in range(n):
@@ -339,6 +397,13 @@ def gen_day04(
     return (p1_ans, p2_ans)
 
 
+def gen_day04_density(
+    n: tuple[int, int], output_filename: str, seed: int = DEFAULT_SEED
+) -> tuple[int, int]:
+    # n = (size, density %) of the grid, for sweeping the density of rolls of paper
+    return gen_day04(n[0], output_filename, seed, density=n[1] / 100)
+
+
 def gen_day05(
     n: tuple[int, int], output_filename: str, seed: int = DEFAULT_SEED
 ) -> tuple[int, int]:
@@ -401,12 +466,14 @@ def gen_day05(
     maxId = min(INT64_MAX, max(max(r) for r in ranges))
     queries = [random.randint(minId, maxId) for _ in range(n_queries)]
 
-    # calculate p1 answer:
+    # calculate p1 answer (binary search of the merged ranges, so large numbers of queries are quick):
+    merged = merge_intervals(ranges)
+    starts = [l for l, _ in merged]
     p1_ans = 0
     for q in queries:
-        for l, r in merge_intervals(ranges):
-            if l <= q <= r:
-                p1_ans += 1
+        i = bisect.bisect_right(starts, q) - 1
+        if i >= 0 and q <= merged[i][1]:
+            p1_ans += 1
     p2_ans = union_size(merged)
 
     # write to output file:
@@ -456,7 +523,11 @@ def gen_day06(
         for i in range(n_rows + 1):
             rows[i].append(" ")
 
+    # every row is padded to the width of the grid (as in the real puzzle input), so the operator row
+    # ends with spaces when the last problem's numbers are wider than its operator
     lines = ["".join(r).rstrip() for r in rows]
+    grid_width = max(map(len, lines))
+    lines = [line.ljust(grid_width) for line in lines]
 
     # write to output file:
     with open(output_filename, "w") as f:
@@ -536,79 +607,59 @@ def gen_day07(
     # n = dimensions of the grid
     # output_filename = self explanatory
     # returns two ints: (part1_answer, part2_answer)
-    random.seed(seed)
+    return gen_day07_grid((n, n), output_filename, seed)
 
-    # generate input
-    n = max(n, 5)
-    w = h = n
 
-    grid = [["." for _ in range(w)] for _ in range(h)]
-
-    # put initial position in middle of first row
+def gen_day07_grid(
+    n: tuple[int, int], output_filename: str, seed: int = DEFAULT_SEED
+) -> tuple[int, int]:
+    # n = (width, height) of the grid, for grids wider than they are tall (e.g. 4096 x 24)
+    # output_filename = self explanatory
+    # returns two ints: (part1_answer, part2_answer)
+    #
+    # rows are written to the file as they are generated and solved, so the grid is never held in
+    # memory. each row of splitters is encoded as an integer bitmask (bit c = column c):
+    #   part 1: the set of columns with a beam is also a bitmask, updated with shifts / ORs
+    #   part 2: the number of timelines in each column is a numpy array of python ints (can exceed 64 bits)
+    random.seed(seed)
+    w = max(n[0], 5)
+    h = max(n[1], 5)
     start_col = w // 2
-    grid[0][start_col] = "S"
+    row_mask = (1 << w) - 1
+    to_bits = str.maketrans(".^", "01")
 
-    # add splitters
-    for r in range(1, h):
-        for c in range(w):
-            if random.random() < 0.25:  # seems to give a good balance
-                grid[r][c] = "^"
+    beams = 1 << start_col
+    part1_answer = 0
+    counts = np.zeros(w, dtype=object)
+    counts[start_col] = 1
+    exited = 0  # timelines that left the grid through the sides
 
-    # Write the grid to the output file
     with open(output_filename, "w") as f:
-        for row in grid:
-            f.write("".join(row) + "\n")
-
-    # --- 2. Solve Part 1 (Boolean Reachability) ---
-    # We need to count how many unique splitters are hit.
-    # We merge beams that land on the same spot (using a set).
-
-    splitters_hit = set()
-    active_cols = {start_col}
+        # put initial position in middle of first row (which has no splitters)
+        f.write("." * start_col + "S" + "." * (w - start_col - 1) + "\n")
 
-    # part 1:
-    for r in range(h):
-        next_active = set()
-        for c in active_cols:
-            if c < 0 or c >= w:
-                continue
+        for _ in range(1, h):
+            # add splitters
+            row = "".join(
+                "^" if random.random() < 0.25 else "." for _ in range(w)
+            )  # 0.25 seems to give a good balance
+            f.write(row + "\n")
 
-            if grid[r][c] == "^":
-                splitters_hit.add((r, c))
-                next_active.add(c - 1)
-                next_active.add(c + 1)
-            else:
-                next_active.add(c)
+            # part 1: beams on a splitter are split to both neighbouring columns
+            splitters = int(row[::-1].translate(to_bits), 2)
+            hit = beams & splitters
+            part1_answer += bin(hit).count("1")
+            beams = ((beams & ~splitters) | (hit << 1) | (hit >> 1)) & row_mask
 
-        active_cols = next_active
-        if not active_cols:
-            break
+            # part 2: same, but counting the timelines in each column
+            is_splitter = np.frombuffer(row.encode(), dtype=np.uint8) == ord("^")
+            split = np.where(is_splitter, counts, 0)
+            counts = np.where(is_splitter, 0, counts)
+            counts[1:] += split[:-1]
+            counts[:-1] += split[1:]
+            exited += split[0] + split[-1]
 
-    part1_answer = len(splitters_hit)
-
-    # part 2:
-    current_counts = {start_col: 1}
-    total_timelines = 0
-
-    for r in range(h):
-        next_counts = {}
-        for c, count in current_counts.items():
-            if c < 0 or c >= w:
-                total_timelines += count
-                continue
-
-            if grid[r][c] == "^":
-                next_counts[c - 1] = next_counts.get(c - 1, 0) + count
-                next_counts[c + 1] = next_counts.get(c + 1, 0) + count
-            else:
-                next_counts[c] = next_counts.get(c, 0) + count
-
-        current_counts = next_counts
-        if not current_counts:
-            break
-    total_timelines += sum(current_counts.values())
-
-    return part1_answer, total_timelines
+    return part1_answer, int(exited + counts.sum())
 
 
 def gen_day08(
@@ -684,6 +735,56 @@ def gen_day08(
             p1_answer = sizes[0] * sizes[1] * sizes[2]
     return p1_answer, p2_answer
 
+
+# generate day 9 inputs:
+def _day09_answers(
+    poly: list[tuple[int, int]], chunk: int = 2048
+) -> tuple[int, int]:
+    # vectorised day 9 solution: part 1 is the largest rectangle between any two points, part 2 the
+    # largest that no polygon edge cuts through and whose centre is inside the polygon. rectangles are
+    # checked from the largest area down, stopping at the first valid one
+    points = np.array(poly, dtype=np.int64).reshape(-1, 2)
+    if len(points) < 2:
+        return 0, 0
+    i, j = np.tril_indices(len(points), -1)
+    min_x = np.minimum(points[i, 0], points[j, 0])
+    max_x = np.maximum(points[i, 0], points[j, 0])
+    min_y = np.minimum(points[i, 1], points[j, 1])
+    max_y = np.maximum(points[i, 1], points[j, 1])
+    area = (max_x - min_x + 1) * (max_y - min_y + 1)
+
+    ends = np.roll(points, -1, axis=0)
+    vertical = points[:, 0] == ends[:, 0]
+    seg_x, seg_y = points[:, 0], points[:, 1]
+    seg_min_x = np.minimum(points[:, 0], ends[:, 0])
+    seg_max_x = np.maximum(points[:, 0], ends[:, 0])
+    seg_min_y = np.minimum(points[:, 1], ends[:, 1])
+    seg_max_y = np.maximum(points[:, 1], ends[:, 1])
+
+    order = np.argsort(-area, kind="stable")
+    for s in range(0, len(order), chunk):
+        idx = order[s : s + chunk]
+        x0, x1 = min_x[idx, None], max_x[idx, None]
+        y0, y1 = min_y[idx, None], max_y[idx, None]
+        # edge intersection check:
+        cut = np.where(
+            vertical,
+            (x0 < seg_x)
+            & (seg_x < x1)
+            & (np.maximum(y0, seg_min_y) < np.minimum(y1, seg_max_y)),
+            (y0 < seg_y)
+            & (seg_y < y1)
+            & (np.maximum(x0, seg_min_x) < np.minimum(x1, seg_max_x)),
+        )
+        # point in poly, casting a ray right from the centre (doubled to stay in integers):
+        hits = vertical & (2 * seg_min_y < y0 + y1) & (y0 + y1 < 2 * seg_max_y)
+        hits &= 2 * seg_x > x0 + x1
+        valid = ~cut.any(axis=1) & (hits.sum(axis=1) % 2 == 1)
+        if valid.any():
+            return int(area.max()), int(area[idx[valid.argmax()]])
+    return int(area.max()), 0
+
+
 def gen_day09(
     n: int, output_filename: str, seed: int = DEFAULT_SEED
 ) -> tuple[int, int]:
@@ -747,6 +848,10 @@ def gen_day09(
                         return True
         return False
 
+    # cuts soon leave few corners with two edges long enough to cut (around 1000 points), so after too many
+    # rejected corners in a row, corners with shorter edges (of at least 2) are cut too
+    rejected = 0
+    relaxed = False
     while current_vertex_count < n:
         # pick a random corner to cut:
         idx = random.randint(0, len(poly) - 1)
@@ -757,12 +862,24 @@ def gen_day09(
         len1 = abs(p_curr[0] - p_prev[0]) + abs(p_curr[1] - p_prev[1])
         len2 = abs(p_curr[0] - p_next[0]) + abs(p_curr[1] - p_next[1])
 
-        if len1 < 20 or len2 < 20:
+        rejected += 1
+        if rejected > 20 * len(poly):
+            relaxed = True
+        if rejected > 1000 * len(poly):
+            raise ValueError(f"no corner of the {len(poly)} point polygon can be cut")
+        if relaxed:
+            if len1 < 2 or len2 < 2:
+                continue
+        elif len1 < 20 or len2 < 20:
             continue  # deem this as too small to make a cut
 
         # determine size of cut:
-        cut1 = random.randint(5, min(len1 // 2, 5000))  # depth along incoming edge
-        cut2 = random.randint(5, min(len2 // 2, 5000))  # depth outgoing edge
+        cut1 = random.randint(
+            min(5, len1 // 2), min(len1 // 2, 5000)
+        )  # depth along incoming edge
+        cut2 = random.randint(
+            min(5, len2 // 2), min(len2 // 2, 5000)
+        )  # depth outgoing edge
 
         # determine directions:
         # from prev to curr:
@@ -813,69 +930,120 @@ def gen_day09(
                 new_poly = poly[:idx] + [p_a, p_b, p_c] + poly[idx + 1 :]
             poly = new_poly
             current_vertex_count += 2
+            rejected = 0
     # write to output file:
     with open(output_filename, "w") as f:
         for x, y in poly:
             f.write(f"{x},{y}\n")
 
     # solve this problem:
-    segments = []
-    for i in range(len(poly)):
-        segments.append((poly[i], poly[(i + 1) % len(poly)]))
-
-    def get_area(p1, p2):
-        return (abs(p1[0] - p2[0]) + 1) * (abs(p1[1] - p2[1]) + 1)
+    return _day09_answers(poly)
 
-    best_area_p1 = 0
-    for i in range(len(poly)):
-        for j in range(i):
-            best_area_p1 = max(best_area_p1, get_area(poly[i], poly[j]))
 
-    def is_rect_in_poly(p1, p2, segs):
-        x1, y1 = p1
-        x2, y2 = p2
-        minX, maxX = min(x1, x2), max(x1, x2)
-        minY, maxY = min(y1, y2), max(y1, y2)
+def gen_day10(
+    n: int, output_filename: str, seed: int = DEFAULT_SEED
+) -> tuple[int, int]:
+    # n = number of machines (lines) in the input file
+    # output_filename = self explanatory
+    # returns two ints: (part1_answer, part2_answer)
+    rng = random.Random(seed)
 
-        # edge intersection checK:
-        for (sx1, sy1), (sx2, sy2) in segs:
-            if sx1 == sx2:
-                if minX < sx1 < maxX:
-                    sy_min = min(sy1, sy2)
-                    sy_max = max(sy1, sy2)
-                    if max(minY, sy_min) < min(maxY, sy_max):
-                        return False
+    # kept well within day10_core's MAX_LIGHTS = 10, MAX_BUTTONS = 13 and MAX_JOLTAGE_BITS = 9
+    MAX_LIGHTS = 8
+    MAX_PRESSES = 12
+    # machines whose part 2 search space is larger than this are regenerated, so the reference
+    # solver stays fast (and the hardware's 1 million combination limit is never reached)
+    MAX_COMBINATIONS = 20000
+
+    def min_presses_part1(buttons, target):
+        # try every subset of buttons (each button is pressed at most once over GF2)
+        best = None
+        for mask in range(1 << len(buttons)):
+            state = [0] * len(target)
+            for j, b in enumerate(buttons):
+                if (mask >> j) & 1:
+                    for l in b:
+                        state[l] ^= 1
+            if state == target:
+                presses = bin(mask).count("1")
+                best = presses if best is None else min(best, presses)
+        return best
+
+    def eliminate(buttons, joltage):
+        # exact gaussian elimination (fractions) of A x = b, to reduced row echelon form
+        rows = [
+            [Fraction(int(l in b)) for b in buttons] + [Fraction(joltage[l])]
+            for l in range(len(joltage))
+        ]
+        pivots = []
+        for c in range(len(buttons)):
+            r = len(pivots)
+            p = next((i for i in range(r, len(rows)) if rows[i][c] != 0), None)
+            if p is None:
+                continue
+            rows[r], rows[p] = rows[p], rows[r]
+            rows[r] = [v / rows[r][c] for v in rows[r]]
+            for i in range(len(rows)):
+                if i != r and rows[i][c] != 0:
+                    f = rows[i][c]
+                    rows[i] = [a - f * b for a, b in zip(rows[i], rows[r])]
+            pivots.append(c)
+        free = [c for c in range(len(buttons)) if c not in pivots]
+        # a free button can't be pressed more times than its smallest target
+        bounds = [min(joltage[l] for l in buttons[c]) for c in free]
+        return rows, pivots, free, bounds
+
+    def min_presses_part2(rows, pivots, free, bounds):
+        # enumerate the free variables, the pivot variables are then determined
+        best = None
+        for xs in itertools.product(*(range(b + 1) for b in bounds)):
+            total = sum(xs)
+            for i in range(len(pivots)):
+                v = rows[i][-1] - sum(rows[i][c] * x for c, x in zip(free, xs))
+                if v < 0 or v.denominator != 1:
+                    break
+                total += v
             else:
-                if minY < sy1 < maxY:
-                    sx_min = min(sx1, sx2)
-                    sx_max = max(sx1, sx2)
-                    if max(minX, sx_min) < min(maxX, sx_max):
-                        return False
-        # point in poly:
-        cx = (minX + maxX) / 2
-        cy = (minY + maxY) / 2
-        intersections = 0
-
-        for (sx1, sy1), (sx2, sy2) in segs:
-            if sx1 == sx2:
-                sy_min = min(sy1, sy2)
-                sy_max = max(sy1, sy2)
-                if sy_min < cy < sy_max:
-                    if sx1 > cx:
-                        intersections += 1
-
-        return (intersections % 2) == 1
-
-    best_area_p2 = 0
-    for i in range(len(poly)):
-        p1 = poly[i]
-        for j in range(i):
-            p2 = poly[j]
-            area = get_area(p1, p2)
-            if area > best_area_p2 and is_rect_in_poly(p1, p2, segments):
-                best_area_p2 = area
+                best = total if best is None else min(best, total)
+        return int(best)
+
+    lines = []
+    part1_answer = 0
+    part2_answer = 0
+    while len(lines) < n:
+        n_lights = rng.randint(2, MAX_LIGHTS)
+        n_buttons = rng.randint(2, n_lights + 2)
+        buttons = [
+            sorted(rng.sample(range(n_lights), rng.randint(1, n_lights)))
+            for _ in range(n_buttons)
+        ]
+
+        # targets are made from random presses, so every machine is solvable:
+        target = [0] * n_lights
+        joltage = [0] * n_lights
+        for b in buttons:
+            toggle = rng.random() < 0.5
+            presses = rng.randint(0, MAX_PRESSES)
+            for l in b:
+                target[l] ^= int(toggle)
+                joltage[l] += presses
+
+        rows, pivots, free, bounds = eliminate(buttons, joltage)
+        if math.prod(b + 1 for b in bounds) > MAX_COMBINATIONS:
+            continue
 
-    return best_area_p1, best_area_p2
+        part1_answer += min_presses_part1(buttons, target)
+        part2_answer += min_presses_part2(rows, pivots, free, bounds)
+
+        diagram = "".join("#" if t else "." for t in target)
+        wiring = " ".join("(" + ",".join(map(str, b)) + ")" for b in buttons)
+        lines.append(f"[{diagram}] {wiring} {{{','.join(map(str, joltage))}}}")
+
+    with open(output_filename, "w") as f:
+        for line in lines:
+            f.write(line + "\n")
+
+    return part1_answer, part2_answer
 
 
 def gen_day11(
@@ -899,7 +1067,8 @@ def gen_day11(
     all_names = set(fixed_nodes)
     while len(all_names) < n:
         all_names.add(get_random_name())
-    fillers = list(all_names - fixed_nodes)
+    # sorted so the output does not depend on string hash randomisation
+    fillers = sorted(all_names - fixed_nodes)
     random.shuffle(fillers)
 
     specials = ["dac", "fft"]
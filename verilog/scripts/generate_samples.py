@@ -1,5 +1,11 @@
 from pathlib import Path
+import argparse
+import hashlib
 import os
+import re
+import sys
+import tempfile
+from multiprocessing import Pool
 
 
 from generate_input import (
@@ -42,36 +48,126 @@ GENERATORS = {
 }
 
 NAME_IN_OUTPUT_DIR = "input1.txt"
+SEED = sum(ord(c) for c in "Advent of FPGA")
+
+# the expected results table in the README (| Day | Part 1 Answer | Part 2 Answer |)
+README_TABLE_ROW_RE = re.compile(r"^\|\s*(\d+)\s*\|\s*(\d+)\s*\|\s*(\d+)\s*\|\s*$")
+
+
+def _sha256(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _readme_answers(readme_path: Path) -> dict[int, tuple[int, int]]:
+    # read the expected results for the generated files from the README's table
+    answers = {}
+    in_table = False
+    for line in readme_path.read_text(encoding="utf-8").splitlines():
+        if line.startswith("Expected results for generated files"):
+            in_table = True
+        elif in_table:
+            mat = README_TABLE_ROW_RE.match(line)
+            if mat:
+                answers[int(mat.group(1))] = (int(mat.group(2)), int(mat.group(3)))
+            elif answers:
+                break  # end of the table
+    return answers
+
+
+def _generate(args: tuple[int, Path, bool]) -> dict:
+    # generate one day's sample input (in a worker process), returning its answers and the hash of
+    # the generated file. when checking, the file is generated into a temporary file instead so the
+    # existing sample is left untouched
+    day, output_file, check = args
+    gen_func = GENERATORS[day]
+    if check:
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as tmp:
+            target = Path(tmp.name)
+    else:
+        output_file.parent.mkdir(parents=True, exist_ok=True)
+        target = output_file
+
+    try:
+        p1, p2 = gen_func(n=INPUT_SIZES[day], output_filename=str(target), seed=SEED)
+        return {"day": day, "p1": p1, "p2": p2, "sha256": _sha256(target)}
+    except Exception as e:
+        return {"day": day, "error": str(e)}
+    finally:
+        if check:
+            target.unlink(missing_ok=True)
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Generate the dayXX/input1.txt sample inputs and their expected results"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="regenerate in memory and report any drift from the existing files and README, without writing",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="number of days to generate in parallel",
+    )
+    parser.add_argument("--days", type=int, nargs="+", default=sorted(GENERATORS))
+    args = parser.parse_args()
+
     scripts_dir = Path(__file__).resolve().parent
     root_dir = scripts_dir.parent
-    results = []
-
-    for day in sorted(GENERATORS.keys()):
-        gen_func = GENERATORS[day]
-        n = INPUT_SIZES[day]
-        seed = sum(ord(c) for c in "Advent of FPGA")
-
-        # set output path:
-        day_folder = f"day{day:02d}"
-        output_dir = root_dir / day_folder
-        output_file = output_dir / NAME_IN_OUTPUT_DIR
-        # ensure path exists:
-        os.makedirs(output_dir, exist_ok=True)
-
-        try:
-            p1, p2 = gen_func(n=n, output_filename=str(output_file), seed=seed)
-            results.append((day, p1, p2))
-        except Exception as e:
-            print(f"Failed to generate input for day {day} with: {e}")
+    expected = _readme_answers(root_dir.parent / "README.md")
+
+    # set output paths:
+    output_files = {
+        day: root_dir / f"day{day:02d}" / NAME_IN_OUTPUT_DIR for day in args.days
+    }
+    # existing samples are hashed before they might be overwritten:
+    old_hashes = {
+        day: _sha256(path) for day, path in output_files.items() if path.exists()
+    }
+
+    tasks = [(day, output_files[day], args.check) for day in args.days]
+    # slowest days (the ones with the most expensive reference solutions) first:
+    tasks.sort(key=lambda t: t[0] not in (8, 9))
+    with Pool(max(1, min(args.jobs, len(tasks)))) as pool:
+        results = sorted(
+            pool.map(_generate, tasks, chunksize=1), key=lambda r: r["day"]
+        )
+
+    drift = False
+    for r in results:
+        day = r["day"]
+        if "error" in r:
+            print(f"Failed to generate input for day {day} with: {r['error']}")
+            drift = True
+            continue
+
+        if old_hashes.get(day) != r["sha256"]:
+            state = "differs from" if day in old_hashes else "missing"
+            verb = "would change" if args.check else "changed"
+            print(
+                f"Day {day:02d}: {output_files[day].name} {verb} ({state} the existing file), sha256 {r['sha256'][:16]}"
+            )
+            drift = True
+        if expected.get(day) != (r["p1"], r["p2"]):
+            print(
+                f"Day {day:02d}: answers ({r['p1']}, {r['p2']}) do not match the README ({expected.get(day)})"
+            )
+            drift = True
+
+    if args.check:
+        print("No drift found." if not drift else "Drift found (see above).")
+        sys.exit(1 if drift else 0)
 
     print("Expected results for generated files:")
     print("| Day | Part 1 Answer | Part 2 Answer |")
     print("| --- | --- | --- |")
-    for day, p1, p2 in results:
-        print(f"| {day:02d} | {p1} | {p2} |")
+    for r in results:
+        if "error" not in r:
+            print(f"| {r['day']:02d} | {r['p1']} | {r['p2']} |")
 
 
 if __name__ == "__main__":
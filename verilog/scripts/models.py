@@ -0,0 +1,236 @@
+# python models of the cores' algorithms. each one works through an input in the same order as the
+# hardware (and with the same shortcuts), so it gives the number of steps each phase takes, and so the
+# clock cycles, without simulating the core. useful for checking what a change to a core should save
+# before (and after) building it, and for inputs too large to simulate in reasonable time
+import numpy as np
+
+
+def day04_rounds(
+    text: str, track_dirty_rows: bool = True, max_rows: int = 250
+) -> dict[str, int]:
+    # day04_core: every removal round scans rows (one per clock cycle) and removes the accessible rolls
+    # of all of them at once (each round sees the grid as it was at the start of the round).
+    # with track_dirty_rows (the core's TRACK_DIRTY_ROWS), rounds after the first only scan the rows
+    # next to a row that had removals in the last round, as no other row can have accessible rolls.
+    # returns both answers, the number of rounds (including the final one with no removals), the rows
+    # scanned over all rounds, and the clock cycles the core takes
+
+    # the rom appends a newline to the file, and every newline ends a row (so a file that ends with one
+    # has an extra, empty, row). rows are as wide as the first, and only the core's first MAX_ROWS
+    # (max_rows) rows are scanned
+    rows = (text + "\n").split("\n")[:-1]
+    n_cols = len(rows[0]) if rows else 0
+    grid = np.array(
+        [[c == "@" for c in row[:n_cols].ljust(n_cols, ".")] for row in rows],
+        dtype=bool,
+    ).reshape(len(rows), n_cols)
+
+    scan = np.arange(len(rows)) < max_rows
+    part1 = part2 = rounds = rows_scanned = 0
+    # a cycle per character loaded (and the appended newline), S_IDLE, the end of the input and S_DONE:
+    cycles = len(text) + 4
+    while True:
+        rounds += 1
+        rows_scanned += int(scan.sum())
+        # S_SCAN_INIT, a cycle per row scanned, one to process the last row and S_SCAN_END:
+        cycles += int(scan.sum()) + 3
+
+        padded = np.pad(grid, 1).astype(np.int8)
+        neighbours = sum(
+            padded[1 + dr : 1 + dr + grid.shape[0], 1 + dc : 1 + dc + grid.shape[1]]
+            for dr in (-1, 0, 1)
+            for dc in (-1, 0, 1)
+            if (dr, dc) != (0, 0)
+        )
+        accessible = grid & (neighbours < 4) & scan[:, None]
+        removed = int(accessible.sum())
+        if rounds == 1:
+            part1 = removed
+        if removed == 0:
+            break
+        part2 += removed
+        grid &= ~accessible
+
+        if track_dirty_rows:
+            dirty = accessible.any(axis=1)
+            scan = dirty.copy()
+            scan[1:] |= dirty[:-1]
+            scan[:-1] |= dirty[1:]
+            scan[max_rows:] = False
+
+    return {
+        "part1": part1,
+        "part2": part2,
+        "rounds": rounds,
+        "rows_scanned": rows_scanned,
+        "cycles": cycles,
+    }
+
+
+def _day09_points(text: str) -> np.ndarray:
+    return np.array(
+        [[int(v) for v in line.split(",")] for line in text.split() if line],
+        dtype=np.int64,
+    ).reshape(-1, 2)
+
+
+def _day09_check(
+    points: np.ndarray, rects: tuple[np.ndarray, ...], num_stages: int
+) -> tuple[np.ndarray, np.ndarray]:
+    # runs rectangles (min_x, min_y, max_x, max_y) through the segment checks of pipeline_stage.v, returning
+    # whether each one is a valid part 2 rectangle and the number of segments checked for it. segment i
+    # is loaded into stage i % num_stages, so the segments are checked in that order, up to the first cut
+    n = len(points)
+    idx = np.arange(n)
+    order = np.lexsort((idx // num_stages, idx % num_stages))
+    start, end = points[order], np.roll(points, -1, axis=0)[order]
+    sx, sy, ex, ey = start[:, 0], start[:, 1], end[:, 0], end[:, 1]
+    seg_min_x, seg_max_x = np.minimum(sx, ex), np.maximum(sx, ex)
+    seg_min_y, seg_max_y = np.minimum(sy, ey), np.maximum(sy, ey)
+    vertical, horizontal = sx == ex, sy == ey
+
+    min_x, min_y, max_x, max_y = (r[:, None] for r in rects)
+    cut = (
+        vertical
+        & (sx > min_x)
+        & (sx < max_x)
+        & (min_y < seg_max_y)
+        & (seg_min_y < max_y)
+    ) | (
+        horizontal
+        & (sy > min_y)
+        & (sy < max_y)
+        & (min_x < seg_max_x)
+        & (seg_min_x < max_x)
+    )
+    # ray cast from the centre of the rectangle to the right (doubled to stay in integers):
+    cy2 = min_y + max_y
+    hit = (
+        vertical
+        & (2 * sx > min_x + max_x)
+        & (cy2 > 2 * seg_min_y)
+        & (cy2 < 2 * seg_max_y)
+    )
+
+    any_cut = cut.any(axis=1)
+    checks = np.where(any_cut, cut.argmax(axis=1) + 1, n)
+    valid = ~any_cut & (hit.sum(axis=1) % 2 == 1)
+    return valid, checks
+
+
+def day09_area_bucket(area: np.ndarray, sub_bits: int = 2) -> np.ndarray:
+    # day09_core's area buckets: 2^sub_bits buckets per power of 2, from the area's top sub_bits + 1 bits
+    area = np.asarray(area, dtype=np.int64)
+    msb = np.zeros_like(area)
+    nonzero = area > 0
+    msb[nonzero] = np.floor(np.log2(area[nonzero])).astype(np.int64)
+    # (log2 of a float can round up just below a power of 2)
+    msb -= (np.left_shift(1, msb) > area).astype(np.int64)
+    shift = np.maximum(msb - sub_bits, 0)
+    return np.where(
+        msb < sub_bits,
+        area,
+        (msb << sub_bits) + ((area >> shift) & ((1 << sub_bits) - 1)),
+    )
+
+
+def day09_candidate_checks(
+    text: str,
+    log_max_points: int = 9,
+    segs_per_stage: int = 32,
+    pass_shift: int = 4,
+    chunk: int = 4096,
+) -> dict[str, int]:
+    # day09_core's part 2: counts the rectangles (candidates) sent through the segment pipeline and the
+    # segment checks they take, in each order the core can send them in:
+    # - index order (AREA_ORDER=0): every pair of points in turn, sent if its area beats the best valid
+    #   rectangle so far
+    # - area order: largest area first, stopping at the first valid rectangle (the ideal the core approximates)
+    # - bucketed (AREA_ORDER=1, the core's PASS_SHIFT): the core first counts the candidates in each area
+    #   bucket, then makes passes over the pairs that each send (in index order) the pairs in the next largest
+    #   buckets holding at least 1 / 2^pass_shift of the pairs (twice as many as the last pass), stopping after
+    #   the first pass that finds a valid one.
+    # the core only learns of a valid rectangle once it leaves the pipeline, so it sends a few more candidates
+    # than these counts (which assume it knows straight away)
+    points = _day09_points(text)
+    n = len(points)
+    num_stages = (1 << log_max_points) // segs_per_stage
+    # pairs in the order the core visits them (i from 1, j from 0 to i - 1):
+    i, j = np.tril_indices(n, -1)
+    x1, y1, x2, y2 = points[i, 0], points[i, 1], points[j, 0], points[j, 1]
+    rects = (
+        np.minimum(x1, x2),
+        np.minimum(y1, y2),
+        np.maximum(x1, x2),
+        np.maximum(y1, y2),
+    )
+    area = (rects[2] - rects[0] + 1) * (rects[3] - rects[1] + 1)
+
+    def index_order(mask: np.ndarray) -> tuple[int, int, int]:
+        # (sent, checks, best) for the pairs in mask, in index order
+        best = sent = checks = 0
+        candidates = np.nonzero(mask)[0]
+        for s in range(0, len(candidates), chunk):
+            idx = candidates[s : s + chunk]
+            idx = idx[area[idx] > best]
+            if len(idx) == 0:
+                continue
+            valid, counts = _day09_check(
+                points, tuple(r[idx] for r in rects), num_stages
+            )
+            for k in range(len(idx)):
+                if area[idx[k]] > best:
+                    sent += 1
+                    checks += int(counts[k])
+                    if valid[k]:
+                        best = int(area[idx[k]])
+        return sent, checks, best
+
+    index_sent, index_checks, part2 = index_order(np.ones(len(area), dtype=bool))
+
+    area_sent = area_checks = 0
+    by_area = np.argsort(-area, kind="stable")
+    for s in range(0, len(by_area), chunk):
+        idx = by_area[s : s + chunk]
+        valid, counts = _day09_check(points, tuple(r[idx] for r in rects), num_stages)
+        if valid.any():
+            first = int(valid.argmax())
+            area_sent += first + 1
+            area_checks += int(counts[: first + 1].sum())
+            break
+        area_sent += len(idx)
+        area_checks += int(counts.sum())
+
+    bucket = day09_area_bucket(area)
+    counts_per_bucket = np.bincount(bucket)
+    bucketed_passes = bucketed_sent = bucketed_checks = 0
+    hi = len(counts_per_bucket) - 1
+    target = len(area) >> pass_shift
+    while hi >= 0:
+        lo, acc = hi, 0
+        while True:
+            acc += counts_per_bucket[lo]
+            if acc >= target or lo == 0:
+                break
+            lo -= 1
+        sent, checks, best = index_order((bucket >= lo) & (bucket <= hi))
+        bucketed_passes += 1
+        bucketed_sent += sent
+        bucketed_checks += checks
+        if best:
+            break
+        hi = lo - 1
+        target *= 2
+
+    return {
+        "part1": int(area.max()) if n > 1 else 0,
+        "part2": part2,
+        "candidates": len(area),
+        "index_order_sent": index_sent,
+        "index_order_checks": index_checks,
+        "area_order_sent": area_sent,
+        "area_order_checks": area_checks,
+        "bucketed_passes": bucketed_passes,
+        "bucketed_sent": bucketed_sent,
+        "bucketed_checks": bucketed_checks,
+    }
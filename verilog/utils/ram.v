@@ -10,6 +10,7 @@ module ram #(
     parameter ADDR_BITS = 11 // address bits (must be >= log2(DEPTH))
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
 
     // write port:
@@ -24,7 +25,7 @@ module ram #(
     // memory: (use vendor-specific primitives to ensure BRAM, or just replace this module entirely with vendor-specific IP)
     reg [WIDTH-1:0] memory [0:DEPTH-1];
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         // write
         if (we) begin
             memory[w_addr] <= w_data;
@@ -34,6 +35,20 @@ module ram #(
         r_data <= memory[r_addr];
     end
 
+`ifdef RAM_MONITOR
+    ram_monitor #(
+        .ADDR_BITS(ADDR_BITS),
+        .NUM_PORTS(2)
+    ) u_ram_monitor_0 (
+        .clk(clk),
+        .ce(ce),
+        .rst(rst),
+        .r_en(2'b01),
+        .we({we, 1'b0}),
+        .addr({w_addr, r_addr})
+    );
+`endif
+
 endmodule
 
 
@@ -43,6 +58,7 @@ module ram_dp #(
     parameter ADDR_BITS = 11 // address bits (must be >= log2(DEPTH))
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
 
     // port a: (has priority)
@@ -61,20 +77,34 @@ module ram_dp #(
     reg [WIDTH-1:0] memory [0:DEPTH-1];
 
     // port a:
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (we_a) begin
             memory[addr_a] <= w_data_a;
         end
         r_data_a <= memory[addr_a];
     end
 
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (we_b) begin
             memory[addr_b] <= w_data_b;
         end
         r_data_b <= memory[addr_b];
     end
 
+`ifdef RAM_MONITOR
+    ram_monitor #(
+        .ADDR_BITS(ADDR_BITS),
+        .NUM_PORTS(2)
+    ) u_ram_monitor_0 (
+        .clk(clk),
+        .ce(ce),
+        .rst(rst),
+        .r_en(2'b11),
+        .we({we_b, we_a}),
+        .addr({addr_b, addr_a})
+    );
+`endif
+
 endmodule
 
 // same as ram_dp, but allows the memory contents to be initialised to a given value
@@ -85,6 +115,7 @@ module ram_dp_init #(
     parameter [WIDTH-1:0] INIT_VALUE = {WIDTH{1'b1}}
 ) (
     input wire clk,
+    input wire ce, // clock enable
     input wire rst,
 
     // port a: (has priority)
@@ -121,6 +152,7 @@ module ram_dp_init #(
         .ADDR_BITS(ADDR_BITS)
     ) u_ram_0 (
         .clk(clk),
+        .ce(ce),
         .rst(rst),
         .we_a(mux_we_a),
         .we_b(mux_we_b),
@@ -133,7 +165,7 @@ module ram_dp_init #(
     );
 
     // fsm to initialise ram:
-    always @(posedge clk) begin
+    always @(posedge clk) if (ce) begin
         if (rst) begin
             init_idx <= 0;
             init_done <= 0;
@@ -147,3 +179,220 @@ module ram_dp_init #(
     end
 
 endmodule
+
+// ram split into NUM_BANKS banks with the address interleaved across them (bank = low address bits), each
+// with its own read port, so that several addresses in different banks can be read in the same cycle
+// (e.g. neighbouring rows / columns, which are always in different banks).
+// a read port that asks for a different address in the same bank as a lower-numbered port that cycle
+// gets that port's data instead, and its r_conflict bit is set alongside (the cores using this
+// are arranged so that this never happens, conflict_count is there to check this)
+module ram_banked #(
+    parameter WIDTH = 8, // data width in # bits
+    parameter DEPTH = 2048, // number of entries to store
+    parameter ADDR_BITS = 11, // address bits (must be >= log2(DEPTH))
+    parameter NUM_BANKS = 4, // must be a power of 2
+    parameter NUM_PORTS = 3 // read ports
+) (
+    input wire clk,
+    input wire ce, // clock enable
+    input wire rst,
+
+    // write port (any bank):
+    input wire we,
+    input wire [ADDR_BITS-1:0] w_addr,
+    input wire [WIDTH-1:0] w_data,
+
+    // read ports, port p is bits [p*ADDR_BITS +: ADDR_BITS] / [p*WIDTH +: WIDTH]:
+    input wire [NUM_PORTS-1:0] r_en,
+    input wire [NUM_PORTS*ADDR_BITS-1:0] r_addr,
+    output reg [NUM_PORTS*WIDTH-1:0] r_data,
+    output reg [NUM_PORTS-1:0] r_conflict, // the port's read lost a bank conflict (with r_data)
+
+    output reg [31:0] conflict_count // number of reads that lost a bank conflict since reset
+);
+    localparam BANK_BITS = (NUM_BANKS > 1) ? $clog2(NUM_BANKS) : 1;
+    localparam BANK_DEPTH = (DEPTH + NUM_BANKS - 1) / NUM_BANKS;
+
+    // bank arbitration (lowest port first):
+    reg [NUM_BANKS-1:0] bank_busy;
+    reg [NUM_BANKS*ADDR_BITS-1:0] bank_addr; // address each bank reads this cycle
+    reg [NUM_PORTS*BANK_BITS-1:0] port_bank; // bank each port reads from
+    reg [NUM_PORTS-1:0] port_conflict;
+    reg [ADDR_BITS-1:0] addr;
+    integer p;
+    integer b;
+    integer k;
+    integer conflicts;
+
+    always @(*) begin
+        bank_busy = 0;
+        bank_addr = 0;
+        port_bank = 0;
+        port_conflict = 0;
+        for (p = 0; p < NUM_PORTS; p = p + 1) begin
+            addr = r_addr[p*ADDR_BITS +: ADDR_BITS];
+            b = (NUM_BANKS > 1) ? (addr % NUM_BANKS) : 0;
+            port_bank[p*BANK_BITS +: BANK_BITS] = b;
+            if (r_en[p]) begin
+                if (!bank_busy[b]) begin
+                    bank_busy[b] = 1'b1;
+                    bank_addr[b*ADDR_BITS +: ADDR_BITS] = addr;
+                end else if (bank_addr[b*ADDR_BITS +: ADDR_BITS] != addr) begin
+                    port_conflict[p] = 1'b1;
+                end
+            end
+        end
+    end
+
+    // banks: (use vendor-specific primitives to ensure BRAM, as for ram)
+    wire [NUM_BANKS*WIDTH-1:0] bank_r_data;
+    genvar g;
+    generate
+        for (g = 0; g < NUM_BANKS; g = g + 1) begin : g_bank
+            reg [WIDTH-1:0] memory [0:BANK_DEPTH-1];
+            reg [WIDTH-1:0] r_data_q;
+            assign bank_r_data[g*WIDTH +: WIDTH] = r_data_q;
+
+            always @(posedge clk) if (ce) begin
+                if (we && (w_addr % NUM_BANKS) == g) begin
+                    memory[w_addr / NUM_BANKS] <= w_data;
+                end
+                r_data_q <= memory[bank_addr[g*ADDR_BITS +: ADDR_BITS] / NUM_BANKS];
+            end
+        end
+    endgenerate
+
+    // route each bank's data back to the ports that read it:
+    reg [NUM_PORTS*BANK_BITS-1:0] port_bank_q;
+    integer q;
+    always @(*) begin
+        for (q = 0; q < NUM_PORTS; q = q + 1) begin
+            r_data[q*WIDTH +: WIDTH] = bank_r_data[port_bank_q[q*BANK_BITS +: BANK_BITS]*WIDTH +: WIDTH];
+        end
+    end
+
+    always @(posedge clk) if (ce) begin
+        port_bank_q <= port_bank;
+        r_conflict <= port_conflict;
+
+        if (rst) begin
+            conflict_count <= 0;
+        end else begin
+            conflicts = 0;
+            for (k = 0; k < NUM_PORTS; k = k + 1) begin
+                conflicts = conflicts + port_conflict[k];
+            end
+            conflict_count <= conflict_count + conflicts;
+        end
+    end
+
+`ifdef RAM_MONITOR
+    ram_monitor #(
+        .ADDR_BITS(ADDR_BITS),
+        .NUM_PORTS(NUM_PORTS + 1),
+        .READ_ENABLES(1)
+    ) u_ram_monitor_0 (
+        .clk(clk),
+        .ce(ce),
+        .rst(rst),
+        .r_en({1'b0, r_en}),
+        .we({we, {NUM_PORTS{1'b0}}}),
+        .addr({w_addr, r_addr})
+    );
+`endif
+
+endmodule
+
+
+`ifdef RAM_MONITOR
+// memory traffic monitor, simulation only: instantiated in each of the ram modules above when built with
+// RAM_MONITOR defined (`make run RAM_MONITOR=1`). counts the reads and writes of the ram's ports, hazards
+// (a read of an address another port writes in the same cycle, which returns the old data) and cycles with
+// no access at all, and prints them on a single line for benchmark.py when the simulation finishes, e.g.
+//   RAM_MONITOR instance=day08_tb.u_core_0.u_edge_ram_0.u_ram_monitor_0 ports=2 cycles=9000 reads=4000 writes=1000 hazards=0 idle=5000
+// (and also when rst is raised, so each input of a batch gets its own line).
+// ports without a read enable read every cycle, so their reads are only counted when the address changes
+// (or after the port wrote), i.e. when the port fetches something new. their hazards are an upper bound,
+// as the core may not use the data (e.g. a read address that follows the write address).
+// cycles with ce low (the core held waiting for streamed input) are not counted
+module ram_monitor #(
+    parameter ADDR_BITS = 11,
+    parameter NUM_PORTS = 2, // a port either reads or writes each cycle
+    parameter READ_ENABLES = 0 // 1 if the ports' r_en only mark the cycles they read
+) (
+    input wire clk,
+    input wire ce, // clock enable
+    input wire rst,
+
+    // port p is bit p / bits [p*ADDR_BITS +: ADDR_BITS]:
+    input wire [NUM_PORTS-1:0] r_en,
+    input wire [NUM_PORTS-1:0] we,
+    input wire [NUM_PORTS*ADDR_BITS-1:0] addr
+);
+    integer cycles;
+    integer reads;
+    integer writes;
+    integer hazards;
+    integer idle;
+    initial begin
+        cycles = 0;
+        reads = 0;
+        writes = 0;
+        hazards = 0;
+        idle = 0;
+    end
+
+    reg [NUM_PORTS*ADDR_BITS-1:0] prev_addr;
+    reg [NUM_PORTS-1:0] prev_we;
+    reg prev_valid;
+    reg [NUM_PORTS-1:0] reading;
+    integer p;
+    integer q;
+
+    always @(posedge clk) if (ce) begin
+        if (rst) begin
+            prev_valid = 0;
+        end else begin
+            cycles = cycles + 1;
+            for (p = 0; p < NUM_PORTS; p = p + 1) begin
+                reading[p] = r_en[p] && !we[p] && (READ_ENABLES || !prev_valid || prev_we[p]
+                    || addr[p*ADDR_BITS +: ADDR_BITS] != prev_addr[p*ADDR_BITS +: ADDR_BITS]);
+                reads = reads + reading[p];
+                writes = writes + we[p];
+            end
+            for (p = 0; p < NUM_PORTS; p = p + 1) begin
+                for (q = 0; q < NUM_PORTS; q = q + 1) begin
+                    if (reading[p] && we[q] && q != p && addr[p*ADDR_BITS +: ADDR_BITS] == addr[q*ADDR_BITS +: ADDR_BITS]) begin
+                        hazards = hazards + 1;
+                    end
+                end
+            end
+            if (reading == 0 && we == 0) begin
+                idle = idle + 1;
+            end
+            prev_addr = addr;
+            prev_we = we;
+            prev_valid = 1;
+        end
+    end
+
+    // rst is raised between the inputs of a batch:
+    always @(posedge rst) begin
+        if (cycles > 0) begin
+            $display("RAM_MONITOR instance=%m ports=%0d cycles=%0d reads=%0d writes=%0d hazards=%0d idle=%0d", NUM_PORTS, cycles, reads, writes, hazards, idle);
+        end
+        cycles = 0;
+        reads = 0;
+        writes = 0;
+        hazards = 0;
+        idle = 0;
+    end
+
+    final begin
+        if (cycles > 0) begin
+            $display("RAM_MONITOR instance=%m ports=%0d cycles=%0d reads=%0d writes=%0d hazards=%0d idle=%0d", NUM_PORTS, cycles, reads, writes, hazards, idle);
+        end
+    end
+
+endmodule
+`endif
@@ -2,20 +2,32 @@
 // is NOT a synthesisable module
 // this is used to show proof of concept for the 
 // validity of the solver (not as part of the solution)
+//
+// with STREAM = 1, the file is instead sent a byte at a time over a valid/ready stream into a
+// stream_window (utils/stream_window.v), which serves the same port. the core must then be
+// held while `stall` is high, by driving its clock enable (`ce`) with !stall (see the testbenches). the file is read as the window accepts it, so
+// its size is not limited by N_ADDR_BITS' rom depth (only by the core's address width)
 
 module rom #(
     parameter N_ADDR_BITS = 16,
-    parameter FILENAME = "input.txt"
+    parameter FILENAME = "input.txt",
+    parameter LOAD_ON_INIT = 1, // set to 0 if the testbench loads files itself with load_file (batch mode)
+    parameter STREAM = 0, // 1 to stream the file through a stream_window instead
+    parameter WINDOW_BITS = 8, // stream_window buffer size (2^WINDOW_BITS bytes)
+    parameter GAP_PERCENT = 0, // percentage of cycles the stream has no byte ready (models a bursty source)
+    parameter WORD_BYTES = 1 // bytes read per cycle (a wide read port), memory[addr] is in the low byte
 ) (
     // Synchronous inputs:
     input wire clk,
-    // no reset, this is a mock module
+    input wire rst, // only used with STREAM = 1 (restarts the stream), this is otherwise a mock module
 
     input wire [N_ADDR_BITS:0] addr,
-    output reg [7:0] data_out, // memory[addr]
-    output reg valid // 
+    output reg [8*WORD_BYTES-1:0] data_out, // memory[addr+WORD_BYTES-1] ... memory[addr]
+    output reg valid, // memory[addr] != 0
+    output wire stall // STREAM = 1 only: addr has not been streamed yet, hold the core (ce low)
 );
-    localparam ROM_DEPTH = (1 << (N_ADDR_BITS + 1));
+    localparam ROM_DEPTH = STREAM ? 2 : (1 << (N_ADDR_BITS + 1)); // the rom array is unused when streaming
+    localparam MAX_FILENAME_CHARS = 256;
 
     reg [7:0] rom_array[0:ROM_DEPTH-1];
     // file handling variables:
@@ -23,60 +35,164 @@ module rom #(
     integer char_val;
     integer mem_idx;
     integer i;
+    integer b;
     reg eof_flag;
+    integer stream_fd;
+    initial stream_fd = 0;
+    reg truncated; // the last file loaded did not fit in the rom (read by the testbenches for their RESULT status)
+    initial truncated = 0;
+    wire stream_error; // STREAM = 1 only: the core read a byte the stream_window had already overwritten (same)
+
+    // (re)load the rom contents from a file. can be called hierarchically by a testbench
+    // (e.g. u_rom_0.load_file(name)) while the core is held in reset to solve several inputs in one simulation
+    task load_file;
+        input [8*MAX_FILENAME_CHARS-1:0] filename;
+        begin
+            if (STREAM) begin
+                // just open the file, it is read by the stream source below (which restarts on rst):
+                if (stream_fd !== 0) begin
+                    $fclose(stream_fd);
+                end
+                stream_fd = $fopen(filename, "r");
+                if (stream_fd === 0) begin
+                    $display("ERROR: Could not open input file '%0s' for reading.", filename);
+                    $finish;
+                end
 
-    initial begin
-        // initialise entire memory to zero:
-        for (i = 0; i < ROM_DEPTH; i = i+1) begin
-            rom_array[i] = 8'd0;
-        end
+            end else begin
+                // initialise entire memory to zero:
+                for (i = 0; i < ROM_DEPTH; i = i+1) begin
+                    rom_array[i] = 8'd0;
+                end
 
-        mem_idx = 0;
-        eof_flag = 0;
-        // open file:
-        file_id = $fopen(FILENAME, "r");
-        if (file_id === 0) begin
-            $display("ERROR: Could not open input file '%s' for reading.", FILENAME);
-            $finish;
-
-        end else begin
-            // read characters until EOF or ROM is full:
-            while (mem_idx < ROM_DEPTH && !eof_flag) begin
-                char_val = $fgetc(file_id);
-                if (char_val < 0) begin
-                    eof_flag = 1;
+                mem_idx = 0;
+                eof_flag = 0;
+                truncated = 0;
+                // open file:
+                file_id = $fopen(filename, "r");
+                if (file_id === 0) begin
+                    $display("ERROR: Could not open input file '%0s' for reading.", filename);
+                    $finish;
 
                 end else begin
-                    rom_array[mem_idx] = char_val[7:0];
-                    mem_idx = mem_idx + 1;
-                end
+                    // read characters until EOF or ROM is full:
+                    while (mem_idx < ROM_DEPTH && !eof_flag) begin
+                        char_val = $fgetc(file_id);
+                        if (char_val < 0) begin
+                            eof_flag = 1;
+
+                        end else begin
+                            rom_array[mem_idx] = char_val[7:0];
+                            mem_idx = mem_idx + 1;
+                        end
+
+                    end
+
+                    // ensure file contents ends in a null character:
+                    if (mem_idx < ROM_DEPTH-1) begin
+                        rom_array[mem_idx] = "\n";
+                        rom_array[mem_idx+1] = 8'b0;
+                    end else begin
+                        // no room left for the terminator (and the rest of the file, if any, was dropped)
+                        truncated = 1;
+                        $display("WARNING: Input file '%0s' does not fit in the ROM (%0d bytes), increase N_ADDR_BITS", filename, ROM_DEPTH);
+                    end
+
+                    // close file:
+                    $fclose(file_id);
 
+                end
             end
+        end
+    endtask
 
-            // ensure file contents ends in a null character:
-            if (mem_idx < ROM_DEPTH-1) begin
-                rom_array[mem_idx] = "\n";
-                rom_array[mem_idx+1] = 8'b0;
-            end
+    initial begin
+        if (LOAD_ON_INIT) begin
+            load_file(FILENAME);
+        end
+    end
 
-            // close file:
-            $fclose(file_id);
 
-        end
+    generate
+        if (STREAM) begin : g_stream
+            // stream source: sends the file a byte at a time (ending with a "\n", as the rom appends one)
+            reg [7:0] src_data;
+            reg src_valid;
+            reg src_last;
+            reg src_done;
+            wire src_ready;
+            wire [8*WORD_BYTES-1:0] win_data;
+            wire win_valid;
+
+            always @(posedge clk) begin
+                if (rst) begin
+                    src_valid <= 0;
+                    src_done <= 0;
+
+                end else if (!src_valid || src_ready) begin // current byte taken (or none yet)
+                    if (src_done || ($urandom % 100) < GAP_PERCENT) begin
+                        src_valid <= 0;
+
+                    end else begin
+                        char_val = $fgetc(stream_fd);
+                        src_valid <= 1;
+                        if (char_val < 0) begin
+                            src_data <= "\n";
+                            src_last <= 1;
+                            src_done <= 1;
+                        end else begin
+                            src_data <= char_val[7:0];
+                            src_last <= 0;
+                        end
+                    end
+                end
+            end
 
-    end
+            stream_window #(
+                .N_ADDR_BITS(N_ADDR_BITS),
+                .WINDOW_BITS(WINDOW_BITS),
+                .WORD_BYTES(WORD_BYTES)
+            ) u_stream_window_0 (
+                .clk(clk),
+                .rst(rst),
+                .s_data(src_data),
+                .s_valid(src_valid),
+                .s_last(src_last),
+                .s_ready(src_ready),
+                .addr(addr),
+                .data_out(win_data),
+                .valid(win_valid),
+                .stall(stall),
+                .error(stream_error)
+            );
+
+            always @(*) begin
+                data_out = win_data;
+                valid = win_valid;
+            end
+
+        end else begin : g_rom
+            assign stall = 1'b0;
+            assign stream_error = 1'b0;
 
+            always @(negedge clk) begin // update on negedge to simplify rest of modules
+                if (addr < ROM_DEPTH) begin
+                    valid <= (rom_array[addr] != 8'd0);
+                end else begin
+                    valid <= 1'b0;
+                end
 
-    always @(negedge clk) begin // update on negedge to simplify rest of modules
-        if (addr < ROM_DEPTH) begin
-            data_out <= rom_array[addr];
-            valid <= (rom_array[addr] != 8'd0);
+                // (the bytes after addr, for a wide read port. zero past the end of the rom)
+                for (b = 0; b < WORD_BYTES; b = b+1) begin
+                    if (addr + b < ROM_DEPTH) begin
+                        data_out[8*b +: 8] <= rom_array[addr + b];
+                    end else begin
+                        data_out[8*b +: 8] <= 8'b0;
+                    end
+                end
 
-        end else begin
-            data_out <= 8'b0;
-            valid <= 1'b0;
+            end
         end
-
-    end
+    endgenerate
 
 endmodule
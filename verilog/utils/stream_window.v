@@ -0,0 +1,107 @@
+// streaming front end for the day cores: buffers a valid/ready byte stream (e.g. from a DMA engine) and serves
+// it through the same address / data / valid port as utils/rom.v, so a core can read its input from a stream
+// without being modified. only a window of the most recent 2^WINDOW_BITS bytes is stored, so the input size
+// is limited only by the width of the core's address (N_ADDR_BITS), not by memory.
+//
+// the cores all read their input (nearly) in order, so the window only needs to keep a few bytes behind
+// the furthest address read (HISTORY, e.g. day 7 steps back one byte to the start of each row), and the
+// rest of it is free to fill ahead of the core, overlapping the transfer with parsing / compute.
+// when the core asks for a byte that has not arrived yet, `stall` is raised until it does, and drives the
+// core's clock enable (`ce = !stall`) so that it waits on the same free-running clock as the window. every
+// core (and the rams inside it) holds all of its state while `ce` is low, so the cores need no stall
+// handling of their own. the trade-off is that the whole core stops while it is stalled, including any
+// compute that did not need the missing byte (e.g. day 3 solving the previous bank), so a slow source
+// costs more cycles than it would with a stall on each core's input reads.
+//
+// a core that steps back more than HISTORY bytes can ask for a byte that has already been overwritten by
+// a newer one. `error` is then set (until rst) rather than quietly serving the wrong byte.
+
+module stream_window #(
+    parameter N_ADDR_BITS = 16, // the core's address is N_ADDR_BITS+1 bits wide, as for rom.v
+    parameter WINDOW_BITS = 8, // 2^WINDOW_BITS bytes of buffer
+    parameter HISTORY = 16, // bytes kept behind the furthest address read, for cores that step back
+    parameter WORD_BYTES = 1 // bytes read per cycle (a wide read port), byte addr is in the low byte
+) (
+    input wire clk,
+    input wire rst,
+
+    // byte stream in:
+    input wire [7:0] s_data,
+    input wire s_valid,
+    input wire s_last, // set with the final byte of the input
+    output wire s_ready,
+
+    // rom port out (updated on negedge, like rom.v):
+    input wire [N_ADDR_BITS:0] addr,
+    output reg [8*WORD_BYTES-1:0] data_out, // bytes from addr onwards, 0 past the end of the stream
+    output reg valid, // byte at addr != 0
+    output wire stall, // addr has not arrived yet, hold the core (drive its ce low)
+    output reg error // a byte was read after it had been overwritten (HISTORY too small for the core)
+);
+    localparam DEPTH = (1 << WINDOW_BITS);
+    localparam COUNT_BITS = N_ADDR_BITS + 2;
+
+    reg [7:0] buffer [0:DEPTH-1];
+    reg [COUNT_BITS-1:0] wr_count; // number of bytes received (address of the next one)
+    reg [COUNT_BITS-1:0] max_addr; // furthest address read by the core
+    reg ended; // the last byte has been received
+    reg stalled;
+    integer b;
+
+    // accept bytes while the oldest byte still needed (HISTORY behind the core) would not be overwritten:
+    assign s_ready = !rst && !ended && (wr_count < max_addr + DEPTH - HISTORY);
+    assign stall = stalled && !rst;
+
+    always @(posedge clk) begin
+        if (rst) begin
+            wr_count <= 0;
+            ended <= 0;
+
+        end else if (s_valid && s_ready) begin
+            buffer[wr_count[WINDOW_BITS-1:0]] <= s_data;
+            wr_count <= wr_count + 1;
+            ended <= s_last;
+        end
+    end
+
+    always @(negedge clk) begin
+        if (rst) begin
+            max_addr <= 0;
+            stalled <= 0;
+            data_out <= 8'd0;
+            valid <= 1'b0;
+            error <= 0;
+
+        end else begin
+            if (addr > max_addr) begin
+                max_addr <= addr;
+            end
+
+            if (addr < wr_count && (addr + WORD_BYTES <= wr_count || ended)) begin
+                for (b = 0; b < WORD_BYTES; b = b+1) begin
+                    if (addr + b < wr_count) begin
+                        data_out[8*b +: 8] <= buffer[(addr + b) & (DEPTH-1)];
+                    end else begin
+                        data_out[8*b +: 8] <= 8'd0;
+                    end
+                end
+                valid <= (buffer[addr[WINDOW_BITS-1:0]] != 8'd0);
+                stalled <= 0;
+                // byte addr + DEPTH has been received into addr's slot:
+                if (addr + DEPTH < wr_count) begin
+                    error <= 1;
+                end
+
+            end else if (ended) begin
+                // past the end of the input, same as the rom's null terminator
+                data_out <= 8'd0;
+                valid <= 1'b0;
+                stalled <= 0;
+
+            end else begin
+                stalled <= 1;
+            end
+        end
+    end
+
+endmodule